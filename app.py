@@ -1,3 +1,5 @@
+from src.perf.startup import STARTUP, BackgroundLoader
+from src.perf.spans import SPAN_LOG, Trace, estimate_tokens
 import streamlit as st
 import sys
 import os
@@ -8,17 +10,14 @@ from dotenv import load_dotenv
 load_dotenv()
 
 # Import Modules
-from src.story_gen import generate_story, generate_poem
-from src.retrieval.vector_search import StoryEmbeddingsRetriever
+# Heavy subsystems (embedding model, LLM clients, puzzle engine, pandas) are imported
+# lazily inside the modes that need them, so Poem/Settings sessions never pay for them.
+from src.story_gen import generate_story, generate_serial_story, generate_poem
+from src.retrieval.context import build_story_context, story_search_query
+from src.retrieval.prefetch import ContextPrefetcher
 from src import config
-
-# --- PUZZLE IMPORTS ---
-from src.local_llm_multi import generate_response_multi
-from src.story_inspired_puzzles.puzzle_generator import CrosswordGenerator
-from src.story_inspired_puzzles.prompts import PROMPT_SERIAL_INSPIRED_STORY, PROMPT_CROSSWORD_EXTRACTION
-import pandas as pd
 import re
-# ----------------------
+STARTUP.mark("imports")
 
 # Page Config
 st.set_page_config(
@@ -28,15 +27,50 @@ st.set_page_config(
 )
 
 # --- Initialization ---
+def _build_retriever():
+    with STARTUP.phase("import:retrieval"):
+        from src.retrieval.vector_search import StoryEmbeddingsRetriever
+    with STARTUP.phase("load:retriever"):
+        return StoryEmbeddingsRetriever(top_k=2)
+
 @st.cache_resource
+def retriever_loader():
+    # One loader per process. Loading starts after first paint (see end of script)
+    # or as soon as a RAG mode actually needs it.
+    return BackgroundLoader(_build_retriever, name="retriever")
+
 def load_retriever():
-    return StoryEmbeddingsRetriever(top_k=2)
+    return retriever_loader().get()
+
+@st.cache_resource
+def load_puzzle_bank(path):
+    from src.story_inspired_puzzles.puzzle_bank import PuzzleBank
+    return PuzzleBank(path)
 
-try:
-    retriever = load_retriever()
-except Exception as e:
-    st.error(f"Failed to load AI resources: {e}")
-    st.stop()
+@st.cache_resource
+def load_prefetcher():
+    # Shared across sessions: identical queries reuse the same search results.
+    # Searches queue behind the warm-up instead of blocking the page.
+    loader = retriever_loader()
+    return ContextPrefetcher(lambda query: loader.get().retrieve_points(query))
+
+def has_user_input(facets):
+    """False until the user enters a plot idea or picks keywords/characters (the genre always has a default)."""
+    return bool(facets.get("prompt_input", "").strip() or facets.get("keywords") or facets.get("characters"))
+
+def require_retriever():
+    """Stops the current mode if the archive search failed to load, and retries the load in the background."""
+    loader = retriever_loader()
+    error = loader.error()
+    if error is not None:
+        loader.start()
+        st.error(f"Failed to load AI resources: {error}. Retrying in the background, reload the page in a moment.")
+        st.stop()
+
+# Per-session channel so one user's edits never cancel another user's prefetch
+if "prefetch_channel" not in st.session_state:
+    import uuid
+    st.session_state["prefetch_channel"] = uuid.uuid4().hex
 
 # Load Stats
 @st.cache_data
@@ -93,7 +127,13 @@ with st.sidebar:
         st.session_state["llm_settings"]["model"] = config.AVAILABLE_MODELS[0]
 
     st.header("Status")
-    st.success("AI System: Online ✅")
+    retriever_status = retriever_loader().status()
+    if retriever_status == "failed":
+        st.error("Archive search unavailable ❌")
+    elif retriever_status == "ready":
+        st.success("AI System: Online ✅")
+    else:
+        st.info("AI System: Online ✅ (archive search warming up ⏳)")
         
 
 
@@ -102,6 +142,9 @@ if app_mode == "Story Generator":
     st.title("📖 Story Generator")
     st.caption("Generate new stories grounded in Classic Telugu Literature.")
 
+    require_retriever()
+    prefetcher = load_prefetcher()
+
     col_ctrl, col_preview = st.columns([1, 1], gap="large")
 
     with col_ctrl:
@@ -121,42 +164,39 @@ if app_mode == "Story Generator":
         all_locs = get_keys(global_stats, "top_locations")
         sel_locs = st.multiselect("Locations", all_locs[:100])
 
+        facets = {
+            "genre": sel_genre,
+            "prompt_input": prompt_input,
+            "keywords": sel_keywords,
+            "characters": sel_chars,
+            "locations": sel_locs,
+            "content_type": "SINGLE"
+        }
+
+        # Speculative RAG: search in the background while the user is still editing
+        search_q = story_search_query(facets)
+        if has_user_input(facets):  # not on first paint, before anything was entered
+            prefetcher.prefetch(search_q, channel=f"{st.session_state['prefetch_channel']}:story")
+
         st.markdown("<br>", unsafe_allow_html=True)
         
         if st.button("✨ Generate Story", type="primary", use_container_width=True):
             with st.spinner("Writing Story..."):
-                # RAG
-                search_q = f"{prompt_input} {sel_genre} {' '.join(sel_keywords)} {' '.join(sel_chars)}"
-                rag_results = retriever.retrieve_points(search_q)
-                    
-                context_story_excerpts = []
-                # Build context from Full Stories
-                full_texts = []
-                for p in rag_results:
-                    title = p.payload.get('title', 'Unknown')
-                    story_id = p.payload.get('story_id', 'Unknown ID')
-                    text = p.payload.get('text', '')
-                    
-                    # For UI display
-                    context_story_excerpts.append(f"### {title} (ID: {story_id})\n{text[:200]}...")
-                    
-                    # For LLM Context
-                    full_texts.append(f"Title: {title}\nStory: {text}")
+                trace = Trace("story", model=st.session_state["llm_settings"]["model"],
+                              prefetched=prefetcher.is_ready(search_q))
+                # RAG (usually already prefetched)
+                with trace.span("rag_wait"):
+                    rag_results = prefetcher.get(search_q)
+                trace.merge_retrieval(search_q)
 
-                context_text = "\n\n".join(full_texts)
-                
-                facets = {
-                    "genre": sel_genre,
-                    "prompt_input": prompt_input,
-                    "keywords": sel_keywords,
-                    "characters": sel_chars,
-                    "locations": sel_locs,
-                    "content_type": "SINGLE"
-                }
+                # Build context from Full Stories
+                with trace.span("context"):
+                    context_text, context_story_excerpts = build_story_context(rag_results)
+                trace.set(context_tokens_est=estimate_tokens(context_text))
 
                 # Using configured settings
                 # story_out is now a Generator
-                story_generator = generate_story(facets, context_text, llm_params=st.session_state["llm_settings"])
+                story_generator = trace.stream(generate_story(facets, context_text, llm_params=st.session_state["llm_settings"]))
                 
                 with col_preview:
                     st.subheader("2. Output")
@@ -175,6 +215,9 @@ elif app_mode == "Serial Generator":
     st.title("📚 Serial Generator (ధారావాహిక)")
     st.caption("Generate continuous multi-chapter serial stories with cliffhangers!")
 
+    require_retriever()
+    prefetcher = load_prefetcher()
+
     # Use settings from session state
     ser_max_tokens = st.session_state["serial_settings"]["max_tokens"]
     ser_temp = st.session_state["serial_settings"]["temperature"]
@@ -206,38 +249,39 @@ elif app_mode == "Serial Generator":
         all_locs = get_keys(global_stats, "top_locations")
         sel_locs = st.multiselect("Locations", all_locs[:100], key="ser_loc")
 
+        facets = {
+            "genre": sel_genre,
+            "prompt_input": prompt_input,
+            "keywords": sel_keywords,
+            "characters": sel_chars,
+            "locations": sel_locs,
+            "content_type": "SERIAL",
+            "num_chapters": num_chapters
+        }
+
+        # RAG Logic (Same as Story, but biased if possible - implicitly via prompt)
+        search_q = story_search_query(facets)
+        if has_user_input(facets):
+            prefetcher.prefetch(search_q, channel=f"{st.session_state['prefetch_channel']}:serial")
+
         st.markdown("<br>", unsafe_allow_html=True)
 
         serial_gen_clicked = st.button("✨ Start Serial", type="primary", use_container_width=True)
         if serial_gen_clicked:
             with st.spinner("Generating Serial Story... (This may take a while)"):
-                 # RAG Logic (Same as Story, but biased if possible - implicitly via prompt)
-                search_q = f"Serial Story {prompt_input} {sel_genre} {' '.join(sel_keywords)}"
-                rag_results = retriever.retrieve_points(search_q)
-                
-                context_story_excerpts = []
-                full_texts = []
-                for p in rag_results:
-                    title = p.payload.get('title', 'Unknown')
-                    text = p.payload.get('text', '')
-                    context_story_excerpts.append(f"### {title}\n{text[:200]}...")
-                    full_texts.append(f"Title: {title}\nStory: {text}")
-
-                context_text = "\\n\\n".join(full_texts)
-
-                facets = {
-                    "genre": sel_genre,
-                    "prompt_input": prompt_input,
-                    "keywords": sel_keywords,
-                    "characters": sel_chars,
-                    "locations": sel_locs,
-                    "content_type": "SERIAL",
-                    "num_chapters": num_chapters
-                }
+                trace = Trace("serial", model=serial_llm_settings["model"], chapters=num_chapters,
+                              prefetched=prefetcher.is_ready(search_q))
+                with trace.span("rag_wait"):
+                    rag_results = prefetcher.get(search_q)
+                trace.merge_retrieval(search_q)
+                with trace.span("context"):
+                    context_text, context_story_excerpts = build_story_context(rag_results, include_id=False)
+                trace.set(context_tokens_est=estimate_tokens(context_text))
 
                 # Use Serial Settings
-                # story_out is now a Generator
-                story_generator = generate_story(facets, context_text, llm_params=serial_llm_settings)
+                # Chapters stream one at a time; finished chapters are checkpointed,
+                # so clicking again after a failure resumes instead of restarting.
+                story_generator = trace.stream(generate_serial_story(facets, context_text, llm_params=serial_llm_settings))
                 
                 with col_preview:
                      st.subheader("2. Your Serial")
@@ -311,6 +355,11 @@ elif app_mode == "Puzzle Generator":
     st.title("🧩 Story-Inspired Puzzle Generator")
     st.caption("Generate a high-quality story and convert it into a crossword puzzle.")
 
+    with STARTUP.phase("import:puzzles"):
+        from src.local_llm_multi import generate_response_multi
+        from src.story_inspired_puzzles.puzzle_generator import CrosswordGenerator
+        from src.story_inspired_puzzles.prompts import PROMPT_SERIAL_INSPIRED_STORY, PROMPT_CROSSWORD_EXTRACTION
+
     # --- PUZZLE SESSION STATE ---
     if 'puzzle_story_text' not in st.session_state:
         st.session_state.puzzle_story_text = ""
@@ -321,6 +370,33 @@ elif app_mode == "Puzzle Generator":
     
     # ----------------------------
 
+    # Precomputed archive puzzles: a database lookup, no LLM calls
+    with st.expander("📚 Archive Puzzle Bank (Instant)"):
+        if not os.path.exists(config.PUZZLE_BANK_PATH):
+            st.info("The puzzle bank is not built yet. Run `python -m src.story_inspired_puzzles.puzzle_bank` once.")
+        else:
+            bank = load_puzzle_bank(config.PUZZLE_BANK_PATH)
+            b1, b2, b3 = st.columns([1, 1, 1])
+            with b1:
+                bank_difficulty = st.selectbox("Difficulty", ["easy", "medium", "hard"], index=1, key="puz_bank_difficulty")
+            with b2:
+                bank_genre = st.selectbox("Genre", ["Any"] + bank.genres(), key="puz_bank_genre")
+            with b3:
+                bank_story_id = st.text_input("Story ID (optional)", placeholder="e.g. 1960_01_01", key="puz_bank_story")
+
+            if st.button("🎲 Serve Archive Puzzle", key="puz_bank_btn"):
+                if bank_story_id.strip():
+                    entry = bank.get(bank_story_id.strip(), bank_difficulty)
+                else:
+                    entry = bank.random_puzzle(bank_difficulty, None if bank_genre == "Any" else bank_genre)
+                if entry:
+                    st.session_state.puzzle_story_text = f"### {entry['title']} ({entry['story_id']})\n\n{entry['excerpt']}..."
+                    st.session_state.puzzle_layout = entry['layout']
+                    st.session_state.puzzle_data = entry['words']
+                    st.rerun()
+                else:
+                    st.warning("No banked puzzle matches this selection.")
+
     col1, col2 = st.columns([1, 1], gap="large")
 
     with col1:
@@ -452,7 +528,12 @@ elif app_mode == "Puzzle Generator":
                     # If we improved it in the playground, we rely on `CrosswordGenerator` class having those improvements.
                     # We updated `puzzle_generator.py` earlier so it should be good.
                     
-                    layout = generator.generate_layout(words_data, attempts=100)
+                    # Sequential seeded restarts, capped by a deadline for interactive use
+                    layout = generator.generate_layout(
+                        words_data,
+                        attempts=config.PUZZLE_SEARCH_ATTEMPTS,
+                        deadline=config.PUZZLE_SEARCH_DEADLINE_SECONDS,
+                    )
                     
                     if layout:
                         st.session_state.puzzle_layout = layout
@@ -562,6 +643,7 @@ elif app_mode == "Puzzle Generator":
             with st.expander("👁️ Show Answers / Review Key"):
                 all_words = sorted(layout['words'], key=lambda x: x['number'])
                 data = [{"Number": w['number'], "Direction": w['direction'].title(), "Clue": w['clue'], "Answer": "".join(w['answer'])} for w in all_words]
+                import pandas as pd
                 st.table(pd.DataFrame(data))
 
 
@@ -618,7 +700,7 @@ elif app_mode == "Settings":
     st.divider()
     
     st.subheader("Serial Story Settings")
-    st.caption("Specific settings for multi-chapter serials.")
+    st.caption("Specific settings for multi-chapter serials. Max tokens is shared across chapters, which are generated one at a time.")
 
     ser_tokens = st.slider("Serial Max Tokens", 2000, 12000, st.session_state["serial_settings"]["max_tokens"], step=500, key="set_ser_tok")
     ser_temp_val = st.slider("Serial Connectivity", 0.0, 1.0, st.session_state["serial_settings"]["temperature"], key="set_ser_temp")
@@ -629,3 +711,21 @@ elif app_mode == "Settings":
          st.success("Serial settings updated!")
          
     st.info("Settings are automatically saved for this session.")
+
+    with st.expander("⏱️ Startup Timing"):
+        st.caption("Time since process start when each phase finished (first occurrence only).")
+        st.code(STARTUP.format_report(), language=None)
+
+# Rendered last so it includes the request that just ran on this page
+with st.sidebar:
+    with st.expander("⚡ Performance"):
+        st.caption(f"Recent requests in this process (full log: {config.SPAN_LOG_PATH}). "
+                   "rag_wait is what the user waited for retrieval; embed/search ran when it was fetched.")
+        st.code(SPAN_LOG.format_summary(), language=None)
+
+# --- WARM-UP (after first paint) ---
+# Everything above has been sent to the browser; now start loading the embedding
+# model in the background so RAG modes are ready by the time the user needs them.
+STARTUP.mark("first_paint")
+retriever_loader().start()
+STARTUP.print_once()
@@ -3,6 +3,7 @@ import os
 import sys
 import random
 import time
+import argparse
 import numpy as np
 from dotenv import load_dotenv
 
@@ -18,7 +19,6 @@ if project_root not in sys.path:
 # Load env vars
 load_dotenv()
 
-from src.retrieval.vector_search import StoryEmbeddingsRetriever
 from src import config
 
 def extract_query_from_text(text, length=150):
@@ -31,8 +31,78 @@ def extract_query_from_text(text, length=150):
         start_index = random.randint(start_zone, end_zone - length)
     return text[start_index : start_index + length]
 
+def rank_metrics(ranks, latencies):
+    total = len(ranks)
+    return {
+        "N": total,
+        "Hit@1": sum(1 for r in ranks if r == 1) / total,
+        "Hit@5": sum(1 for r in ranks if r <= 5) / total,
+        "MRR": sum(1.0 / r for r in ranks if r != float('inf')) / total,
+        "Latency": np.mean(latencies)
+    }
+
+def run_chunk_eval(collection, samples=20):
+    """
+    Chunk-collection mode: queries cut from sampled chunks, searched against the
+    chunk collection with the e5 chunk model. Reports exact-chunk and same-story hits,
+    so paragraph and sliding-window collections can be compared side by side.
+    """
+    from src.retrieval.client import get_qdrant_client, get_embedding
+    from src.chunk_offsets import resolve_chunk_text
+
+    client = get_qdrant_client()
+    point_count = client.count(collection_name=collection).count
+    print(f"Collection '{collection}': {point_count} chunks", flush=True)
+    if point_count == 0:
+        print("❌ The collection is empty! Run `python src/scripts/populate_qdrant.py --collection ...` first.", flush=True)
+        return None
+
+    response, _ = client.scroll(collection_name=collection, limit=samples * 5, with_payload=True, with_vectors=False)
+    random.shuffle(response)
+    test_set = []
+    for point in response:
+        text = resolve_chunk_text(point.payload)
+        if len(text) >= 300:
+            test_set.append({"id": point.id, "story_id": point.payload.get("story_id"), "query": extract_query_from_text(text)})
+    test_set = test_set[:samples]
+    if not test_set:
+        print("No chunks long enough to sample queries from.", flush=True)
+        return None
+
+    print(f"Running {len(test_set)} tests...", flush=True)
+    chunk_ranks, story_ranks, latencies = [], [], []
+    for case in test_set:
+        start = time.time()
+        results = client.query_points(
+            collection_name=collection, query=get_embedding(case["query"]), limit=5, with_payload=True
+        ).points
+        latencies.append(time.time() - start)
+        chunk_ranks.append(next((i + 1 for i, hit in enumerate(results) if str(hit.id) == str(case["id"])), float('inf')))
+        story_ranks.append(next((i + 1 for i, hit in enumerate(results) if hit.payload.get("story_id") == case["story_id"]), float('inf')))
+
+    chunk_metrics = rank_metrics(chunk_ranks, latencies)
+    story_metrics = rank_metrics(story_ranks, latencies)
+    print("\nRESULTS:", flush=True)
+    print(f"Index size: {point_count} chunks", flush=True)
+    print(f"Exact chunk  Hit@1: {chunk_metrics['Hit@1']:.2%}  Hit@5: {chunk_metrics['Hit@5']:.2%}  MRR: {chunk_metrics['MRR']:.4f}", flush=True)
+    print(f"Same story   Hit@1: {story_metrics['Hit@1']:.2%}  Hit@5: {story_metrics['Hit@5']:.2%}  MRR: {story_metrics['MRR']:.4f}", flush=True)
+    print(f"Avg Latency: {story_metrics['Latency']:.4f}s", flush=True)
+    return {"chunk": chunk_metrics, "story": story_metrics, "points": point_count}
+
 def main():
+    parser = argparse.ArgumentParser(description="Measure retrieval accuracy with queries cut from indexed texts")
+    parser.add_argument("--mode", choices=["stories", "chunks"], default="stories",
+                        help="stories: full-story collection; chunks: a chunk collection (paragraph or window)")
+    parser.add_argument("--collection", default=None, help="Chunk collection (default: config.COLLECTION_NAME)")
+    parser.add_argument("--samples", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.mode == "chunks":
+        run_chunk_eval(args.collection or config.COLLECTION_NAME, args.samples)
+        return
+
     print("Initializing RAG Test...", flush=True)
+    from src.retrieval.vector_search import StoryEmbeddingsRetriever
     
     try:
         retriever = StoryEmbeddingsRetriever(top_k=5)
@@ -99,8 +169,8 @@ def main():
     if len(test_set) == 0:
         return
 
-    # Limit to 20 for speed
-    test_set = test_set[:20]
+    # Limit for speed
+    test_set = test_set[:args.samples]
     
     hits_at_1 = 0
     hits_at_5 = 0
@@ -0,0 +1,176 @@
+import functools
+import os
+import re
+import sys
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+# Telugu Unicode Block: 0C00 - 0C7F
+TELUGU_START = 0x0C00
+TELUGU_END = 0x0C7F
+VIRAMA = 0x0C4D
+
+# Code-point classes
+CLASS_BASE = "base"      # Independent vowels, consonants, digits: start a new akshara
+CLASS_MARK = "mark"      # Matras, virama, anusvara/visarga/candrabindu: join the current akshara
+CLASS_OTHER = "other"    # Anything outside the Telugu block: always its own unit
+
+
+def _build_class_table() -> Dict[int, str]:
+    """
+    Precomputed class for every code point of the Telugu block.
+    Marks: 0C01-0C03 (modifiers), 0C3E-0C56 (vowel signs, virama, length marks), 0C62-0C63.
+    """
+    table = {}
+    for cp in range(TELUGU_START, TELUGU_END + 1):
+        is_mark = (0x0C01 <= cp <= 0x0C03) or (0x0C3E <= cp <= 0x0C56) or (0x0C62 <= cp <= 0x0C63)
+        table[cp] = CLASS_MARK if is_mark else CLASS_BASE
+    return table
+
+
+CLASS_TABLE = _build_class_table()
+
+
+def char_class(char: str) -> str:
+    return CLASS_TABLE.get(ord(char), CLASS_OTHER)
+
+
+def _regex_class(cls: str) -> str:
+    """Compresses the code points of one class into regex ranges, e.g. [\\u0C01-\\u0C03...]."""
+    cps = sorted(cp for cp, c in CLASS_TABLE.items() if c == cls)
+    ranges = []
+    start = prev = cps[0]
+    for cp in cps[1:]:
+        if cp != prev + 1:
+            ranges.append((start, prev))
+            start = cp
+        prev = cp
+    ranges.append((start, prev))
+    parts = [f"\\u{a:04X}" if a == b else f"\\u{a:04X}-\\u{b:04X}" for a, b in ranges]
+    return "[" + "".join(parts) + "]"
+
+
+_MARKS = _regex_class(CLASS_MARK)
+_BASES = _regex_class(CLASS_BASE)
+
+# One akshara = any single character, followed by combining marks, where a base
+# character directly after a virama joins the cluster (conjuncts: KA + VIRAMA + SSA).
+AKSHARA_PATTERN = re.compile(f"(?s).(?:{_MARKS}|(?<=\\u{VIRAMA:04X}){_BASES})*")
+
+
+# Lookup table for the vectorized counter: True where (cp - 0x0C00) is a mark
+_MARK_LUT = np.zeros(TELUGU_END - TELUGU_START + 1, dtype=bool)
+for _cp, _cls in CLASS_TABLE.items():
+    _MARK_LUT[_cp - TELUGU_START] = _cls == CLASS_MARK
+
+
+def _akshara_starts(text: str) -> np.ndarray:
+    """
+    Vectorized scan: a boolean per character, True where a new akshara begins.
+    Same rule as the regex: marks never start one, nor does a base after a virama.
+    """
+    cps = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+    in_block = (cps >= TELUGU_START) & (cps <= TELUGU_END)
+    is_mark = in_block & _MARK_LUT[cps & 0x7F]
+    starts = ~is_mark
+    starts[1:] &= ~(in_block[1:] & ~is_mark[1:] & (cps[:-1] == VIRAMA))
+    starts[0] = True
+    return starts
+
+
+def split_aksharas(text: str) -> List[str]:
+    """
+    Splits Telugu text into Aksharas (Syllables) with a single compiled regex scan.
+    Non-Telugu characters (spaces, punctuation, Latin) come out as individual units.
+    """
+    if not text:
+        return []
+    return AKSHARA_PATTERN.findall(text)
+
+
+def count_aksharas(text: str) -> int:
+    """Akshara count of `text` (spaces and punctuation count as one unit each)."""
+    if not text:
+        return 0
+    return int(np.count_nonzero(_akshara_starts(text)))
+
+
+@functools.lru_cache(maxsize=65536)
+def split_word(word: str) -> Tuple[str, ...]:
+    """
+    Cached segmentation for short, frequently repeated strings (names, crossword answers).
+    Returns a tuple so cached results can never be mutated by callers.
+    """
+    return tuple(split_aksharas(word))
+
+
+def split_many(texts: Iterable[str]) -> List[List[str]]:
+    """Batch segmentation over many strings."""
+    findall = AKSHARA_PATTERN.findall
+    return [findall(t) if t else [] for t in texts]
+
+
+def count_many(texts: Iterable[str]) -> List[int]:
+    """
+    Batch akshara counts over many strings (e.g. all paragraphs of a story, or the archive).
+    All texts are scanned in ONE vectorized pass over their newline-joined concatenation.
+    """
+    texts = list(texts)
+    counts = [0] * len(texts)
+    non_empty = [i for i, t in enumerate(texts) if t]
+    if not non_empty:
+        return counts
+
+    joined = "\n".join(texts[i] for i in non_empty)
+    starts = _akshara_starts(joined)
+
+    offsets = np.zeros(len(non_empty), dtype=np.int64)
+    offsets[1:] = np.cumsum([len(texts[i]) + 1 for i in non_empty[:-1]])
+    # Each text starts its own akshara regardless of what precedes it in the join
+    starts[offsets] = True
+    # Separators are always their own unit; drop them from every segment but the last
+    seg_counts = np.add.reduceat(starts.astype(np.int64), offsets)
+    seg_counts[:-1] -= 1
+
+    for i, c in zip(non_empty, seg_counts.tolist()):
+        counts[i] = c
+    return counts
+
+
+def _iter_archive_texts(base_dir: str):
+    import json
+    for root, _, filenames in os.walk(base_dir):
+        for filename in sorted(filenames):
+            if filename.startswith("చందమామ_") and filename.endswith(".json"):
+                with open(os.path.join(root, filename), "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                for story in data.get("stories", []):
+                    yield story.get("content", "") or ""
+
+
+def main():
+    """Segments the whole archive and reports throughput."""
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Count aksharas across the Chandamama archive")
+    parser.add_argument("--base-dir", default=os.path.join(os.getcwd(), "data", "1947-2012"))
+    args = parser.parse_args()
+
+    load_start = time.perf_counter()
+    texts = list(_iter_archive_texts(args.base_dir))
+    load_time = time.perf_counter() - load_start
+
+    start = time.perf_counter()
+    counts = count_many(texts)
+    elapsed = time.perf_counter() - start
+
+    total_chars = sum(len(t) for t in texts)
+    print(f"Stories: {len(texts)} (loaded in {load_time:.2f}s)")
+    print(f"Characters: {total_chars:,}  Aksharas: {sum(counts):,}")
+    print(f"Segmentation: {elapsed:.2f}s ({total_chars / max(elapsed, 1e-9) / 1e6:.1f}M chars/s)")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+"""
+Chunk file formats.
+
+- json:      the original list of chunk objects (`*_chunks.json`)
+- jsonl:     JSON Lines, one compact record per line (`*_chunks.jsonl`). Story-level
+             metadata is written once in a "story" record and the "chunk" records that
+             follow reference it by story_id.
+- jsonl.zst: the same, zstd-compressed (`*_chunks.jsonl.zst`, needs `zstandard`)
+
+Readers always yield full chunk dicts (story metadata merged in), so consumers do not
+depend on the on-disk format.
+"""
+import io
+import json
+import os
+from typing import Any, Dict, Iterable, Iterator, List
+
+CHUNK_FORMATS = ("json", "jsonl", "jsonl.zst")
+CHUNK_SUFFIXES = {fmt: f"_chunks.{fmt}" for fmt in CHUNK_FORMATS}
+# When one issue exists in several formats, the most compact one wins
+FORMAT_PREFERENCE = ("jsonl.zst", "jsonl", "json")
+
+# Per-chunk fields; everything else in a chunk object is story-level
+CHUNK_FIELDS = ("chunk_id", "chunk_index", "text", "char_start", "char_end")
+FORMAT_VERSION = 1
+
+
+def chunk_file_format(path: str):
+    """Format of a chunk file from its name, or None if it is not one."""
+    for fmt in FORMAT_PREFERENCE:
+        if path.endswith(CHUNK_SUFFIXES[fmt]):
+            return fmt
+    return None
+
+
+def chunk_file_stem(path: str) -> str:
+    """Path without the chunk suffix, e.g. .../చందమామ_1960_01 for any format."""
+    fmt = chunk_file_format(path)
+    return path[:-len(CHUNK_SUFFIXES[fmt])] if fmt else path
+
+
+def _zstd():
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError("The jsonl.zst chunk format needs the 'zstandard' package (pip install zstandard)") from e
+    return zstandard
+
+
+def _iter_records(chunks: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    yield {"type": "header", "format": "chunks", "version": FORMAT_VERSION}
+    current_story = None
+    for chunk in chunks:
+        story_id = chunk.get("story_id")
+        if story_id != current_story:
+            current_story = story_id
+            story = {k: v for k, v in chunk.items() if k not in CHUNK_FIELDS}
+            yield {"type": "story", **story}
+        record = {"type": "chunk", "story_id": story_id}
+        record.update((k, chunk[k]) for k in CHUNK_FIELDS if k in chunk and k != "chunk_id")
+        yield record
+
+
+def write_chunk_file(path: str, chunks: List[Dict[str, Any]], fmt: str = "jsonl"):
+    """Writes chunks in the given format; `path` must carry the matching suffix."""
+    if fmt == "json":
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(chunks, f, ensure_ascii=False, indent=4)
+        return
+    lines = "".join(json.dumps(r, ensure_ascii=False, separators=(",", ":")) + "\n" for r in _iter_records(chunks))
+    data = lines.encode("utf-8")
+    if fmt == "jsonl.zst":
+        data = _zstd().ZstdCompressor(level=10).compress(data)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _open_lines(path: str, fmt: str):
+    if fmt == "jsonl.zst":
+        raw = open(path, "rb")
+        reader = _zstd().ZstdDecompressor().stream_reader(raw, closefd=True)
+        return io.TextIOWrapper(reader, encoding="utf-8")
+    return open(path, "r", encoding="utf-8")
+
+
+def iter_chunk_file(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Streams full chunk dicts from a chunk file of any format. JSON Lines files are
+    read line by line, so the first chunks are available before the file is read.
+    """
+    fmt = chunk_file_format(path)
+    if fmt == "json":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if not isinstance(data, list):
+            raise ValueError(f"{path} did not contain a list of chunks")
+        yield from data
+        return
+
+    stories = {}
+    with _open_lines(path, fmt) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            kind = record.pop("type", None)
+            if kind == "story":
+                stories[record.get("story_id")] = record
+            elif kind == "chunk":
+                story_id = record["story_id"]
+                chunk = dict(stories.get(story_id, {"story_id": story_id}))
+                chunk["chunk_id"] = f"{story_id}_{record['chunk_index']:02d}"
+                chunk.update(record)
+                yield chunk
@@ -0,0 +1,46 @@
+"""
+Offset-based chunks store (char_start, char_end) into their story's content instead
+of a copy of the text. These helpers resolve them back against the archive files.
+"""
+import functools
+import json
+import os
+from typing import Any, Dict, List
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ARCHIVE_DIR = os.path.join(PROJECT_ROOT, "data", "1947-2012")
+
+
+@functools.lru_cache(maxsize=32)
+def _load_issue(path: str) -> Dict[str, str]:
+    """story_id -> content for one archive issue. Chunks of one issue arrive together, so a small cache suffices."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return {s.get("story_id"): s.get("content", "") or "" for s in data.get("stories", [])}
+
+
+def story_content(source_path: str, story_id: str, base_dir: str = ARCHIVE_DIR) -> str:
+    """Content of a story, given its chunk's source_path (relative to the archive) and story_id."""
+    contents = _load_issue(os.path.join(base_dir, source_path))
+    if story_id not in contents:
+        raise KeyError(f"Story '{story_id}' not found in {source_path}")
+    return contents[story_id]
+
+
+def resolve_chunk_text(chunk: Dict[str, Any], base_dir: str = ARCHIVE_DIR) -> str:
+    """The chunk's text: stored inline for paragraph chunks, sliced from the source for offset chunks."""
+    if "text" in chunk:
+        return chunk["text"]
+    content = story_content(chunk["source_path"], chunk["story_id"], base_dir)
+    return content[chunk["char_start"]:chunk["char_end"]]
+
+
+def resolve_chunk_texts(chunks: List[Dict[str, Any]], base_dir: str = ARCHIVE_DIR) -> List[Dict[str, Any]]:
+    """Copies of the chunks with 'text' filled in (for embedding and payloads)."""
+    resolved = []
+    for chunk in chunks:
+        if "text" in chunk:
+            resolved.append(chunk)
+        else:
+            resolved.append({**chunk, "text": resolve_chunk_text(chunk, base_dir)})
+    return resolved
@@ -28,6 +28,9 @@ LLM_MODEL_ID = "openai/gpt-oss-120b"
 LLM_MAX_TOKENS = 3000
 LLM_TEMPERATURE = 0.7
 
+# Prompt Playground: variants streamed at once per A/B round
+PLAYGROUND_MAX_CONCURRENCY = 6
+
 # Model Configuration
 AVAILABLE_MODELS = [
     "openai/gpt-oss-120b"
@@ -38,9 +41,45 @@ MODEL_API_KEY_MAP = {
     "openai/gpt-oss-120b": "GROQ_API_KEY"
 }
 
+# Local stand-in provider (src/local_provider.py): models named "local/..." are served by it,
+# with no API key, so load tests and CI run offline
+LOCAL_MODEL_PREFIX = "local/"
+LOCAL_LLM_PORT = 8765
+LOCAL_LLM_URL = os.getenv("LOCAL_LLM_URL", f"http://127.0.0.1:{LOCAL_LLM_PORT}/v1")
+
+# Provider rate limits per API key (local_llm_multi scheduler): requests and tokens per minute.
+# Keys not listed are not throttled. Defaults are Groq's free tier for openai/gpt-oss-120b.
+PROVIDER_RATE_LIMITS = {
+    "GROQ_API_KEY": {"rpm": 30, "tpm": 8000},
+}
+LLM_PRIORITY_INTERACTIVE = 0  # Streamlit users
+LLM_PRIORITY_BATCH = 10  # batch jobs queue behind interactive calls (within one process)
+# The scheduler's buckets live in one process, so processes sharing a key each keep to a fixed
+# share of its budget: batch_generate.py uses LLM_BATCH_BUDGET_SHARE, everything else (the app,
+# playground, load tests) LLM_APP_BUDGET_SHARE. Keep the two summing to at most 1.0.
+LLM_APP_BUDGET_SHARE = 0.7
+LLM_BATCH_BUDGET_SHARE = 0.3
+LLM_RATE_LIMIT_RETRIES = 5  # retries after HTTP 429
+LLM_BACKOFF_BASE = 1.0  # seconds, doubled per retry (jittered)
+LLM_BACKOFF_MAX = 30.0
+
+# Hedged streaming (local_llm_multi.hedged_stream): when the first token is later than the
+# model's learned TTFT percentile, a backup request goes to the next model in AVAILABLE_MODELS.
+# With a single model configured the backup is a second request to the same model
+# (LLM_HEDGE_SAME_MODEL); set it to False to hedge only across different models.
+LLM_HEDGING_ENABLED = True
+LLM_HEDGE_SAME_MODEL = True
+LLM_HEDGE_PERCENTILE = 95
+LLM_HEDGE_MIN_SAMPLES = 20  # until then, LLM_HEDGE_DEFAULT_DELAY applies
+LLM_HEDGE_DEFAULT_DELAY = 10.0  # seconds
+LLM_HEDGE_MIN_DELAY = 2.0  # seconds
+LLM_HEDGE_WINDOW = 200  # recent TTFT samples kept per model
+
 # Story Embeddings (Alibaba GTE)
 STORY_COLLECTION_NAME = "chandamama_stories"
 STORY_EMBEDDING_MODEL_NAME = "Alibaba-NLP/gte-multilingual-base"
+# Bump to force a full re-embed with the same model (e.g. after changing how stories are rendered for embedding)
+STORY_EMBEDDING_MODEL_VERSION = "1"
 STORY_MAX_TOKEN_LIMIT = 8192
 STORY_BATCH_SIZE = 1
 
@@ -49,3 +88,49 @@ CHUNK_TARGET_MIN = 300
 CHUNK_TARGET_MAX = 500
 CHUNK_HARD_MIN = 150
 CHUNK_HARD_MAX = 700
+
+# Serial Generation (chapter-by-chapter)
+SERIAL_CHECKPOINT_DIR = "data/serial_checkpoints"
+SERIAL_CHECKPOINT_MAX_AGE_DAYS = 7  # checkpoints of abandoned serials are deleted after this
+SERIAL_CHAPTER_MIN_TOKENS = 1500
+SERIAL_SUMMARY_MAX_TOKENS = 500
+SERIAL_CONTINUITY_CHARS = 600
+
+# Headless Batch Generation (src/scripts/batch_generate.py)
+BATCH_GEN_WORKERS = 4  # concurrent rows; the LLM rate limiter paces the actual calls
+BATCH_GEN_TOP_K = 2  # archive stories retrieved per row, as in the app
+
+# Speculative RAG Prefetch (app.py)
+PREFETCH_DEBOUNCE_SECONDS = 0.6
+PREFETCH_CACHE_SIZE = 32
+
+# Request Span Timing (src/perf/spans.py): rotating JSONL log + sidebar summary
+SPAN_LOG_PATH = "logs/spans.jsonl"
+SPAN_LOG_MAX_BYTES = 5 * 1024 * 1024
+SPAN_LOG_BACKUPS = 3
+SPAN_SUMMARY_WINDOW = 200  # most recent requests summarized in the sidebar
+
+# Crossword Layout Search (seeded random restarts)
+# The app searches sequentially under the deadline: a small search is faster than pool startup.
+# Worker processes are opt-in for CLI runs (benchmark, puzzle bank builds).
+PUZZLE_SEARCH_ATTEMPTS = 400
+PUZZLE_SEARCH_WORKERS = min(4, os.cpu_count() or 1)
+PUZZLE_SEARCH_DEADLINE_SECONDS = 2.0
+
+# Offline Puzzle Bank (precomputed archive crosswords)
+PUZZLE_BANK_PATH = "data/puzzle_bank/puzzle_bank.sqlite"
+
+# Embedding window for chunk sizing with the real tokenizer (generate_chunks --token-counter tokenizer)
+EMBEDDING_MAX_TOKENS = 512
+EMBEDDING_RESERVED_TOKENS = 8  # <s>, </s> and the "passage: " prefix
+
+# Sliding-window chunking (generate_chunks --strategy window): offsets, not copied text
+CHUNKS_WINDOW_DIR = "data/chunks_window"
+CHUNK_WINDOW_TOKENS = 448
+CHUNK_WINDOW_STRIDE = 320  # 128 tokens of overlap
+WINDOW_COLLECTION_NAME = "chandamama_chunks_window"
+
+# Chunk file format written by generate_chunks: json | jsonl | jsonl.zst (see src/chunk_format.py).
+# Was json (indent=4); regenerating an issue replaces its file in the old format, and readers
+# (data_loader.scan_chunk_files) take one file per issue. Set "json" to keep the old output.
+CHUNK_FILE_FORMAT = "jsonl"
@@ -1,10 +1,13 @@
 import os
 import json
+import re
 import sys
 try:
     from src import config
+    from src.chunk_format import CHUNK_FORMATS, CHUNK_SUFFIXES, write_chunk_file
 except ImportError:
     import config
+    from chunk_format import CHUNK_FORMATS, CHUNK_SUFFIXES, write_chunk_file
 
 print("Start...", flush=True)
 
@@ -24,28 +27,124 @@ def get_token_count(text):
         return 0
     return len(text.split()) * 2
 
-def split_large_paragraph(text, max_tokens):
-    sentences = text.replace(".", ".|").replace("?", "?|").replace("!", "!|").split("|")
+TOKEN_COUNTER_MODES = ("estimate", "tokenizer")
+
+class TokenCounter:
+    """
+    Token counts for chunk sizing, computed in batches and cached per text.
+    - estimate: words * 2 (fast, no model download, far off for Telugu subwords)
+    - tokenizer: the embedding model's fast tokenizer, so chunk bounds match the model window
+    """
+    def __init__(self, mode="estimate", model_name=config.EMBEDDING_MODEL_NAME):
+        if mode not in TOKEN_COUNTER_MODES:
+            raise ValueError(f"Unknown token counter '{mode}', expected one of {TOKEN_COUNTER_MODES}")
+        self.mode = mode
+        self.model_name = model_name
+        self._tokenizer = None
+        self._cache = {}
+
+    def limits(self):
+        """(target_min, target_max, hard_min, hard_max) in this counter's units."""
+        if self.mode == "estimate":
+            return TARGET_MIN, TARGET_MAX, HARD_MIN, HARD_MAX
+        # Real tokens: the hard cap must leave room for special tokens and the "passage: " prefix
+        hard_max = min(HARD_MAX, config.EMBEDDING_MAX_TOKENS - config.EMBEDDING_RESERVED_TOKENS)
+        return min(TARGET_MIN, hard_max), min(TARGET_MAX, hard_max), min(HARD_MIN, hard_max), hard_max
+
+    def count_many(self, texts):
+        """Counts for all texts; only texts not seen before reach the tokenizer, in one batch."""
+        missing = list({t: None for t in texts if t not in self._cache})
+        if missing:
+            self._cache.update(zip(missing, self._count_batch(missing)))
+        return [self._cache[t] for t in texts]
+
+    def count(self, text):
+        return self.count_many([text])[0]
+
+    def clear(self):
+        self._cache.clear()
+
+    def token_spans(self, text):
+        """
+        (char_start, char_end) of every token of `text`, in order. In estimate mode a
+        word counts as two tokens, so its span appears twice.
+        """
+        if self.mode == "estimate":
+            return [(m.start(), m.end()) for m in re.finditer(r"\S+", text) for _ in range(2)]
+        self._load_tokenizer()
+        encoded = self._tokenizer(text, add_special_tokens=False, return_offsets_mapping=True)
+        return [tuple(span) for span in encoded["offset_mapping"]]
+
+    def _load_tokenizer(self):
+        if self._tokenizer is None:
+            from transformers import AutoTokenizer
+            print(f"Loading tokenizer '{self.model_name}'...", flush=True)
+            self._tokenizer = AutoTokenizer.from_pretrained(self.model_name, use_fast=True)
+
+    def _count_batch(self, texts):
+        if self.mode == "estimate":
+            return [get_token_count(t) for t in texts]
+        self._load_tokenizer()
+        encoded = self._tokenizer(texts, add_special_tokens=False, return_attention_mask=False)
+        return [len(ids) for ids in encoded["input_ids"]]
+
+_DEFAULT_COUNTER = TokenCounter("estimate")
+
+# A sentence runs up to and including its end marks (. ? ! and the Devanagari/Telugu
+# danda । and double danda ॥), plus any closing quotes or brackets that follow them.
+SENTENCE_PATTERN = re.compile(r'[^.?!।॥]*(?:[.?!।॥]+[\'"”’)\]]*|$)')
+
+def split_sentences(text):
+    """Sentences of `text` in one regex scan; pieces keep their marks and spacing."""
+    return [s for s in SENTENCE_PATTERN.findall(text) if s.strip()]
+
+def _split_words(sentence, max_tokens, counter):
+    """Fallback for a single sentence over max_tokens: pack its words instead."""
+    words = sentence.split()
+    parts = []
+    current, current_tokens = [], 0
+    for word, word_tokens in zip(words, counter.count_many(words)):
+        if current and current_tokens + word_tokens > max_tokens:
+            parts.append(" ".join(current))
+            current, current_tokens = [], 0
+        current.append(word)
+        current_tokens += word_tokens
+    if current:
+        parts.append(" ".join(current))
+    return parts
+
+def split_large_paragraph(text, max_tokens, counter=None):
+    """
+    Packs the sentences of an oversized paragraph into parts of at most max_tokens.
+    Linear: sentences are found in one scan, counted once in a batch, kept in a
+    list with a running token total, and joined only when a part is closed.
+    """
+    counter = counter or _DEFAULT_COUNTER
+    sentences = split_sentences(text)
     sub_chunks = []
-    current_sub = ""
-    for sent in sentences:
-        if not sent.strip():
-            continue
-        proposed = current_sub + sent
-        if get_token_count(proposed) > max_tokens:
+    current_sub = []
+    current_tokens = 0
+    for sent, sent_tokens in zip(sentences, counter.count_many(sentences)):
+        if sent_tokens > max_tokens:
             if current_sub:
-                sub_chunks.append(current_sub)
-            current_sub = sent
-        else:
-            current_sub = proposed
+                sub_chunks.append("".join(current_sub))
+                current_sub, current_tokens = [], 0
+            sub_chunks.extend(_split_words(sent, max_tokens, counter))
+            continue
+        if current_sub and current_tokens + sent_tokens > max_tokens:
+            sub_chunks.append("".join(current_sub))
+            current_sub, current_tokens = [], 0
+        current_sub.append(sent)
+        current_tokens += sent_tokens
     if current_sub:
-        sub_chunks.append(current_sub)
+        sub_chunks.append("".join(current_sub))
     return sub_chunks
 
 print("Functions 1 done...", flush=True)
 
-def create_chunk_object(story, chunk_text, index, year, month, source_path):
-    return {
+def create_chunk_object(story, chunk_text, index, year, month, source_path, char_span=None):
+    """With char_span, the chunk stores (char_start, char_end) into the story content instead of its text."""
+    obj = {
         "story_id": story.get("story_id", "UNKNOWN"),
         "chunk_id": f"{story.get('story_id', 'UNKNOWN')}_{index:02d}",
         "chunk_index": index,
@@ -60,46 +159,73 @@ def create_chunk_object(story, chunk_text, index, year, month, source_path):
         "language": story.get("language", ""),
         "text": chunk_text
     }
+    if char_span is not None:
+        del obj["text"]
+        obj["char_start"], obj["char_end"] = char_span
+    return obj
 
-def chunk_story(story, year, month, source_path):
+def split_paragraphs(content):
+    return [p.strip() for p in content.split('\n') if p.strip()]
+
+def chunk_story(story, year, month, source_path, counter=None):
+    """
+    Greedy paragraph packer. Every paragraph is counted once (in one batch per story,
+    or per file when process_file primes the counter) and the counts are carried along
+    with the paragraphs, never recomputed.
+    """
+    counter = counter or _DEFAULT_COUNTER
+    target_min, target_max, hard_min, hard_max = counter.limits()
     content = story.get("content", "")
     if not content:
         return []
-    paragraphs = [p.strip() for p in content.split('\n') if p.strip()]
+    paragraphs = split_paragraphs(content)
+    para_counts = counter.count_many(paragraphs)
     chunks = []
     current_chunk_paras = []
+    current_chunk_counts = []
     current_tokens = 0
     i = 0
     while i < len(paragraphs):
         para = paragraphs[i]
-        para_tokens = get_token_count(para)
+        para_tokens = para_counts[i]
         
-        if para_tokens > HARD_MAX:
+        if para_tokens > hard_max:
             if current_chunk_paras:
                 chunks.append("\n".join(current_chunk_paras))
                 current_chunk_paras = []
+                current_chunk_counts = []
                 current_tokens = 0
-            sub_parts = split_large_paragraph(para, HARD_MAX)
+            sub_parts = split_large_paragraph(para, hard_max, counter)
             chunks.extend(sub_parts)
             i += 1
             continue
 
-        if current_tokens + para_tokens > TARGET_MAX:
+        if current_tokens + para_tokens > target_max:
              # Logic to close chunk
-             if current_tokens + para_tokens > HARD_MAX or current_tokens >= TARGET_MIN:
+             if current_tokens + para_tokens > hard_max or current_tokens >= target_min:
                  if current_chunk_paras:
                      chunks.append("\n".join(current_chunk_paras))
-                     last = current_chunk_paras[-1]
-                     current_chunk_paras = [last, para]
-                     current_tokens = get_token_count(last) + para_tokens
+                     last, last_tokens = current_chunk_paras[-1], current_chunk_counts[-1]
+                     # Overlap by one paragraph, unless that alone would overflow the window
+                     if last_tokens + para_tokens <= hard_max:
+                         current_chunk_paras = [last, para]
+                         current_chunk_counts = [last_tokens, para_tokens]
+                         current_tokens = last_tokens + para_tokens
+                     else:
+                         current_chunk_paras = [para]
+                         current_chunk_counts = [para_tokens]
+                         current_tokens = para_tokens
                  else:
                      current_chunk_paras = [para]
+                     current_chunk_counts = [para_tokens]
                      current_tokens = para_tokens
              else:
                  current_chunk_paras.append(para)
+                 current_chunk_counts.append(para_tokens)
                  current_tokens += para_tokens
         else:
              current_chunk_paras.append(para)
+             current_chunk_counts.append(para_tokens)
              current_tokens += para_tokens
         i += 1
     
@@ -112,9 +238,37 @@ def chunk_story(story, year, month, source_path):
         final_objs.append(create_chunk_object(story, text, idx+1, year, month, source_path))
     return final_objs
 
+def window_chunk_story(story, year, month, source_path, counter=None,
+                       window_tokens=config.CHUNK_WINDOW_TOKENS, stride_tokens=config.CHUNK_WINDOW_STRIDE):
+    """
+    Sliding-window chunker: windows of exactly window_tokens tokens (the last may be
+    shorter) starting every stride_tokens tokens, so every pair of neighbours overlaps
+    by window_tokens - stride_tokens. Chunks are character offsets into story["content"].
+    """
+    counter = counter or _DEFAULT_COUNTER
+    window_tokens = min(window_tokens, counter.limits()[3])
+    if not 0 < stride_tokens <= window_tokens:
+        raise ValueError(f"stride_tokens must be in 1..{window_tokens}, got {stride_tokens}")
+    content = story.get("content", "")
+    spans = counter.token_spans(content) if content else []
+    if not spans:
+        return []
+
+    chunks = []
+    for start in range(0, len(spans), stride_tokens):
+        end = min(start + window_tokens, len(spans))
+        char_span = (spans[start][0], spans[end - 1][1])
+        chunks.append(create_chunk_object(story, None, len(chunks) + 1, year, month, source_path, char_span))
+        if end == len(spans):
+            break
+    return chunks
+
+CHUNK_STRATEGIES = ("paragraph", "window")
+
 print("Functions 2 done. processing...", flush=True)
 
-def process_file(file_path):
+def process_file(file_path, counter=None, strategy="paragraph", output_dir=OUTPUT_DIR, fmt=config.CHUNK_FILE_FORMAT):
+    counter = counter or _DEFAULT_COUNTER
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
             data = json.load(f)
@@ -130,7 +284,7 @@ def process_file(file_path):
         if part.isdigit() and len(part) == 4:
             year = part
             
-    out_year_dir = os.path.join(OUTPUT_DIR, year)
+    out_year_dir = os.path.join(output_dir, year)
     if not os.path.exists(out_year_dir):
         os.makedirs(out_year_dir, exist_ok=True)
         
@@ -156,22 +310,48 @@ def process_file(file_path):
     except ValueError:
         source_path = os.path.basename(file_path) # Fallback if path issue
 
-    out_filename = filename.replace(".json", "_chunks.json")
+    out_filename = filename[:-len(".json")] + CHUNK_SUFFIXES[fmt]
     out_path = os.path.join(out_year_dir, out_filename)
     
     # Check if exists to skip? No, overwrite.
     
     book_chunks = []
-    if "stories" in data:
+    if "stories" in data and strategy == "window":
+        for story in data["stories"]:
+            book_chunks.extend(window_chunk_story(story, year, month, source_path, counter))
+    elif "stories" in data:
+        # Tokenize every paragraph of the issue in one batch; chunk_story then hits the cache
+        counter.count_many([p for story in data["stories"] for p in split_paragraphs(story.get("content", "") or "")])
         for story in data["stories"]:
-            book_chunks.extend(chunk_story(story, year, month, source_path))
+            book_chunks.extend(chunk_story(story, year, month, source_path, counter))
+        counter.clear()
             
-    with open(out_path, 'w', encoding='utf-8') as f:
-        json.dump(book_chunks, f, ensure_ascii=False, indent=4)
+    write_chunk_file(out_path, book_chunks, fmt)
+    # Replace, not add to, the issue's file in any other format (e.g. the pre-JSONL _chunks.json)
+    stem = out_path[:-len(CHUNK_SUFFIXES[fmt])]
+    for other in CHUNK_FORMATS:
+        if other != fmt and os.path.exists(stem + CHUNK_SUFFIXES[other]):
+            os.remove(stem + CHUNK_SUFFIXES[other])
     # print(f"Saved {len(book_chunks)} chunks to {out_filename}", flush=True) # Reduce spam
 
-def main():
-    print("Starting Full Rollout...", flush=True)
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Chunk the archive into retrieval passages")
+    parser.add_argument("--token-counter", choices=TOKEN_COUNTER_MODES, default="estimate",
+                        help="How chunk sizes are measured (default: estimate)")
+    parser.add_argument("--strategy", choices=CHUNK_STRATEGIES, default="paragraph",
+                        help="paragraph: greedy paragraph packer (text inline); "
+                             "window: sliding token windows (offsets)")
+    parser.add_argument("--output-dir", help="Defaults to data/chunks (paragraph) or config.CHUNKS_WINDOW_DIR (window)")
+    parser.add_argument("--format", choices=CHUNK_FORMATS, default=config.CHUNK_FILE_FORMAT,
+                        help="Chunk file format (default: %(default)s; jsonl.zst needs zstandard)")
+    args = parser.parse_args(argv)
+    counter = TokenCounter(args.token_counter)
+    default_dir = OUTPUT_DIR if args.strategy == "paragraph" else os.path.join(os.getcwd(), config.CHUNKS_WINDOW_DIR)
+    output_dir = args.output_dir or default_dir
+
+    print(f"Starting Full Rollout (strategy: {args.strategy}, format: {args.format}, token counter: {counter.mode}, "
+          f"limits: {counter.limits()}) -> {output_dir}", flush=True)
     files = []
     for root, dirs, filenames in os.walk(BASE_DIR):
         for filename in filenames:
@@ -182,7 +362,7 @@ def main():
     print(f"Found {len(files)} files.", flush=True)
     
     for i, fp in enumerate(files):
-        process_file(fp)
+        process_file(fp, counter, args.strategy, output_dir, args.format)
         if (i+1) % 50 == 0:
             print(f"Processed {i+1}/{len(files)} files...", flush=True)
             
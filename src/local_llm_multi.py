@@ -1,6 +1,14 @@
+import collections
+import heapq
+import itertools
+import math
 import os
-
-from typing import Optional
+import queue
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
 from openai import OpenAI
 from src import config
 
@@ -16,6 +24,14 @@ def get_client(model_id: str):
     
     if model_id in _client_instances:
         return _client_instances[model_id]
+
+    # Local stand-in provider (src/local_provider.py): OpenAI-compatible, no key. Retries are left
+    # to the scheduler so injected errors surface exactly as a real provider's would.
+    if model_id.startswith(config.LOCAL_MODEL_PREFIX):
+        print(f"Initializing Local LLM Client for {model_id} at {config.LOCAL_LLM_URL}...", flush=True)
+        client = OpenAI(base_url=config.LOCAL_LLM_URL, api_key="local", max_retries=0)
+        _client_instances[model_id] = ("openai", client)
+        return _client_instances[model_id]
         
     # Determine which env var to use for the key
     # config.MODEL_API_KEY_MAP can contain either the Env Var NAME or the direct KEY
@@ -60,83 +76,676 @@ def get_client(model_id: str):
         
     return _client_instances[model_id]
 
+@dataclass
+class CompletionResult:
+    """One LLM call: the text plus usage and timing. Token counts are None when the provider did not report them."""
+    model_id: str
+    text: str = ""
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+    cached_tokens: Optional[int] = None  # prompt tokens served from the provider's prompt cache
+    ttft: Optional[float] = None  # seconds to the first token (the whole response when not streaming)
+    latency: Optional[float] = None  # seconds to the end of the response
+    streamed: bool = False
+    error: Optional[str] = None
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def total_tokens(self) -> Optional[int]:
+        if self.prompt_tokens is None and self.completion_tokens is None:
+            return None
+        return (self.prompt_tokens or 0) + (self.completion_tokens or 0)
+
+    @property
+    def tokens_per_sec(self) -> Optional[float]:
+        """Output throughput; for streams, measured over the decode phase (after the first token)."""
+        if not self.completion_tokens or not self.latency:
+            return None
+        span = self.latency - self.ttft if self.streamed and self.ttft is not None else self.latency
+        return self.completion_tokens / span if span > 0 else None
+
+    @property
+    def cache_hit_ratio(self) -> Optional[float]:
+        """Share of the prompt served from the provider's prompt cache."""
+        if not self.prompt_tokens or self.cached_tokens is None:
+            return None
+        return self.cached_tokens / self.prompt_tokens
+
+# Called with every finished CompletionResult (successful or not), e.g. for cost/latency logging
+_usage_listeners: List[Callable[[CompletionResult], None]] = []
+_listeners_lock = threading.Lock()
+
+def add_usage_listener(listener: Callable[[CompletionResult], None]):
+    with _listeners_lock:
+        _usage_listeners.append(listener)
+
+def remove_usage_listener(listener: Callable[[CompletionResult], None]):
+    with _listeners_lock:
+        if listener in _usage_listeners:
+            _usage_listeners.remove(listener)
+
+def _notify(result: CompletionResult):
+    with _listeners_lock:
+        listeners = list(_usage_listeners)
+    for listener in listeners:
+        try:
+            listener(result)
+        except Exception as e:
+            print(f"Usage listener failed: {e}", flush=True)
+
+# --- Provider adapter: the one place that knows each client's request/response shape ---
+
+def _build_messages(prompt: str, system_prompt: Optional[str]) -> List[Dict[str, str]]:
+    messages = []
+    if system_prompt:
+        messages.append({"role": "system", "content": system_prompt})
+    messages.append({"role": "user", "content": prompt})
+    return messages
+
+def _create(client_type: str, client, model_id: str, messages, max_tokens: int, temperature: float, stream: bool):
+    # OPENAI & GROQ (Compatible APIs)
+    if client_type in ["openai", "groq"]:
+        kwargs = {}
+        if stream and client_type == "openai":
+            kwargs["stream_options"] = {"include_usage": True}  # usage arrives on the final chunk
+        return client.chat.completions.create(
+            model=model_id,
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            stream=stream,
+            **kwargs
+        )
+    # HUGGING FACE
+    if client_type == "hf":
+        return client.chat_completion(
+            messages,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            top_p=0.9,
+            stream=stream
+        )
+    raise ValueError(f"Unknown client type '{client_type}' for {model_id}")
+
+def _delta_text(chunk) -> str:
+    choices = getattr(chunk, "choices", None)
+    if choices:
+        delta = getattr(choices[0], "delta", None)
+        return getattr(delta, "content", None) or ""
+    return ""
+
+def _message_text(response) -> str:
+    choices = getattr(response, "choices", None)
+    if choices and choices[0].message.content:
+        return choices[0].message.content
+    return ""
+
+def _apply_usage(result: CompletionResult, obj):
+    """Copies token usage from a response or stream chunk (Groq streams report it under x_groq)."""
+    usage = getattr(obj, "usage", None) or getattr(getattr(obj, "x_groq", None), "usage", None)
+    if usage is None:
+        return
+    result.prompt_tokens = getattr(usage, "prompt_tokens", result.prompt_tokens)
+    result.completion_tokens = getattr(usage, "completion_tokens", result.completion_tokens)
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached = getattr(details, "cached_tokens", None) if details is not None else None
+    if cached is not None:
+        result.cached_tokens = cached
+
+# --- Rate-limit scheduler: token buckets per provider key, served by priority ---
+
+class TokenBucket:
+    """A per-minute budget that refills continuously; a full minute's budget can burst."""
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        self._refill()
+        amount = min(amount, self.capacity)
+        return 0.0 if self.tokens >= amount else (amount - self.tokens) / self.rate
+
+    def take(self, amount: float):
+        self._refill()
+        self.tokens -= amount  # may go negative after a settle; later callers wait it out
+
+    def drain(self):
+        self._refill()
+        self.tokens = min(self.tokens, 0.0)
+
+class RateLimitScheduler:
+    """
+    Keeps each provider key under `share` of its requests/tokens-per-minute budgets. Callers
+    queue per key and the best priority (lowest number, then arrival) is served first as budget
+    refills. Token reservations are estimates; settle() corrects them with the reported usage.
+
+    Buckets and queues are per process: priorities only order calls within this process, and
+    other processes on the same key (e.g. a batch job next to the app) must keep to their own
+    share (config.LLM_APP_BUDGET_SHARE / LLM_BATCH_BUDGET_SHARE) for the total to stay in budget.
+    """
+    def __init__(self, limits: Dict[str, Dict[str, float]], share: float = 1.0):
+        self._limits = {key: {name: limit * share for name, limit in budgets.items()}
+                        for key, budgets in limits.items()}
+        self._buckets = {}
+        self._queues = collections.defaultdict(list)
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+
+    def _buckets_for(self, key: str) -> Dict[str, TokenBucket]:
+        if key not in self._buckets:
+            self._buckets[key] = {name: TokenBucket(limit) for name, limit in self._limits[key].items()}
+        return self._buckets[key]
+
+    def acquire(self, key: str, tokens: int, priority: int = config.LLM_PRIORITY_INTERACTIVE) -> float:
+        """Blocks until one request of ~`tokens` fits the key's budgets; returns the seconds waited."""
+        if key not in self._limits:
+            return 0.0
+        start = time.monotonic()
+        needs = {"rpm": 1, "tpm": tokens}
+        with self._cond:
+            buckets = self._buckets_for(key)
+            waiting = self._queues[key]
+            ticket = (priority, next(self._seq))
+            heapq.heappush(waiting, ticket)
+            try:
+                while True:
+                    if waiting[0] != ticket:
+                        self._cond.wait()
+                        continue
+                    wait = max(b.wait_time(needs.get(name, 0)) for name, b in buckets.items())
+                    if wait <= 0:
+                        for name, b in buckets.items():
+                            b.take(needs.get(name, 0))
+                        break
+                    self._cond.wait(timeout=wait)
+            finally:
+                waiting.remove(ticket)
+                heapq.heapify(waiting)
+                self._cond.notify_all()
+        return time.monotonic() - start
+
+    def settle(self, key: str, reserved: int, actual: Optional[int]):
+        """Replaces a token reservation with the usage the provider reported."""
+        if key not in self._limits or actual is None:
+            return
+        with self._cond:
+            bucket = self._buckets_for(key).get("tpm")
+            if bucket:
+                bucket.take(actual - reserved)
+            self._cond.notify_all()
+
+    def penalize(self, key: str):
+        """After a 429 the provider's window is full: empty the buckets so queued calls wait for refill."""
+        if key not in self._limits:
+            return
+        with self._cond:
+            for bucket in self._buckets_for(key).values():
+                bucket.drain()
+
+_SCHEDULER = RateLimitScheduler(config.PROVIDER_RATE_LIMITS, config.LLM_APP_BUDGET_SHARE)
+
+def set_budget_share(share: float):
+    """Sets this process's share of every key's budget; call before the first LLM request."""
+    global _SCHEDULER
+    _SCHEDULER = RateLimitScheduler(config.PROVIDER_RATE_LIMITS, share)
+
+def provider_key(model_id: str) -> str:
+    """Rate limits are per API key, shared by every model on it."""
+    if model_id.startswith(config.LOCAL_MODEL_PREFIX):
+        return "LOCAL"
+    return config.MODEL_API_KEY_MAP.get(model_id, "HF_TOKEN")
+
+def _estimate_tokens(messages: List[Dict[str, str]], max_tokens: int) -> int:
+    # ~3 characters per token across Telugu/English prompts; half the completion budget is typical
+    prompt_chars = sum(len(m["content"]) for m in messages)
+    return prompt_chars // 3 + max_tokens // 2
+
+def _is_rate_limited(error: Exception) -> bool:
+    status = getattr(error, "status_code", None) or getattr(getattr(error, "response", None), "status_code", None)
+    return status == 429 or "rate limit" in str(error).lower()
+
+def _retry_after(error: Exception) -> Optional[float]:
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    try:
+        return float(headers.get("retry-after")) if headers else None
+    except (TypeError, ValueError):
+        return None
+
+def _backoff_delay(attempt: int) -> float:
+    """Exponential backoff with jitter, so throttled callers do not retry in lockstep."""
+    cap = min(config.LLM_BACKOFF_MAX, config.LLM_BACKOFF_BASE * (2 ** attempt))
+    return random.uniform(cap / 2, cap)
+
+def _scheduled_create(result: "CompletionResult", messages, max_tokens: int, temperature: float,
+                      stream: bool, priority: int):
+    """_create() under the provider's rate limits, retrying 429s. Returns (response, reserved tokens)."""
+    client_type, client = get_client(result.model_id)
+    key = provider_key(result.model_id)
+    reserved = _estimate_tokens(messages, max_tokens)
+    for attempt in range(config.LLM_RATE_LIMIT_RETRIES + 1):
+        result.extra.pop("dispatched_at", None)
+        waited = _SCHEDULER.acquire(key, reserved, priority)
+        result.extra["queue_wait"] = result.extra.get("queue_wait", 0.0) + waited
+        result.extra["dispatched_at"] = time.perf_counter()  # left the queue; hedging times from here
+        try:
+            return _create(client_type, client, result.model_id, messages, max_tokens, temperature, stream), reserved
+        except Exception as e:
+            _SCHEDULER.settle(key, reserved, 0)  # rejected requests use no tokens
+            if not _is_rate_limited(e) or attempt == config.LLM_RATE_LIMIT_RETRIES:
+                raise
+            _SCHEDULER.penalize(key)
+            delay = _retry_after(e) or _backoff_delay(attempt)
+            result.extra["rate_limit_retries"] = attempt + 1
+            print(f"Rate limited on {result.model_id} ({key}); retry {attempt + 1} in {delay:.1f}s", flush=True)
+            time.sleep(delay)
+
+# --- Public API ---
+
+def complete(
+    model_id: str,
+    prompt: str,
+    system_prompt: Optional[str] = None,
+    max_tokens: int = config.LLM_MAX_TOKENS,
+    temperature: float = config.LLM_TEMPERATURE,
+    priority: int = config.LLM_PRIORITY_INTERACTIVE
+) -> CompletionResult:
+    """
+    Non-streaming call. Returns a CompletionResult (text, usage, timing); raises on provider errors.
+    Waits for the provider's rate-limit budget (by priority) and retries 429s.
+    """
+    result = CompletionResult(model_id)
+    start = time.perf_counter()
+    try:
+        response, reserved = _scheduled_create(result, _build_messages(prompt, system_prompt),
+                                               max_tokens, temperature, False, priority)
+        result.text = _message_text(response)
+        _apply_usage(result, response)
+        _SCHEDULER.settle(provider_key(model_id), reserved, result.total_tokens)
+        result.ttft = result.latency = time.perf_counter() - start
+        return result
+    except Exception as e:
+        result.error = str(e)
+        result.latency = time.perf_counter() - start
+        raise
+    finally:
+        _notify(result)
+
+class LLMStream:
+    """
+    Iterator of text pieces for one streaming call. `result` holds the final text, usage and
+    timing once iteration ends. Raises on provider errors, like complete().
+    """
+    def __init__(self, model_id: str, prompt: str, system_prompt: Optional[str] = None,
+                 max_tokens: int = config.LLM_MAX_TOKENS, temperature: float = config.LLM_TEMPERATURE,
+                 priority: int = config.LLM_PRIORITY_INTERACTIVE):
+        self.result = CompletionResult(model_id, streamed=True)
+        self._args = (prompt, system_prompt, max_tokens, temperature, priority)
+        self._iterator = None
+        self._response = None
+        self._reserved = None
+        self._settle_lock = threading.Lock()
+
+    def __iter__(self):
+        if self._iterator is None:
+            self._iterator = self._run()
+        return self._iterator
+
+    def __next__(self):
+        return next(iter(self))
+
+    def close(self):
+        """
+        Abandons the stream (e.g. the losing side of a hedge); the provider connection is closed.
+        Safe to call from another thread while a read is blocked: closing the response ends that
+        read, and the rate-limit reservation is settled here rather than waiting for it.
+        """
+        self.result.extra["cancelled"] = True
+        response = self._response
+        if hasattr(response, "close"):
+            try:
+                response.close()
+            except Exception as e:
+                print(f"Closing {self.result.model_id} stream failed: {e}")
+        self._settle()
+        if self._iterator is not None:
+            try:
+                self._iterator.close()
+            except ValueError:
+                pass  # running in another thread; it ends on the closed response
+
+    def _settle(self):
+        # Once per stream: from close() or when the stream ends
+        with self._settle_lock:
+            reserved, self._reserved = self._reserved, None
+        if reserved is not None:
+            _SCHEDULER.settle(provider_key(self.result.model_id), reserved, self.result.total_tokens)
+
+    def _run(self) -> Iterator[str]:
+        prompt, system_prompt, max_tokens, temperature, priority = self._args
+        result = self.result
+        start = time.perf_counter()
+        parts = []
+        deltas = 0
+        response_stream = None
+        if result.extra.get("cancelled"):
+            return
+        try:
+            response_stream, self._reserved = _scheduled_create(result, _build_messages(prompt, system_prompt),
+                                                                max_tokens, temperature, True, priority)
+            self._response = response_stream
+            if result.extra.get("cancelled"):
+                return  # closed while queued for rate-limit budget
+            for chunk in response_stream:
+                _apply_usage(result, chunk)
+                text = _delta_text(chunk)
+                if not text:
+                    continue
+                if result.ttft is None:
+                    result.ttft = time.perf_counter() - start
+                deltas += 1
+                parts.append(text)
+                yield text
+        except Exception as e:
+            if result.extra.get("cancelled"):
+                return  # the read failed because close() shut the response
+            result.error = str(e)
+            raise
+        finally:
+            if hasattr(response_stream, "close"):
+                response_stream.close()
+            result.latency = time.perf_counter() - start
+            result.text = "".join(parts)
+            if result.completion_tokens is None and deltas:
+                # Provider sent no usage: one token per delta is the usual granularity
+                result.completion_tokens = deltas
+                result.extra["completion_tokens_estimated"] = True
+            self._settle()
+            _notify(result)
+
+def stream(
+    model_id: str,
+    prompt: str,
+    system_prompt: Optional[str] = None,
+    max_tokens: int = config.LLM_MAX_TOKENS,
+    temperature: float = config.LLM_TEMPERATURE,
+    priority: int = config.LLM_PRIORITY_INTERACTIVE
+) -> LLMStream:
+    """Streaming call: iterate for text pieces, then read `.result` for usage and timing."""
+    return LLMStream(model_id, prompt, system_prompt, max_tokens, temperature, priority)
+
+# --- Hedged streaming ---
+
+class TTFTTracker:
+    """
+    Recent time-to-first-token samples per model; the hedge delay is a percentile of them.
+    Censored samples (a hedged-out request that was cancelled before its first token) are
+    kept apart: they are only lower bounds at or above the current delay, and counting them
+    would push the percentile up and suppress future hedging.
+    """
+    def __init__(self, window: int = config.LLM_HEDGE_WINDOW):
+        self._samples = collections.defaultdict(lambda: collections.deque(maxlen=window))
+        self._censored = collections.defaultdict(lambda: collections.deque(maxlen=window))
+        self._lock = threading.Lock()
+
+    def observe(self, model_id: str, ttft: float):
+        with self._lock:
+            self._samples[model_id].append(ttft)
+
+    def observe_censored(self, model_id: str, lower_bound: float):
+        with self._lock:
+            self._censored[model_id].append(lower_bound)
+
+    def censored_share(self, model_id: str) -> float:
+        """Share of recent requests to model_id that were hedged out before their first token."""
+        with self._lock:
+            censored = len(self._censored.get(model_id, ()))
+            total = censored + len(self._samples.get(model_id, ()))
+        return censored / total if total else 0.0
+
+    def threshold(self, model_id: str, percentile: float = config.LLM_HEDGE_PERCENTILE) -> float:
+        with self._lock:
+            samples = sorted(self._samples.get(model_id, ()))
+        if len(samples) < config.LLM_HEDGE_MIN_SAMPLES:
+            return config.LLM_HEDGE_DEFAULT_DELAY
+        k = max(0, math.ceil(percentile / 100 * len(samples)) - 1)
+        return max(config.LLM_HEDGE_MIN_DELAY, samples[k])
+
+_TTFT_TRACKER = TTFTTracker()
+
+def _learn_ttft(result: CompletionResult):
+    if result.streamed and result.ttft is not None and result.error is None:
+        # Provider latency only: hedge delays are timed from dispatch, after any rate-limit queueing
+        _TTFT_TRACKER.observe(result.model_id, max(0.0, result.ttft - result.extra.get("queue_wait", 0.0)))
+
+add_usage_listener(_learn_ttft)
+
+# --- Prompt-cache accounting: callers keep a static system prefix so providers can reuse it ---
+
+class PromptCacheStats:
+    """Running totals of prompt vs cached prompt tokens per model."""
+    def __init__(self):
+        self._totals: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, result: CompletionResult):
+        if result.error is not None or not result.prompt_tokens:
+            return
+        with self._lock:
+            totals = self._totals.setdefault(result.model_id, {"calls": 0, "prompt_tokens": 0, "cached_tokens": 0})
+            totals["calls"] += 1
+            totals["prompt_tokens"] += result.prompt_tokens
+            totals["cached_tokens"] += result.cached_tokens or 0
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            stats = {model: dict(totals) for model, totals in self._totals.items()}
+        for totals in stats.values():
+            totals["hit_ratio"] = totals["cached_tokens"] / totals["prompt_tokens"]
+        return stats
+
+_PROMPT_CACHE_STATS = PromptCacheStats()
+
+def _record_prompt_cache(result: CompletionResult):
+    _PROMPT_CACHE_STATS.observe(result)
+    if result.cached_tokens:
+        print(f"Prompt cache: {result.cached_tokens}/{result.prompt_tokens} prompt tokens cached ({result.model_id})",
+              flush=True)
+
+add_usage_listener(_record_prompt_cache)
+
+def prompt_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Per-model {calls, prompt_tokens, cached_tokens, hit_ratio} since the process started."""
+    return _PROMPT_CACHE_STATS.snapshot()
+
+def backup_model_for(model_id: str) -> Optional[str]:
+    """
+    The model after model_id in AVAILABLE_MODELS (wrapping around). With no other model
+    configured, model_id itself (a second request) if LLM_HEDGE_SAME_MODEL, else None.
+    """
+    models = config.AVAILABLE_MODELS
+    if model_id not in models:
+        return None
+    if len(models) < 2:
+        return model_id if config.LLM_HEDGE_SAME_MODEL else None
+    i = models.index(model_id)
+    return (models[i + 1:] + models[:i])[0]
+
+# How often a hedge re-checks whether a queued primary has been dispatched
+HEDGE_QUEUE_POLL = 0.05
+
+class HedgedStream:
+    """
+    Streams from model_id; if no token has arrived after the model's learned TTFT percentile
+    (or the request fails before its first token), a backup request goes to `backup_model`.
+    Whichever produces a token first is streamed; the other is cancelled. Since the hedge
+    only fires in the tail, average cost rises by roughly (100 - percentile)%.
+    The delay counts from when the primary left the rate-limit queue: while it is still
+    queued, a backup would only add load to a throttled key, so none is sent.
+    """
+    def __init__(self, model_id: str, prompt: str, system_prompt: Optional[str] = None,
+                 max_tokens: int = config.LLM_MAX_TOKENS, temperature: float = config.LLM_TEMPERATURE,
+                 backup_model: Optional[str] = None, tracker: TTFTTracker = _TTFT_TRACKER,
+                 priority: int = config.LLM_PRIORITY_INTERACTIVE):
+        self.model_id = model_id
+        self.backup_model = backup_model
+        self.tracker = tracker
+        self.result: Optional[CompletionResult] = None
+        self._kwargs = {"prompt": prompt, "system_prompt": system_prompt,
+                        "max_tokens": max_tokens, "temperature": temperature, "priority": priority}
+        self._events = queue.Queue()
+        self._attempts = []
+        self._iterator = None
+
+    def __iter__(self):
+        if self._iterator is None:
+            self._iterator = self._run()
+        return self._iterator
+
+    def __next__(self):
+        return next(iter(self))
+
+    def _launch(self, model_id: str):
+        attempt = {"model": model_id, "stream": stream(model_id, **self._kwargs),
+                   "cancel": threading.Event(), "started": time.perf_counter()}
+        index = len(self._attempts)
+        self._attempts.append(attempt)
+        threading.Thread(target=self._pump, args=(index, attempt), daemon=True,
+                         name=f"hedge-{index}").start()
+
+    def _pump(self, index: int, attempt: Dict[str, Any]):
+        llm_stream = attempt["stream"]
+        try:
+            for piece in llm_stream:
+                if attempt["cancel"].is_set():
+                    break
+                self._events.put((index, "piece", piece))
+            else:
+                self._events.put((index, "end", None))
+        except Exception as e:
+            self._events.put((index, "error", e))
+        finally:
+            if attempt["cancel"].is_set():
+                llm_stream.close()
+
+    def _cancel_others(self, winner: Optional[int]):
+        for index, attempt in enumerate(self._attempts):
+            if index == winner or attempt["cancel"].is_set():
+                continue
+            attempt["cancel"].set()
+            result = attempt["stream"].result
+            dispatched = result.extra.get("dispatched_at")
+            if result.ttft is None and result.error is None and dispatched is not None:
+                # Censored: this model took at least this long to its first token (not a TTFT sample)
+                self.tracker.observe_censored(attempt["model"], time.perf_counter() - dispatched)
+            # Close now rather than when the (possibly stalled) loser yields its next piece
+            attempt["stream"].close()
+
+    def _run(self) -> Iterator[str]:
+        self._launch(self.model_id)
+        delay = self.tracker.threshold(self.model_id)
+        hedge_at = time.perf_counter() + delay
+        winner = None
+        completed = False
+        failed = set()
+        first_error = None
+        try:
+            while True:
+                can_hedge = self.backup_model and len(self._attempts) == 1
+                timeout = max(0.0, hedge_at - time.perf_counter()) if winner is None and can_hedge else None
+                try:
+                    index, kind, payload = self._events.get(timeout=timeout)
+                except queue.Empty:
+                    dispatched = self._attempts[0]["stream"].result.extra.get("dispatched_at")
+                    if dispatched is None:
+                        hedge_at = time.perf_counter() + HEDGE_QUEUE_POLL  # still waiting for rate-limit budget
+                        continue
+                    if dispatched + delay > time.perf_counter():
+                        hedge_at = dispatched + delay
+                        continue
+                    print(f"No first token from {self.model_id} {delay:.1f}s after dispatch; "
+                          f"hedging with {self.backup_model}", flush=True)
+                    self._launch(self.backup_model)
+                    continue
+
+                if winner is None:
+                    if kind == "error":
+                        failed.add(index)
+                        first_error = first_error or payload
+                        if can_hedge:
+                            # Immediate fallback: no point waiting out the hedge delay
+                            print(f"{self._attempts[index]['model']} failed ({payload}); falling back to "
+                                  f"{self.backup_model}", flush=True)
+                            self._launch(self.backup_model)
+                        elif len(failed) == len(self._attempts):
+                            raise first_error
+                        continue
+                    winner = index
+                    self._cancel_others(winner)
+                if index != winner:
+                    continue
+                if kind == "piece":
+                    yield payload
+                elif kind == "end":
+                    completed = True
+                    break
+                else:
+                    raise payload
+        finally:
+            # An abandoned iteration cancels the winner too
+            self._cancel_others(winner if completed else None)
+            if winner is not None:
+                self.result = self._attempts[winner]["stream"].result
+                self.result.extra.update({"hedged": len(self._attempts) > 1, "requested_model": self.model_id})
+
+def hedged_stream(
+    model_id: str,
+    prompt: str,
+    system_prompt: Optional[str] = None,
+    max_tokens: int = config.LLM_MAX_TOKENS,
+    temperature: float = config.LLM_TEMPERATURE,
+    backup_model: Optional[str] = None,
+    priority: int = config.LLM_PRIORITY_INTERACTIVE
+):
+    """stream() with a backup model for slow first tokens and errors; plain stream() when there is no backup."""
+    backup_model = backup_model or backup_model_for(model_id)
+    if not backup_model:
+        return stream(model_id, prompt, system_prompt, max_tokens, temperature, priority)
+    return HedgedStream(model_id, prompt, system_prompt, max_tokens, temperature, backup_model, priority=priority)
+
+def _stream_with_error_text(model_id: str, **kwargs) -> Iterator[str]:
+    open_stream = hedged_stream if config.LLM_HEDGING_ENABLED else stream
+    try:
+        yield from open_stream(model_id, **kwargs)
+    except Exception as e:
+        yield f"Error ({model_id}): {str(e)}"
+
 def generate_response_multi(
     model_id: str,
     prompt: str, 
     system_prompt: Optional[str] = None, 
     max_tokens: int = config.LLM_MAX_TOKENS,
     temperature: float = config.LLM_TEMPERATURE,
-    stream: bool = False
+    stream: bool = False,
+    priority: int = config.LLM_PRIORITY_INTERACTIVE
 ):
     """
-    Generates response using the specified model.
+    Compatibility wrapper over complete()/stream().
     If stream=True, returns a generator yielding chunks of text.
     Otherwise, returns the full string.
+    Errors come back as "Error (<model>): ..." text instead of raising.
     """
+    kwargs = {"prompt": prompt, "system_prompt": system_prompt, "max_tokens": max_tokens,
+              "temperature": temperature, "priority": priority}
+    if stream:
+        return _stream_with_error_text(model_id, **kwargs)
     try:
-        client_type, client = get_client(model_id)
-        
-        messages = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        messages.append({"role": "user", "content": prompt})
-        
-        # OPENAI & GROQ (Compatible APIs)
-        if client_type in ["openai", "groq"]:
-            # Streaming Mode
-            if stream:
-                response_stream = client.chat.completions.create(
-                    model=model_id,
-                    messages=messages,
-                    max_tokens=max_tokens,
-                    temperature=temperature,
-                    stream=True
-                )
-                for chunk in response_stream:
-                    if chunk.choices and len(chunk.choices) > 0:
-                        delta = chunk.choices[0].delta
-                        if delta.content:
-                            yield delta.content
-            # Non-Streaming Mode
-            else:
-                response = client.chat.completions.create(
-                    model=model_id,
-                    messages=messages,
-                    max_tokens=max_tokens,
-                    temperature=temperature,
-                    stream=False
-                )
-                return response.choices[0].message.content or ""
-
-        # HUGGING FACE
-        elif client_type == "hf":
-            # Streaming Mode
-            if stream:
-                response_stream = client.chat_completion(
-                    messages,
-                    max_tokens=max_tokens,
-                    temperature=temperature,
-                    top_p=0.9,
-                    stream=True
-                )
-                for chunk in response_stream:
-                    if chunk.choices and chunk.choices[0].delta.content:
-                        yield chunk.choices[0].delta.content
-            # Non-Streaming Mode
-            else:
-                response = client.chat_completion(
-                    messages,
-                    max_tokens=max_tokens,
-                    temperature=temperature,
-                    top_p=0.9,
-                    stream=False
-                )
-                if response.choices and response.choices[0].message.content:
-                    return response.choices[0].message.content
-                return ""
-            
+        return complete(model_id, **kwargs).text
     except Exception as e:
-        if stream:
-             yield f"Error ({model_id}): {str(e)}"
-        else:
-             return f"Error ({model_id}): {str(e)}"
+        return f"Error ({model_id}): {str(e)}"
@@ -0,0 +1,241 @@
+"""
+Deterministic stand-in LLM provider for offline benchmarks and load tests.
+
+Serves an OpenAI-compatible /v1/chat/completions endpoint (streaming and non-streaming)
+from a stdlib HTTP server, so the whole generation path runs without network or API keys.
+Models named "local/<anything>" are routed here by local_llm_multi.get_client.
+
+The server waits `ttft` seconds before the first token, then emits canned Telugu text at
+`tokens_per_sec` (one word = one token), capped at the request's max_tokens. `error_rate`
+injects HTTP errors (`error_status`, e.g. 429 or 503) from a seeded RNG, so a run with the
+same seed and request order fails the same requests. System prompts seen before are
+reported as cached prompt tokens, like a provider prompt cache.
+
+Usage:
+    python -m src.local_provider --port 8765 --ttft 0.4 --tps 50 --error-rate 0.02
+    # then select model "local/telugu" (LOCAL_LLM_URL defaults to http://127.0.0.1:8765/v1)
+"""
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+from src import config
+
+CANNED_STORY = (
+    "Title: మాయా చిలుక\n\n"
+    "Story:\n"
+    "ఒకానొకప్పుడు ఒక చిన్న గ్రామంలో రాము అనే పేద రైతు ఉండేవాడు. "
+    "అతని పొలం పక్కనే ఒక పెద్ద మర్రి చెట్టు ఉండేది. ఆ చెట్టు మీద ఒక మాయా చిలుక నివసించేది. "
+    "ఒక రోజు తీవ్రమైన కరువు వచ్చింది. బావులు ఎండిపోయాయి, పంటలు వాడిపోయాయి. "
+    "రాము దిగులుగా చెట్టు కింద కూర్చున్నాడు. అప్పుడు చిలుక కిందికి వాలి, "
+    "\"నీవు నిజాయితీగా ఉంటే, నీకు దారి చూపిస్తాను\" అంది. "
+    "రాము ఆశ్చర్యపోయాడు, కానీ తల ఊపాడు. చిలుక అతనిని అడవి లోపలికి తీసుకెళ్ళింది. "
+    "దారిలో ఒక ముసలి అవ్వ నీళ్ళ కోసం అడిగింది. రాము తన దగ్గర ఉన్న చివరి నీళ్ళు ఆమెకు ఇచ్చేశాడు. "
+    "అవ్వ నవ్వి, ఒక రాతిని చూపించింది. ఆ రాతి కింద నుంచి చల్లని నీటి ఊట పైకి ఉబికింది. "
+    "రాము గ్రామస్తులందరినీ పిలిచి ఆ నీటిని అందరితో పంచుకున్నాడు. "
+    "ఆ సంవత్సరం గ్రామం మళ్ళీ పచ్చగా కళకళలాడింది.\n\n"
+    "Moral:\n"
+    "ఇతరులకు సహాయం చేసేవారికి ప్రకృతి కూడా సహాయం చేస్తుంది."
+)
+
+
+def _estimate_tokens(text: str) -> int:
+    # Same ~3 characters per token estimate the client-side scheduler uses
+    return max(1, len(text) // 3)
+
+
+class LocalLLMServer:
+    """
+    An OpenAI-compatible chat server on a background thread.
+
+    ttft: seconds before the first token; tokens_per_sec: decode speed (0 = as fast as possible);
+    error_rate: share of requests failed with error_status; text: the canned completion.
+    """
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, ttft: float = 0.3,
+                 tokens_per_sec: float = 50.0, error_rate: float = 0.0, error_status: int = 503,
+                 text: str = CANNED_STORY, seed: int = 0):
+        self.ttft = ttft
+        self.tokens_per_sec = tokens_per_sec
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.words = text.split(" ")
+        self.requests = 0
+        self.errors = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._seen_prefixes = set()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "LocalLLMServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="local-llm", daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "LocalLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _admit(self, messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Counts the request and decides (deterministically, in arrival order) if it fails."""
+        system = "".join(m.get("content") or "" for m in messages if m.get("role") == "system")
+        prompt = "".join(m.get("content") or "" for m in messages)
+        prefix_key = hashlib.sha1(system.encode("utf-8")).hexdigest() if system else None
+        with self._lock:
+            self.requests += 1
+            fail = self._rng.random() < self.error_rate
+            if fail:
+                self.errors += 1
+            cached = _estimate_tokens(system) if prefix_key in self._seen_prefixes else 0
+            if prefix_key and not fail:
+                self._seen_prefixes.add(prefix_key)
+        return {"fail": fail, "prompt_tokens": _estimate_tokens(prompt), "cached_tokens": cached}
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass  # one line per request would drown a load test
+
+            def _send_json(self, status: int, body: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+                data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                if self.path.rstrip("/").endswith("/models"):
+                    self._send_json(200, {"object": "list", "data": [{"id": "local/telugu", "object": "model"}]})
+                else:
+                    self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+
+            def do_POST(self):
+                if not self.path.rstrip("/").endswith("/chat/completions"):
+                    self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+                    return
+                length = int(self.headers.get("Content-Length") or 0)
+                request = json.loads(self.rfile.read(length) or b"{}")
+                admitted = server._admit(request.get("messages", []))
+                if admitted["fail"]:
+                    headers = {"Retry-After": "1"} if server.error_status == 429 else None
+                    self._send_json(server.error_status, {"error": {
+                        "message": f"Injected error ({server.error_status})", "type": "local_injected"}}, headers)
+                    return
+
+                model = request.get("model", "local/telugu")
+                max_tokens = int(request.get("max_tokens") or len(server.words))
+                words = server.words[:max(1, max_tokens)]
+                usage = {
+                    "prompt_tokens": admitted["prompt_tokens"],
+                    "completion_tokens": len(words),
+                    "total_tokens": admitted["prompt_tokens"] + len(words),
+                    "prompt_tokens_details": {"cached_tokens": admitted["cached_tokens"]},
+                }
+                completion_id = f"chatcmpl-local-{uuid.uuid4().hex[:12]}"
+                if request.get("stream"):
+                    include_usage = (request.get("stream_options") or {}).get("include_usage", False)
+                    self._stream(completion_id, model, words, usage if include_usage else None)
+                else:
+                    time.sleep(server.ttft + self._decode_time(len(words)))
+                    self._send_json(200, {
+                        "id": completion_id, "object": "chat.completion", "created": int(time.time()), "model": model,
+                        "choices": [{"index": 0, "finish_reason": "stop",
+                                     "message": {"role": "assistant", "content": " ".join(words)}}],
+                        "usage": usage,
+                    })
+
+            def _decode_time(self, n_tokens: int) -> float:
+                return n_tokens / server.tokens_per_sec if server.tokens_per_sec > 0 else 0.0
+
+            def _event(self, payload: Any):
+                data = payload if isinstance(payload, str) else json.dumps(payload, ensure_ascii=False)
+                chunk = f"data: {data}\n\n".encode("utf-8")
+                self.wfile.write(f"{len(chunk):X}\r\n".encode("ascii") + chunk + b"\r\n")
+                self.wfile.flush()
+
+            def _stream(self, completion_id: str, model: str, words: List[str], usage: Optional[Dict[str, Any]]):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                base = {"id": completion_id, "object": "chat.completion.chunk", "created": int(time.time()),
+                        "model": model}
+                interval = self._decode_time(1)
+                try:
+                    time.sleep(server.ttft)
+                    for i, word in enumerate(words):
+                        if i:
+                            time.sleep(interval)
+                        piece = word + (" " if i < len(words) - 1 else "")
+                        delta = {"role": "assistant", "content": piece} if i == 0 else {"content": piece}
+                        self._event({**base, "choices": [{"index": 0, "delta": delta, "finish_reason": None}]})
+                    self._event({**base, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+                    if usage is not None:
+                        self._event({**base, "choices": [], "usage": usage})
+                    self._event("[DONE]")
+                    self.wfile.write(b"0\r\n\r\n")
+                    self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # client cancelled (e.g. a hedged request lost the race)
+
+        return Handler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local OpenAI-compatible stand-in LLM for offline load tests")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=config.LOCAL_LLM_PORT)
+    parser.add_argument("--ttft", type=float, default=0.3, help="Seconds before the first token")
+    parser.add_argument("--tps", type=float, default=50.0, help="Tokens per second after the first (0 = unthrottled)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests that fail (0-1)")
+    parser.add_argument("--error-status", type=int, default=503, help="HTTP status for injected errors, e.g. 429")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--text-file", help="UTF-8 file with the canned completion (default: built-in Telugu story)")
+    args = parser.parse_args(argv)
+
+    text = CANNED_STORY
+    if args.text_file:
+        with open(args.text_file, "r", encoding="utf-8") as f:
+            text = f.read().strip()
+
+    server = LocalLLMServer(args.host, args.port, ttft=args.ttft, tokens_per_sec=args.tps,
+                            error_rate=args.error_rate, error_status=args.error_status, text=text, seed=args.seed)
+    print(f"Local LLM serving on {server.url} (ttft={args.ttft}s, {args.tps} tok/s, "
+          f"error_rate={args.error_rate} -> {args.error_status}). Use model 'local/telugu'.")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+        print(f"Served {server.requests} requests ({server.errors} injected errors).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""
+Startup import-time and memory profiler.
+
+Imports each subsystem in a FRESH interpreter (so one target's imports never warm
+another's), and records wall time, RSS growth and (in a separate run) tracemalloc peak.
+
+Usage:
+    python -m src.perf.import_profiler
+    python -m src.perf.import_profiler --load --json logs/import_profile.json
+    python -m src.perf.import_profiler --baseline logs/import_profile.json --max-regression 0.25
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Any, Dict, List, Optional
+
+from src.perf.reporting import (
+    Check,
+    add_report_args,
+    check_baseline,
+    compare_rows,
+    fmt_bytes,
+    fmt_s,
+    load_report,
+    write_report,
+)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Subsystem name -> modules imported together in one isolated interpreter
+DEFAULT_TARGETS = {
+    "src.retrieval": ["src.retrieval.vector_search", "src.retrieval.client", "src.retrieval.prefetch"],
+    "src.story_embedder": ["src.story_embedder.main"],
+    "src.local_llm_multi": ["src.local_llm_multi"],
+    "src.story_inspired_puzzles": [
+        "src.story_inspired_puzzles.puzzle_generator",
+        "src.story_inspired_puzzles.prompts",
+        "src.story_inspired_puzzles.utils",
+    ],
+    "src.story_gen": ["src.story_gen"],
+}
+
+# "module:callable" targets that also construct the heavy object (model downloads/loads)
+LOAD_TARGETS = {
+    "retriever (model load)": ["src.retrieval.vector_search:StoryEmbeddingsRetriever"],
+    "story embedder (model load)": ["src.story_embedder.embedder:StoryEmbedder"],
+}
+
+# Executed in the child interpreter. Prints a single JSON line with the measurements.
+# tracemalloc hooks every allocation and slows imports down, so it only runs in a separate
+# "trace" child; wall time and RSS come from a child without it.
+_CHILD_CODE = r"""
+import importlib, json, sys, time, tracemalloc
+
+def rss_bytes():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    import resource
+    # ru_maxrss is KB on Linux, bytes on macOS; only reached off Linux
+    scale = 1 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+specs = json.loads(sys.argv[1])
+trace = sys.argv[2] == "trace"
+result = {"error": None}
+rss_before = rss_bytes()
+modules_before = len(sys.modules)
+if trace:
+    tracemalloc.start()
+start = time.perf_counter()
+try:
+    for spec in specs:
+        module_name, _, attr = spec.partition(":")
+        module = importlib.import_module(module_name)
+        if attr:
+            getattr(module, attr)()
+except BaseException as e:
+    result["error"] = f"{type(e).__name__}: {e}"
+if trace:
+    result["tracemalloc_peak_bytes"] = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+else:
+    result["wall_s"] = time.perf_counter() - start
+    result["rss_delta_bytes"] = rss_bytes() - rss_before
+    result["modules_loaded"] = len(sys.modules) - modules_before
+print("__PROFILE__" + json.dumps(result))
+"""
+
+
+def _run_child(specs: List[str], mode: str, timeout: float) -> Dict[str, Any]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = PROJECT_ROOT + os.pathsep + env.get("PYTHONPATH", "")
+    proc = subprocess.run(
+        [sys.executable, "-c", _CHILD_CODE, json.dumps(specs), mode],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+    )
+    for line in reversed(proc.stdout.splitlines()):
+        if line.startswith("__PROFILE__"):
+            return json.loads(line[len("__PROFILE__"):])
+    stderr_tail = proc.stderr.strip().splitlines()[-1:] or ["no output"]
+    return {"error": f"Profiler child exited with {proc.returncode}: {stderr_tail[0]}"}
+
+
+def profile_target(specs: List[str], timeout: float = 600) -> Dict[str, Any]:
+    """
+    Runs one isolated import measurement and returns its metrics: wall time, RSS and
+    module count from a plain child, the tracemalloc peak from a second, traced child.
+    """
+    result = _run_child(specs, "time", timeout)
+    if result.get("error"):
+        return result
+    traced = _run_child(specs, "trace", timeout)
+    result["error"] = traced.get("error")
+    result["tracemalloc_peak_bytes"] = traced.get("tracemalloc_peak_bytes", 0)
+    return result
+
+
+def run_profile(targets: Dict[str, List[str]], repeat: int = 1) -> List[Dict[str, Any]]:
+    """
+    Profiles every target `repeat` times and keeps the median of each metric,
+    which smooths out disk-cache and scheduler noise between runs.
+    """
+    rows = []
+    for name, specs in targets.items():
+        print(f"Profiling {name}...", flush=True)
+        samples = [profile_target(specs) for _ in range(repeat)]
+        ok = [s for s in samples if not s.get("error")]
+        row = {"target": name, "specs": specs, "runs": len(samples), "error": None}
+        if not ok:
+            row["error"] = samples[-1].get("error")
+            row.update({"wall_s": 0.0, "tracemalloc_peak_bytes": 0, "rss_delta_bytes": 0, "modules_loaded": 0})
+        else:
+            for key in ("wall_s", "tracemalloc_peak_bytes", "rss_delta_bytes", "modules_loaded"):
+                row[key] = statistics.median(s[key] for s in ok)
+        rows.append(row)
+    return sorted(rows, key=lambda r: r["wall_s"], reverse=True)
+
+
+def compare_to_baseline(rows: List[Dict[str, Any]], baseline: List[Dict[str, Any]], max_regression: float) -> List[str]:
+    """
+    Returns human readable regressions. Tiny absolute changes are ignored so noise
+    on fast imports never fails a deploy.
+    """
+    checks = [
+        Check("wall_s", 0.05, fmt_s),
+        Check("rss_delta_bytes", 8 * 1024 * 1024, fmt_bytes),
+        Check("tracemalloc_peak_bytes", 8 * 1024 * 1024, fmt_bytes),
+    ]
+    ok_rows = [r for r in rows if not r["error"]]
+    ok_baseline = [r for r in baseline if not r.get("error")]
+    return compare_rows(ok_rows, ok_baseline, "target", checks, max_regression)
+
+
+def format_report(rows: List[Dict[str, Any]]) -> str:
+    lines = [f"{'Target':<30} {'Wall (s)':>9} {'Py peak':>10} {'RSS Δ':>10} {'Modules':>8}  Status"]
+    lines.append("-" * 80)
+    for r in rows:
+        status = "ok" if not r["error"] else f"ERROR {r['error']}"
+        lines.append(
+            f"{r['target']:<30} {r['wall_s']:>9.3f} {fmt_bytes(r['tracemalloc_peak_bytes']):>10} "
+            f"{fmt_bytes(r['rss_delta_bytes']):>10} {int(r['modules_loaded']):>8}  {status}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Profile import time and memory of each subsystem in isolation")
+    parser.add_argument("--target", action="append", default=[],
+                        help="Extra 'module' or 'module:callable' to profile (repeatable)")
+    parser.add_argument("--only-extra", action="store_true", help="Profile only --target entries")
+    parser.add_argument("--load", action="store_true", help="Also construct heavy objects (loads embedding models)")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per target; the median is reported")
+    add_report_args(parser, max_regression=0.25)
+    args = parser.parse_args(argv)
+
+    targets = {} if args.only_extra else dict(DEFAULT_TARGETS)
+    if args.load:
+        targets.update(LOAD_TARGETS)
+    for spec in args.target:
+        targets[spec] = [spec]
+
+    rows = run_profile(targets, repeat=max(1, args.repeat))
+    print("\n=== Import Profile ===")
+    print(format_report(rows))
+
+    if args.json:
+        write_report(args.json, {"python": sys.version.split()[0], "targets": rows})
+
+    if args.baseline:
+        baseline = load_report(args.baseline).get("targets", [])
+        return check_baseline(compare_to_baseline(rows, baseline, args.max_regression), "Startup")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,341 @@
+"""
+End-to-end load test for the story path: archive retrieval -> context assembly -> generation.
+
+N virtual users (threads) each send story requests back to back, as concurrent Streamlit
+sessions would, sharing one retriever like the app's st.cache_resource. The LLM is the
+local stand-in provider (src/local_provider.py), started in-process unless --llm-url points
+at one running elsewhere, so results do not depend on network or provider quotas.
+
+Reports p50/p95/p99 per stage (retrieval, context, ttft, generation, total), throughput,
+process CPU and RSS, optionally as JSON for comparison between versions.
+
+Usage:
+    python -m src.perf.loadtest --users 8 --requests 5 --ttft 0.4 --tps 60
+    python -m src.perf.loadtest --users 8 --duration 60 --json logs/loadtest.json
+    python -m src.perf.loadtest --users 8 --requests 5 --baseline logs/loadtest.json --max-regression 0.2
+    # A separately started stand-in keeps its CPU out of the numbers:
+    python -m src.local_provider --port 8765 &
+    python -m src.perf.loadtest --users 8 --requests 5 --llm-url http://127.0.0.1:8765/v1
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from src import config
+from src.perf.reporting import (
+    Check,
+    add_report_args,
+    check_baseline,
+    fmt_bytes,
+    fmt_s,
+    load_report,
+    regression,
+    write_report,
+)
+from src.perf.spans import percentile
+
+STAGES = ("retrieval", "context", "ttft", "generation", "total")
+
+# Used when no --facets file is given; users cycle through these
+DEFAULT_FACETS = [
+    {"genre": "Folklore", "keywords": ["చిలుక", "అడవి"], "characters": ["రాము"], "locations": ["గ్రామం"],
+     "prompt_input": "A magic parrot helps a poor farmer", "content_type": "SINGLE"},
+    {"genre": "Moral", "keywords": ["నిజాయితీ"], "characters": ["సోము"], "locations": [],
+     "prompt_input": "An honest woodcutter", "content_type": "SINGLE"},
+    {"genre": "Adventure", "keywords": ["నిధి", "గుహ"], "characters": [], "locations": ["కొండ"],
+     "prompt_input": "Two friends search for a hidden treasure", "content_type": "SINGLE"},
+    {"genre": "Humor", "keywords": ["రాజు", "మంత్రి"], "characters": ["తెనాలి రామకృష్ణ"], "locations": ["రాజసభ"],
+     "prompt_input": "", "content_type": "SINGLE"},
+]
+
+
+def _rss_bytes() -> int:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    import resource
+    # Off Linux only the peak is available; ru_maxrss is KB on Linux, bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+def summarize(values: List[float]) -> Dict[str, Any]:
+    if not values:
+        return {"count": 0, "p50": None, "p95": None, "p99": None, "mean": None, "max": None}
+    return {
+        "count": len(values),
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "mean": sum(values) / len(values),
+        "max": max(values),
+    }
+
+
+class ResourceSampler:
+    """Samples process RSS on a background thread; CPU comes from process times over the run."""
+    def __init__(self, interval: float = 0.25):
+        self.interval = interval
+        self.samples: List[int] = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="loadtest-sampler", daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.samples.append(_rss_bytes())
+            self._stop.wait(self.interval)
+
+    def __enter__(self) -> "ResourceSampler":
+        self._cpu_start = os.times()
+        self._wall_start = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.samples.append(_rss_bytes())
+        cpu_end = os.times()
+        self.wall_s = time.perf_counter() - self._wall_start
+        self.cpu_user_s = cpu_end.user - self._cpu_start.user
+        self.cpu_system_s = cpu_end.system - self._cpu_start.system
+
+    def report(self) -> Dict[str, Any]:
+        cpu_s = self.cpu_user_s + self.cpu_system_s
+        return {
+            "cpu": {
+                "user_s": self.cpu_user_s,
+                "system_s": self.cpu_system_s,
+                # 100% = one core busy for the whole run
+                "percent_of_core": 100 * cpu_s / self.wall_s if self.wall_s > 0 else None,
+                "cores": os.cpu_count(),
+            },
+            "rss": {
+                "start_bytes": self.samples[0],
+                "peak_bytes": max(self.samples),
+                "mean_bytes": sum(self.samples) / len(self.samples),
+                "end_bytes": self.samples[-1],
+            },
+        }
+
+
+def _generate(facets: Dict[str, Any], context_text: str, llm_params: Dict[str, Any]):
+    from src.story_gen import generate_serial_story, generate_story
+    if facets.get("content_type") == "SERIAL":
+        # Fresh checkpoint dir: identical facets from different users must not resume each other
+        with tempfile.TemporaryDirectory() as checkpoint_dir:
+            yield from generate_serial_story(facets, context_text, llm_params=llm_params,
+                                             checkpoint_dir=checkpoint_dir, raise_errors=True)
+    else:
+        yield from generate_story(facets, context_text, llm_params=llm_params, raise_errors=True)
+
+
+def run_request(facets: Dict[str, Any], retrieve_fn: Optional[Callable[[str], List[Any]]],
+                llm_params: Dict[str, Any]) -> Dict[str, Any]:
+    """One story request through every stage; stage timings are in seconds."""
+    from src.retrieval.context import build_story_context, story_search_query
+
+    record = {"error": None}
+    start = time.perf_counter()
+    try:
+        points = retrieve_fn(story_search_query(facets)) if retrieve_fn is not None else []
+        record["retrieval"] = time.perf_counter() - start
+
+        mark = time.perf_counter()
+        context_text, _ = build_story_context(points, include_id=facets.get("content_type") != "SERIAL")
+        record["context"] = time.perf_counter() - mark
+        record["context_chars"] = len(context_text)
+
+        mark = time.perf_counter()
+        parts = []
+        for piece in _generate(facets, context_text, llm_params):
+            if piece and "ttft" not in record:
+                record["ttft"] = time.perf_counter() - mark
+            parts.append(piece)
+        record["generation"] = time.perf_counter() - mark
+        record["output_chars"] = len("".join(parts))
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+    record["total"] = time.perf_counter() - start
+    return record
+
+
+def run_load_test(users: int, facets_pool: List[Dict[str, Any]], llm_params: Dict[str, Any],
+                  retrieve_fn: Optional[Callable[[str], List[Any]]] = None, requests_per_user: Optional[int] = None,
+                  duration: Optional[float] = None, think_time: float = 0.0) -> Dict[str, Any]:
+    """
+    Runs `users` concurrent virtual users until each has sent requests_per_user requests or
+    `duration` seconds have passed (whichever is set; requests in flight are allowed to finish).
+    """
+    if not requests_per_user and not duration:
+        raise ValueError("Set requests_per_user or duration")
+    records: List[Dict[str, Any]] = []
+    lock = threading.Lock()
+    start_barrier = threading.Barrier(users)
+    deadline = None
+
+    def user(user_id: int):
+        start_barrier.wait()
+        sent = 0
+        while True:
+            if requests_per_user and sent >= requests_per_user:
+                break
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            facets = facets_pool[(user_id + sent * users) % len(facets_pool)]
+            record = run_request(facets, retrieve_fn, llm_params)
+            record["user"] = user_id
+            with lock:
+                records.append(record)
+            sent += 1
+            if think_time:
+                time.sleep(think_time)
+
+    with ResourceSampler() as sampler:
+        if duration:
+            deadline = time.perf_counter() + duration
+        threads = [threading.Thread(target=user, args=(i,), name=f"vuser-{i}") for i in range(users)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    ok = [r for r in records if r["error"] is None]
+    errors = [r["error"] for r in records if r["error"] is not None]
+    report = {
+        "users": users,
+        "requests": len(records),
+        "errors": len(errors),
+        "error_samples": sorted(set(errors))[:5],
+        "wall_s": sampler.wall_s,
+        "throughput_rps": len(ok) / sampler.wall_s if sampler.wall_s > 0 else 0.0,
+        "stages": {stage: summarize([r[stage] for r in ok if stage in r]) for stage in STAGES},
+    }
+    report.update(sampler.report())
+    return report
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    lines = [
+        f"Users: {report['users']}  Requests: {report['requests']}  Errors: {report['errors']}  "
+        f"Wall: {report['wall_s']:.1f}s  Throughput: {report['throughput_rps']:.2f} req/s "
+        f"({report['throughput_rps'] * 60:.1f}/min)",
+        f"{'Stage':<12} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9} {'n':>6}",
+        "-" * 60,
+    ]
+    for stage in STAGES:
+        s = report["stages"][stage]
+        lines.append(f"{stage:<12} {fmt_s(s['p50']):>9} {fmt_s(s['p95']):>9} {fmt_s(s['p99']):>9} "
+                     f"{fmt_s(s['max']):>9} {s['count']:>6}")
+    cpu, rss = report["cpu"], report["rss"]
+    lines.append("-" * 60)
+    lines.append(f"CPU: {cpu['user_s']:.1f}s user + {cpu['system_s']:.1f}s system "
+                 f"({cpu['percent_of_core']:.0f}% of one core, {cpu['cores']} cores)")
+    lines.append(f"RSS: start {rss['start_bytes'] / 2**20:.0f}MB, peak {rss['peak_bytes'] / 2**20:.0f}MB, "
+                 f"end {rss['end_bytes'] / 2**20:.0f}MB")
+    for sample in report["error_samples"]:
+        lines.append(f"Error: {sample}")
+    return "\n".join(lines)
+
+
+def compare_to_baseline(report: Dict[str, Any], baseline: Dict[str, Any], max_regression: float) -> List[str]:
+    """Capacity regressions vs a previous --json report (same users/settings assumed)."""
+    found = [regression("throughput", baseline.get("throughput_rps"), report["throughput_rps"], max_regression,
+                        Check("throughput_rps", fmt=lambda v: f"{v:.2f} req/s", lower_is_worse=True))]
+    # Tiny absolute changes (e.g. context assembly) are noise, not regressions
+    for stage in STAGES:
+        found.append(regression(f"{stage} p95", baseline.get("stages", {}).get(stage, {}).get("p95"),
+                                report["stages"][stage]["p95"], max_regression, Check("p95", 0.05, fmt_s)))
+    found.append(regression("peak RSS", baseline.get("rss", {}).get("peak_bytes"), report["rss"]["peak_bytes"],
+                            max_regression, Check("peak_bytes", 32 * 2**20, fmt_bytes)))
+    return [r for r in found if r]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Concurrent end-to-end load test (retrieval + generation)")
+    parser.add_argument("--users", type=int, default=4, help="Concurrent virtual users")
+    parser.add_argument("--requests", type=int, help="Requests per user (default 3 unless --duration)")
+    parser.add_argument("--duration", type=float, help="Run for this many seconds instead of a fixed count")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Pause between a user's requests")
+    parser.add_argument("--facets", help="CSV/JSONL of facet sets (same format as scripts/batch_generate.py)")
+    parser.add_argument("--no-rag", action="store_true", help="Skip retrieval (no embedding model or Qdrant needed)")
+    parser.add_argument("--top-k", type=int, default=config.BATCH_GEN_TOP_K)
+    parser.add_argument("--model", default=config.LOCAL_MODEL_PREFIX + "telugu",
+                        help="Generation model; a real provider model measures that provider instead")
+    parser.add_argument("--llm-url", help="Use a stand-in already running at this URL instead of an in-process one")
+    parser.add_argument("--ttft", type=float, default=0.3, help="In-process stand-in: seconds to first token")
+    parser.add_argument("--tps", type=float, default=50.0, help="In-process stand-in: tokens per second")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="In-process stand-in: injected error share")
+    parser.add_argument("--max-tokens", type=int, default=3000)
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed requests first (imports, client setup)")
+    add_report_args(parser, max_regression=0.2)
+    args = parser.parse_args(argv)
+
+    requests_per_user = args.requests or (None if args.duration else 3)
+
+    if args.facets:
+        from src.scripts.batch_generate import load_rows
+        facets_pool = [row["facets"] for row in load_rows(args.facets)]
+    else:
+        facets_pool = DEFAULT_FACETS
+
+    retrieve_fn = None
+    if not args.no_rag:
+        from src.retrieval.vector_search import StoryEmbeddingsRetriever
+        retriever = StoryEmbeddingsRetriever(top_k=args.top_k)
+        retriever.retrieve_points("warm up")  # model load and first-query costs are not load
+        retrieve_fn = retriever.retrieve_points
+
+    server = None
+    if args.model.startswith(config.LOCAL_MODEL_PREFIX):
+        if args.llm_url:
+            config.LOCAL_LLM_URL = args.llm_url
+        else:
+            from src.local_provider import LocalLLMServer
+            server = LocalLLMServer(ttft=args.ttft, tokens_per_sec=args.tps, error_rate=args.error_rate).start()
+            config.LOCAL_LLM_URL = server.url
+
+    llm_params = {"model": args.model, "temperature": 0.7, "max_tokens": args.max_tokens}
+    print(f"Load test: {args.users} users, "
+          f"{f'{requests_per_user} requests each' if requests_per_user else f'{args.duration:.0f}s'}, "
+          f"model {args.model}{' (in-process stand-in)' if server else ''}, "
+          f"RAG {'off' if retrieve_fn is None else 'on'}",
+          flush=True)
+    try:
+        for _ in range(args.warmup):
+            run_request(facets_pool[0], retrieve_fn, llm_params)
+        report = run_load_test(args.users, facets_pool, llm_params, retrieve_fn=retrieve_fn,
+                               requests_per_user=requests_per_user, duration=args.duration,
+                               think_time=args.think_time)
+    finally:
+        if server is not None:
+            server.close()
+    report["settings"] = {
+        "model": args.model, "rag": retrieve_fn is not None, "top_k": args.top_k,
+        "llm_in_process": server is not None, "ttft": args.ttft, "tps": args.tps, "error_rate": args.error_rate,
+        "requests_per_user": requests_per_user, "duration": args.duration, "think_time": args.think_time,
+        "warmup": args.warmup,
+    }
+    report["python"] = sys.version.split()[0]
+
+    print("\n=== Load Test ===")
+    print(format_report(report))
+
+    if args.json:
+        write_report(args.json, report)
+
+    if args.baseline:
+        return check_baseline(compare_to_baseline(report, load_report(args.baseline), args.max_regression), "Capacity")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
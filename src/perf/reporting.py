@@ -0,0 +1,98 @@
+"""
+JSON reports and baseline comparison shared by the perf CLIs (import_profiler, loadtest,
+story_inspired_puzzles.benchmark).
+
+Each CLI adds --json / --baseline / --max-regression with add_report_args, writes its report
+with write_report, and turns the regressions it finds (regression / compare_rows) into an exit
+code with check_baseline, so CI can fail on a regression.
+"""
+import json
+import os
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+
+class Check(NamedTuple):
+    """One metric compared per row. Growth (or a drop, with lower_is_worse) beyond
+    max(min_abs, before * max_regression) is a regression; relative=False uses min_abs alone."""
+    metric: str
+    min_abs: float = 0.0
+    fmt: Callable[[Any], str] = str
+    lower_is_worse: bool = False
+    relative: bool = True
+
+
+def fmt_bytes(n: float) -> str:
+    sign = "-" if n < 0 else ""
+    n = abs(n)
+    for unit in ("B", "KB", "MB", "GB"):
+        if n < 1024 or unit == "GB":
+            return f"{sign}{n:.1f}{unit}"
+        n /= 1024
+
+
+def fmt_s(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.3f}s"
+
+
+def fmt_ms(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value * 1000:.1f}ms"
+
+
+def add_report_args(parser, max_regression: float):
+    parser.add_argument("--json", help="Write the report as JSON to this path")
+    parser.add_argument("--baseline", help="Compare against a previous --json report")
+    parser.add_argument("--max-regression", type=float, default=max_regression,
+                        help=f"Allowed relative regression vs baseline (default {max_regression})")
+
+
+def write_report(path: str, report: Dict[str, Any]):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"\nSaved report to {path}")
+
+
+def load_report(path: str) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def regression(label: str, before: Optional[float], after: Optional[float], max_regression: float,
+               check: Check) -> Optional[str]:
+    """'<label> <before> -> <after>' if after is worse than before beyond the check's tolerance, else None."""
+    if before is None or after is None:
+        return None
+    change = before - after if check.lower_is_worse else after - before
+    allowed = max(check.min_abs, abs(before) * max_regression) if check.relative else check.min_abs
+    if change > allowed:
+        return f"{label} {check.fmt(before)} -> {check.fmt(after)}"
+    return None
+
+
+def compare_rows(rows: List[Dict[str, Any]], baseline: List[Dict[str, Any]], key: str, checks: List[Check],
+                 max_regression: float, label: Callable[[Dict[str, Any]], str] = None) -> List[str]:
+    """Regressions of rows vs baseline rows with the same `key` value; rows missing on either side are skipped."""
+    label = label or (lambda row: str(row[key]))
+    by_key = {r[key]: r for r in baseline}
+    regressions = []
+    for row in rows:
+        old = by_key.get(row[key])
+        if old is None:
+            continue
+        for check in checks:
+            found = regression(f"{label(row)}: {check.metric}", old.get(check.metric), row.get(check.metric),
+                               max_regression, check)
+            if found:
+                regressions.append(found)
+    return regressions
+
+
+def check_baseline(regressions: List[str], what: str) -> int:
+    """Prints the verdict; returns the CLI exit code (1 on any regression)."""
+    if regressions:
+        print(f"\n❌ {what} regressions vs baseline:")
+        for line in regressions:
+            print(f"  - {line}")
+        return 1
+    print(f"\n✅ No {what.lower()} regressions vs baseline.")
+    return 0
@@ -0,0 +1,216 @@
+"""
+Per-request span timing for the RAG -> generation path.
+
+A Trace collects stage durations (embed, search, context, ttft, generate, ...) and sizes
+(payload bytes, estimated context tokens) for one request, then appends one JSON line to a rotating
+log (config.SPAN_LOG_PATH) and keeps it in memory for the sidebar summary.
+
+Retrieval usually runs in the prefetcher's background thread long before the user clicks,
+so its spans are parked per query (remember_retrieval) and merged into the request trace
+when the results are used (Trace.merge_retrieval).
+"""
+import json
+import logging
+import logging.handlers
+import math
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from src import config
+
+# Display order in the summary; stages not listed here are appended after these
+STAGE_ORDER = ("rag_wait", "embed", "search", "context", "ttft", "generate", "total")
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile (no interpolation), None for no samples."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    k = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[k]
+
+
+def estimate_tokens(text: str) -> int:
+    # Same ~3 characters per token estimate as the LLM scheduler; recorded as *_tokens_est,
+    # since the provider's real prompt_tokens for Telugu text can differ a lot
+    return len(text) // 3
+
+
+def payload_bytes(points: Iterable[Any]) -> int:
+    """Approximate bytes of payload Qdrant returned (JSON-encoded, as sent over the wire)."""
+    return sum(len(json.dumps(getattr(p, "payload", None) or {}, ensure_ascii=False).encode("utf-8")) for p in points)
+
+
+class SpanLog:
+    """Appends trace records to a size-rotated JSONL file and keeps the most recent in memory."""
+    def __init__(self, path: Optional[str] = config.SPAN_LOG_PATH, max_bytes: int = config.SPAN_LOG_MAX_BYTES,
+                 backups: int = config.SPAN_LOG_BACKUPS, window: int = config.SPAN_SUMMARY_WINDOW):
+        self.path = path
+        self._recent = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._logger = None
+        self._max_bytes = max_bytes
+        self._backups = backups
+
+    def _file_logger(self) -> Optional[logging.Logger]:
+        # Opened on first write so importing this module never touches the disk
+        if self._logger is None and self.path:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            handler = logging.handlers.RotatingFileHandler(
+                self.path, maxBytes=self._max_bytes, backupCount=self._backups, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            logger = logging.getLogger(f"chandamama.spans.{id(self)}")
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+            logger.addHandler(handler)
+            self._logger = logger
+        return self._logger
+
+    def write(self, record: Dict[str, Any]):
+        with self._lock:
+            self._recent.append(record)
+            try:
+                logger = self._file_logger()
+                if logger is not None:
+                    logger.info(json.dumps(record, ensure_ascii=False))
+            except OSError as e:
+                print(f"Span log write failed: {e}")
+
+    def recent(self, name: Optional[str] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            records = list(self._recent)
+        return [r for r in records if name is None or r["name"] == name]
+
+    def summary(self, name: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Per stage: count, p50, p95 and the stage's share of total request time."""
+        records = self.recent(name)
+        if not records:
+            return []
+        stages = list(STAGE_ORDER) + sorted({s for r in records for s in r["spans"]} - set(STAGE_ORDER))
+        total_time = sum(r["spans"].get("total", 0.0) for r in records)
+        rows = []
+        for stage in stages:
+            values = [r["spans"][stage] for r in records if stage in r["spans"]]
+            if not values:
+                continue
+            rows.append({
+                "stage": stage,
+                "count": len(values),
+                "p50": percentile(values, 50),
+                "p95": percentile(values, 95),
+                # ttft overlaps generate, so shares are not meant to add up to 100%
+                "share": sum(values) / total_time if total_time and stage != "total" else None,
+            })
+        return rows
+
+    def format_summary(self, name: Optional[str] = None) -> str:
+        rows = self.summary(name)
+        if not rows:
+            return "No requests recorded yet."
+        lines = [f"{'Stage':<10} {'p50 (s)':>8} {'p95 (s)':>8} {'share':>6} {'n':>4}"]
+        for row in rows:
+            share = f"{row['share'] * 100:.0f}%" if row["share"] is not None else "-"
+            lines.append(f"{row['stage']:<10} {row['p50']:>8.3f} {row['p95']:>8.3f} {share:>6} {row['count']:>4}")
+        sizes = [r["metrics"] for r in self.recent(name)]
+        for key in ("payload_bytes", "context_tokens_est"):
+            values = [m[key] for m in sizes if key in m]
+            if values:
+                lines.append(f"{key}: p50 {percentile(values, 50):,}  max {max(values):,}")
+        return "\n".join(lines)
+
+
+# Process-wide log (Streamlit sessions share it, like STARTUP)
+SPAN_LOG = SpanLog()
+
+# Retrieval spans parked by query until a request uses the results
+_retrievals: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_retrievals_lock = threading.Lock()
+
+
+def remember_retrieval(query: str, spans: Dict[str, float], metrics: Dict[str, Any]):
+    with _retrievals_lock:
+        _retrievals[query] = {"spans": spans, "metrics": metrics}
+        _retrievals.move_to_end(query)
+        while len(_retrievals) > config.PREFETCH_CACHE_SIZE:
+            _retrievals.popitem(last=False)
+
+
+def recall_retrieval(query: str) -> Optional[Dict[str, Any]]:
+    with _retrievals_lock:
+        return _retrievals.get(query)
+
+
+class Trace:
+    """Stage timings and sizes for one request. Not shared between threads."""
+    def __init__(self, name: str, log: Optional[SpanLog] = None, **attrs):
+        self.name = name
+        self.log = log if log is not None else SPAN_LOG
+        self.trace_id = uuid.uuid4().hex[:12]
+        self.attrs = dict(attrs)
+        self.spans: Dict[str, float] = {}
+        self.metrics: Dict[str, Any] = {}
+        self._start = time.perf_counter()
+        self._finished = False
+
+    @contextmanager
+    def span(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.spans[stage] = self.spans.get(stage, 0.0) + time.perf_counter() - start
+
+    def set(self, **metrics):
+        self.metrics.update(metrics)
+
+    def merge_retrieval(self, query: str):
+        """Adds the embed/search spans recorded when `query` was (pre)fetched."""
+        retrieval = recall_retrieval(query)
+        if retrieval is not None:
+            self.spans.update(retrieval["spans"])
+            self.metrics.update(retrieval["metrics"])
+
+    def stream(self, pieces: Iterator[str], stage: str = "generate") -> Iterator[str]:
+        """
+        Passes a text stream through, recording time to the first piece (ttft) and the whole stage.
+        Pieces marked `replayed` (checkpointed text replayed on resume, see story_gen.ReplayedText)
+        were not produced by the model in this request, so they never count as the first token.
+        """
+        start = time.perf_counter()
+        chars = replayed_chars = 0
+        try:
+            for piece in pieces:
+                if getattr(piece, "replayed", False):
+                    replayed_chars += len(piece)
+                elif piece and "ttft" not in self.spans:
+                    self.spans["ttft"] = time.perf_counter() - start
+                chars += len(piece)
+                yield piece
+        finally:
+            self.spans[stage] = time.perf_counter() - start
+            self.metrics["output_chars"] = chars
+            if replayed_chars:
+                self.metrics["replayed_chars"] = replayed_chars
+            self.finish()
+
+    def finish(self) -> Dict[str, Any]:
+        """Records the trace once; later calls are no-ops."""
+        record = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "attrs": self.attrs,
+            "spans": {**{k: round(v, 4) for k, v in self.spans.items()},
+                      "total": round(time.perf_counter() - self._start, 4)},
+            "metrics": self.metrics,
+        }
+        if not self._finished:
+            self._finished = True
+            self.log.write(record)
+        return record
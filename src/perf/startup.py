@@ -0,0 +1,114 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List
+
+
+class StartupTimer:
+    """
+    Records how long startup phases take, relative to when this module was first imported.
+
+    Streamlit re-executes app.py on every interaction, so only the FIRST occurrence of
+    each mark/phase is kept; later reruns are free and would otherwise hide the cold start.
+    """
+
+    def __init__(self):
+        self._t0 = time.perf_counter()
+        self._lock = threading.Lock()
+        self._events: Dict[str, Dict[str, float]] = {}
+        self._reported = False
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._t0
+
+    def mark(self, name: str):
+        """Records a point in time (e.g. 'first_paint')."""
+        with self._lock:
+            if name not in self._events:
+                self._events[name] = {"at": self.elapsed(), "duration": 0.0}
+
+    @contextmanager
+    def phase(self, name: str):
+        """Times a block (e.g. a lazy import) the first time it runs."""
+        start = self.elapsed()
+        try:
+            yield
+        finally:
+            end = self.elapsed()
+            with self._lock:
+                if name not in self._events:
+                    self._events[name] = {"at": end, "duration": end - start}
+
+    def report(self) -> List[Dict[str, float]]:
+        with self._lock:
+            rows = [{"name": k, "at": v["at"], "duration": v["duration"]} for k, v in self._events.items()]
+        return sorted(rows, key=lambda r: r["at"])
+
+    def format_report(self) -> str:
+        lines = [f"{'Phase':<32} {'Done at (s)':>12} {'Took (s)':>10}"]
+        for row in self.report():
+            took = f"{row['duration']:.3f}" if row["duration"] else "-"
+            lines.append(f"{row['name']:<32} {row['at']:>12.3f} {took:>10}")
+        return "\n".join(lines)
+
+    def print_once(self):
+        """Prints the report to the console the first time it is called."""
+        with self._lock:
+            if self._reported:
+                return
+            self._reported = True
+        print("=== Startup Timing ===\n" + self.format_report(), flush=True)
+
+
+# Process-wide timer; import this module first in entry points for accurate numbers
+STARTUP = StartupTimer()
+
+
+class BackgroundLoader:
+    """
+    Builds an expensive resource (e.g. an embedding model) once, on a background thread.
+
+    Creating the loader is free; `start()` kicks off loading and is idempotent, `get()`
+    starts it if needed and waits for the result. Entry points call `start()` after the
+    first paint so the UI appears before the model begins loading.
+
+    A failed load is not cached: the next `start()` / `get()` tries again, so a transient
+    error (Qdrant timeout, model download) does not last for the life of the process.
+    """
+
+    def __init__(self, factory, name: str = "resource"):
+        self._factory = factory
+        self._name = name
+        self._lock = threading.Lock()
+        self._future = None
+
+    def start(self):
+        with self._lock:
+            future = self._future
+            if future is not None and future.done() and future.exception() is not None:
+                print(f"Retrying {self._name} load after: {future.exception()}")
+                self._future = None
+            if self._future is None:
+                from concurrent.futures import ThreadPoolExecutor
+                executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"warmup-{self._name}")
+                self._future = executor.submit(self._factory)
+                executor.shutdown(wait=False)
+        return self._future
+
+    def get(self, timeout: float = None):
+        return self.start().result(timeout=timeout)
+
+    def status(self) -> str:
+        """One of 'idle', 'loading', 'ready' or 'failed'."""
+        future = self._future
+        if future is None:
+            return "idle"
+        if not future.done():
+            return "loading"
+        return "failed" if future.exception() is not None else "ready"
+
+    def error(self):
+        future = self._future
+        if future is None or not future.done():
+            return None
+        return future.exception()
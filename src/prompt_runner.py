@@ -0,0 +1,80 @@
+"""
+Concurrent runner for prompt variants (Prompt Playground A/B rounds).
+
+Every variant streams on its own worker thread, so a round takes max(latency) instead of
+sum(latency). Workers only push events onto a queue; the caller drains them on its own
+thread, which keeps Streamlit element updates on the script thread.
+"""
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+
+@dataclass
+class VariantResult:
+    name: str
+    text: str = ""
+    ttft: Optional[float] = None  # seconds until the first streamed piece
+    latency: Optional[float] = None  # seconds until the stream ended
+    output_tokens: int = 0  # provider usage when reported, else streamed pieces
+    error: Optional[str] = None
+
+    @property
+    def tokens_per_sec(self) -> Optional[float]:
+        """Decode throughput, measured after the first token."""
+        if self.ttft is None or self.latency is None or self.output_tokens < 2:
+            return None
+        decode_time = self.latency - self.ttft
+        return (self.output_tokens - 1) / decode_time if decode_time > 0 else None
+
+
+def _stream_variant(index: int, job: Dict[str, Any], stream_fn: Callable[..., Iterator[str]],
+                    events: "queue.Queue", started: float):
+    result = VariantResult(job["name"])
+    parts = []
+    response = None
+    try:
+        response = stream_fn(**job["kwargs"])
+        for piece in response:
+            if not piece:
+                continue
+            if result.ttft is None:
+                result.ttft = time.perf_counter() - started
+            parts.append(piece)
+            result.output_tokens += 1
+            events.put(("delta", index, piece))
+    except Exception as e:
+        result.error = str(e)
+    result.latency = time.perf_counter() - started
+    result.text = "".join(parts)
+    # Prefer the provider's token count (local_llm_multi.LLMStream.result) over counted pieces
+    usage = getattr(response, "result", None)
+    if usage is not None and usage.completion_tokens:
+        result.output_tokens = usage.completion_tokens
+    events.put(("done", index, result))
+
+
+def run_concurrently(jobs: List[Dict[str, Any]], stream_fn: Callable[..., Iterator[str]],
+                     max_workers: Optional[int] = None) -> Iterator[Tuple[str, int, Any]]:
+    """
+    Starts every job at once (bounded by max_workers) and yields events as they arrive:
+    ("delta", index, text piece) while streaming, then ("done", index, VariantResult).
+
+    jobs: [{"name": ..., "kwargs": {...}}]; stream_fn(**kwargs) must return an iterator of text pieces.
+    """
+    if not jobs:
+        return
+    events = queue.Queue()
+    workers = max(1, min(max_workers or len(jobs), len(jobs)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="variant") as pool:
+        for index, job in enumerate(jobs):
+            # Latency is measured from submission, so queueing behind the pool counts
+            pool.submit(_stream_variant, index, job, stream_fn, events, time.perf_counter())
+        remaining = len(jobs)
+        while remaining:
+            kind, index, payload = events.get()
+            if kind == "done":
+                remaining -= 1
+            yield kind, index, payload
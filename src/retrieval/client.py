@@ -1,8 +1,6 @@
 import os
 import sys
 import uuid
-from qdrant_client import QdrantClient
-from sentence_transformers import SentenceTransformer
 
 # Common Utils
 try:
@@ -16,6 +14,7 @@ _model_instance = None
 def get_qdrant_client():
     global _client_instance
     if _client_instance is None:
+        from qdrant_client import QdrantClient
         if config.QDRANT_MODE == "cloud":
             print(f"Connecting to Qdrant Cloud at {config.QDRANT_PATH}...", flush=True)
             _client_instance = QdrantClient(
@@ -33,6 +32,7 @@ def get_qdrant_client():
 def get_embedding_model():
     global _model_instance
     if _model_instance is None:
+        from sentence_transformers import SentenceTransformer
         print(f"Loading embedding model '{config.EMBEDDING_MODEL_NAME}'...", flush=True)
         _model_instance = SentenceTransformer(config.EMBEDDING_MODEL_NAME)
     return _model_instance
@@ -0,0 +1,35 @@
+from typing import Any, Dict, List, Tuple
+
+
+def story_search_query(facets: Dict[str, Any]) -> str:
+    """The archive search query for a set of story facets (same for the app and batch runs)."""
+    prompt_input = facets.get("prompt_input", "")
+    genre = facets.get("genre", "")
+    keywords = " ".join(facets.get("keywords", []))
+    if facets.get("content_type") == "SERIAL":
+        return f"Serial Story {prompt_input} {genre} {keywords}"
+    return f"{prompt_input} {genre} {keywords} {' '.join(facets.get('characters', []))}"
+
+
+def build_story_context(points: List[Any], include_id: bool = True, excerpt_chars: int = 200) -> Tuple[str, List[str]]:
+    """
+    Builds the LLM context from retrieved full-story points.
+
+    Returns:
+        (context_text, excerpts) where excerpts are short markdown previews for the UI.
+    """
+    excerpts = []
+    full_texts = []
+    for p in points:
+        title = p.payload.get('title', 'Unknown')
+        story_id = p.payload.get('story_id', 'Unknown ID')
+        text = p.payload.get('text', '')
+
+        # For UI display
+        header = f"### {title} (ID: {story_id})" if include_id else f"### {title}"
+        excerpts.append(f"{header}\n{text[:excerpt_chars]}...")
+
+        # For LLM Context
+        full_texts.append(f"Title: {title}\nStory: {text}")
+
+    return "\n\n".join(full_texts), excerpts
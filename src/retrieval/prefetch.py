@@ -0,0 +1,142 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src import config
+
+# Returned by a prefetch that was overtaken by newer input before its search was submitted
+_SUPERSEDED = object()
+
+
+class ContextPrefetcher:
+    """
+    Speculatively runs retrieval in the background while the user is still editing.
+
+    Every rerun of the page calls `prefetch(query, channel)`. A per-channel timer debounces
+    the input: each new query on a channel cancels the previous timer, and only when a timer
+    fires is the search itself submitted to the worker pool, so rapid multiselect edits cost
+    one search and never hold a worker while waiting. `get(query)` returns the cached points
+    (waiting for an in-flight search if needed) or retrieves synchronously.
+    """
+
+    def __init__(
+        self,
+        retrieve_fn: Callable[[str], List[Any]],
+        debounce_seconds: float = config.PREFETCH_DEBOUNCE_SECONDS,
+        max_entries: int = config.PREFETCH_CACHE_SIZE
+    ):
+        self._retrieve_fn = retrieve_fn
+        self._debounce = debounce_seconds
+        self._max_entries = max_entries
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="rag-prefetch")
+        self._lock = threading.Lock()
+        # Embedding model + Qdrant client are shared, so searches run one at a time
+        self._retrieve_lock = threading.Lock()
+        self._futures: "OrderedDict[str, Future]" = OrderedDict()
+        self._latest = {}
+        # channel -> (timer, query, future) for the debounce that has not fired yet
+        self._pending: Dict[str, Tuple[threading.Timer, str, Future]] = {}
+
+    def prefetch(self, query: str, channel: str = "default") -> Future:
+        """Schedules a debounced background search for `query`. Never blocks."""
+        with self._lock:
+            self._latest[channel] = query
+            future = self._futures.get(query)
+            if future is not None and not self._is_stale(future):
+                self._futures.move_to_end(query)
+                return future
+
+            self._cancel_pending(channel)
+            future = Future()
+            timer = threading.Timer(self._debounce, self._fire, args=(query, channel, future))
+            timer.daemon = True
+            self._pending[channel] = (timer, query, future)
+            self._remember(query, future)
+            timer.start()
+            return future
+
+    def get(self, query: str, timeout: Optional[float] = None) -> List[Any]:
+        """Returns retrieval results for `query`, reusing a prefetched search when available."""
+        with self._lock:
+            future = self._futures.get(query)
+            # Still debouncing: the user clicked, so search now instead of waiting for the timer
+            waiting = [c for c, (_, q, f) in self._pending.items() if f is future]
+            for channel in waiting:
+                timer, _, _ = self._pending.pop(channel)
+                timer.cancel()
+
+        if future is not None and not waiting:
+            try:
+                result = future.result(timeout=timeout)
+                if result is not _SUPERSEDED:
+                    return result
+            except Exception as e:
+                print(f"Prefetch failed for query, retrying inline: {e}")
+
+        try:
+            result = self._search(query)
+        except Exception as e:
+            if waiting:
+                future.set_exception(e)
+            raise
+        if waiting:
+            future.set_result(result)
+            return result
+        done = Future()
+        done.set_result(result)
+        with self._lock:
+            self._remember(query, done)
+        return result
+
+    def is_ready(self, query: str) -> bool:
+        with self._lock:
+            future = self._futures.get(query)
+        return future is not None and future.done() and not self._is_stale(future)
+
+    def _cancel_pending(self, channel: str):
+        # Caller holds self._lock
+        pending = self._pending.pop(channel, None)
+        if pending is not None:
+            timer, _, future = pending
+            timer.cancel()
+            if not future.done():
+                future.set_result(_SUPERSEDED)
+
+    def _fire(self, query: str, channel: str, future: Future):
+        """Debounce elapsed: submit the search unless newer input arrived on the channel."""
+        with self._lock:
+            pending = self._pending.get(channel)
+            if pending is None or pending[2] is not future:
+                return  # cancelled, or taken over by get()
+            del self._pending[channel]
+            if self._latest.get(channel) != query:
+                future.set_result(_SUPERSEDED)
+                return
+        search = self._executor.submit(self._search, query)
+        search.add_done_callback(lambda done: self._settle(future, done))
+
+    @staticmethod
+    def _settle(future: Future, search: Future):
+        error = search.exception()
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(search.result())
+
+    def _search(self, query: str) -> List[Any]:
+        with self._retrieve_lock:
+            return self._retrieve_fn(query)
+
+    def _remember(self, query: str, future: Future):
+        self._futures[query] = future
+        self._futures.move_to_end(query)
+        while len(self._futures) > self._max_entries:
+            self._futures.popitem(last=False)
+
+    @staticmethod
+    def _is_stale(future: Future) -> bool:
+        # Failed or abandoned searches must be rescheduled rather than reused
+        if not future.done():
+            return False
+        return future.exception() is not None or future.result() is _SUPERSEDED
@@ -1,10 +1,10 @@
 import os
 import sys
+import time
 from typing import List, Dict, Any
-from qdrant_client import QdrantClient
-from sentence_transformers import SentenceTransformer
 from .client import get_qdrant_client
 from src import config
+from src.perf.spans import payload_bytes, remember_retrieval
 
 # Hardcoded config removed, using src.config
 # COLLECTION_NAME = "chandamama_stories"
@@ -12,6 +12,9 @@ from src import config
 
 class StoryEmbeddingsRetriever:
     def __init__(self, top_k: int = 3):
+        # Imported here: sentence_transformers pulls in torch, which dominates cold start
+        from sentence_transformers import SentenceTransformer
+
         print(f"Loading model '{config.STORY_EMBEDDING_MODEL_NAME}' for Story Embeddings...")
         # trust_remote_code=True required for GTE
         self.model = SentenceTransformer(config.STORY_EMBEDDING_MODEL_NAME, trust_remote_code=True)
@@ -25,8 +28,10 @@ class StoryEmbeddingsRetriever:
         Retrieves the raw ScoredPoints for top K similar FULL stories.
         """
         # Embed query with prefix
+        start = time.perf_counter()
         query_text = f"query: {query}"
         query_vector = self.model.encode(query_text, normalize_embeddings=True)
+        embedded = time.perf_counter()
 
         # Search
         search_results = self.client.query_points(
@@ -35,6 +40,14 @@ class StoryEmbeddingsRetriever:
             limit=self.top_k,
             with_payload=True
         ).points
+        searched = time.perf_counter()
+
+        # Timings are picked up by the request that uses these results (see src/perf/spans.py)
+        remember_retrieval(
+            query,
+            {"embed": embedded - start, "search": searched - embedded},
+            {"hits": len(search_results), "payload_bytes": payload_bytes(search_results)}
+        )
         return search_results
 
     def retrieve(self, query: str) -> str:
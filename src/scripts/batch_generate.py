@@ -0,0 +1,241 @@
+"""
+Headless batch story generation: archive retrieval + generate_story for every row of a
+CSV/JSONL file of facet sets, without Streamlit.
+
+Input columns / keys (all optional except genre):
+    id, genre, keywords, characters, locations, prompt_input, tone, content_type (SINGLE/SERIAL), num_chapters
+In CSV, list fields are separated by ';' or '|'. JSONL rows may use lists or the same strings.
+
+Results are appended to the output JSONL as each row finishes. Re-running with the same
+output file skips rows already written with status "ok" and retries the failed ones, so a
+crashed overnight run resumes where it stopped. Serial rows also resume mid-serial from
+their chapter checkpoints. The run keeps to config.LLM_BATCH_BUDGET_SHARE of each provider's
+rate limits, leaving the rest to the app, which runs in another process.
+
+Usage:
+    python src/scripts/batch_generate.py requests.csv --output data/batch/stories.jsonl --workers 4
+"""
+import argparse
+import csv
+import itertools
+import json
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(os.path.dirname(current_dir))
+sys.path.insert(0, project_root)
+
+from src import config
+
+LIST_FIELDS = ("keywords", "characters", "locations")
+
+
+def _as_list(value: Any) -> List[str]:
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return [str(v).strip() for v in value if str(v).strip()]
+    return [part.strip() for part in re.split(r"[;|]", str(value)) if part.strip()]
+
+
+def normalize_row(raw: Dict[str, Any], index: int) -> Dict[str, Any]:
+    """Turns one input row into {"row_id": ..., "facets": {...}} in the shape story_gen expects."""
+    facets = {
+        "genre": (raw.get("genre") or "Folklore").strip(),
+        "prompt_input": (raw.get("prompt_input") or "").strip(),
+        "content_type": (raw.get("content_type") or "SINGLE").strip().upper(),
+        "tone": (raw.get("tone") or "traditional").strip(),
+    }
+    for field in LIST_FIELDS:
+        facets[field] = _as_list(raw.get(field))
+    if facets["content_type"] == "SERIAL":
+        facets["num_chapters"] = int(raw.get("num_chapters") or 3)
+    row_id = str(raw.get("id") or "").strip() or f"row_{index:06d}"
+    return {"row_id": row_id, "facets": facets}
+
+
+def load_rows(path: str) -> List[Dict[str, Any]]:
+    """Reads a .csv or .jsonl file of facet sets."""
+    rows = []
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if path.lower().endswith(".csv"):
+            records = csv.DictReader(f)
+        else:
+            records = (json.loads(line) for line in f if line.strip())
+        for index, raw in enumerate(records):
+            rows.append(normalize_row(raw, index))
+    ids = [row["row_id"] for row in rows]
+    if len(set(ids)) != len(ids):
+        raise ValueError(f"Duplicate row ids in {path}; resume needs unique ids")
+    return rows
+
+
+def completed_row_ids(output_path: str) -> Set[str]:
+    """Row ids already written successfully. A torn last line from a crash is ignored."""
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record.get("status") == "ok":
+                done.add(record["row_id"])
+    return done
+
+
+def _terminate_torn_line(output_path: str):
+    """After a crash mid-write, end the partial line so the next record starts on its own line."""
+    if not os.path.exists(output_path) or os.path.getsize(output_path) == 0:
+        return
+    with open(output_path, "rb+") as f:
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) != b"\n":
+            f.write(b"\n")
+
+
+def generate_text(facets: Dict[str, Any], context_text: str, llm_params: Dict[str, Any]) -> str:
+    """Runs story_gen to completion for one row; raises GenerationError if the LLM call fails."""
+    from src.story_gen import generate_serial_story, generate_story
+    if facets["content_type"] == "SERIAL":
+        return "".join(generate_serial_story(facets, context_text, llm_params=llm_params, raise_errors=True))
+    return "".join(generate_story(facets, context_text, llm_params=llm_params, raise_errors=True))
+
+
+def make_retrieve_fn(top_k: int = config.BATCH_GEN_TOP_K) -> Callable[[Dict[str, Any]], Tuple[str, List[str]]]:
+    """Loads the story retriever once; searches are serialized because they share the embedding model."""
+    from src.retrieval.context import build_story_context, story_search_query
+    from src.retrieval.vector_search import StoryEmbeddingsRetriever
+
+    retriever = StoryEmbeddingsRetriever(top_k=top_k)
+    lock = threading.Lock()
+
+    def retrieve(facets: Dict[str, Any]) -> Tuple[str, List[str]]:
+        with lock:
+            points = retriever.retrieve_points(story_search_query(facets))
+        context_text, _ = build_story_context(points, include_id=facets["content_type"] != "SERIAL")
+        story_ids = [p.payload.get("story_id") for p in points]
+        return context_text, story_ids
+
+    return retrieve
+
+
+def process_row(row: Dict[str, Any], llm_params: Dict[str, Any],
+                retrieve_fn: Optional[Callable], generate_fn: Callable) -> Dict[str, Any]:
+    """Retrieval + generation for one row; never raises, failures come back as status "error"."""
+    record = {"row_id": row["row_id"], "facets": row["facets"], "model": llm_params.get("model"),
+              "status": "error", "story": "", "context_story_ids": [], "error": None}
+    try:
+        started = time.perf_counter()
+        context_text = ""
+        if retrieve_fn is not None:
+            context_text, record["context_story_ids"] = retrieve_fn(row["facets"])
+        record["retrieval_s"] = round(time.perf_counter() - started, 3)
+
+        started = time.perf_counter()
+        record["story"] = generate_fn(row["facets"], context_text, llm_params)
+        record["generation_s"] = round(time.perf_counter() - started, 3)
+        record["status"] = "ok"
+    except Exception as e:
+        record["error"] = str(e)
+    return record
+
+
+def run_batch(rows: List[Dict[str, Any]], output_path: str, llm_params: Dict[str, Any],
+              retrieve_fn: Optional[Callable] = None, generate_fn: Callable = generate_text,
+              workers: int = config.BATCH_GEN_WORKERS) -> Dict[str, int]:
+    """
+    Generates every row not yet completed in output_path, appending one JSON line per
+    finished row (in completion order). Returns counts of ok / failed / skipped rows.
+    """
+    done = completed_row_ids(output_path)
+    pending = [row for row in rows if row["row_id"] not in done]
+    totals = {"ok": 0, "failed": 0, "skipped": len(rows) - len(pending)}
+    if totals["skipped"]:
+        print(f"Resuming: {totals['skipped']} rows already completed, {len(pending)} to go.")
+    if not pending:
+        return totals
+
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    _terminate_torn_line(output_path)
+    started = time.perf_counter()
+    # Only a small window of rows is queued, so Ctrl-C stops after the rows in flight
+    window = max(1, workers) * 2
+    rows_left = iter(pending)
+    futures = set()
+    with open(output_path, "a", encoding="utf-8") as out, \
+            ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="batch") as pool:
+        try:
+            while True:
+                for row in itertools.islice(rows_left, window - len(futures)):
+                    futures.add(pool.submit(process_row, row, llm_params, retrieve_fn, generate_fn))
+                if not futures:
+                    break
+                finished_now, futures = wait(futures, return_when=FIRST_COMPLETED)
+                for future in finished_now:
+                    record = future.result()
+                    # Written from this thread only, flushed per row so a crash loses at most the rows in flight
+                    out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    out.flush()
+                    if record["status"] == "ok":
+                        totals["ok"] += 1
+                    else:
+                        totals["failed"] += 1
+                        print(f"Row {record['row_id']} failed: {record['error']}")
+                    finished = totals["ok"] + totals["failed"]
+                    if finished % 10 == 0 or finished == len(pending):
+                        rate = finished / (time.perf_counter() - started)
+                        print(f"Progress: {finished}/{len(pending)} rows "
+                              f"({totals['failed']} failed, {rate * 60:.1f} rows/min)")
+        except KeyboardInterrupt:
+            pool.shutdown(wait=False, cancel_futures=True)
+            print(f"Interrupted: waiting for {sum(not f.done() for f in futures)} rows in flight (not saved).")
+            raise
+    return totals
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate stories for a CSV/JSONL file of facet sets")
+    parser.add_argument("input", help="CSV or JSONL file of facet sets")
+    parser.add_argument("--output", default=os.path.join("data", "batch", "stories.jsonl"),
+                        help="JSONL results file; re-running with the same file resumes")
+    parser.add_argument("--workers", type=int, default=config.BATCH_GEN_WORKERS)
+    parser.add_argument("--model", default=config.AVAILABLE_MODELS[0])
+    parser.add_argument("--temperature", type=float, default=0.7)
+    parser.add_argument("--max-tokens", type=int, default=3000)
+    parser.add_argument("--no-rag", action="store_true", help="Skip archive retrieval (no style context)")
+    args = parser.parse_args(argv)
+
+    from dotenv import load_dotenv
+    load_dotenv()
+    from src import local_llm_multi
+    local_llm_multi.set_budget_share(config.LLM_BATCH_BUDGET_SHARE)
+
+    rows = load_rows(args.input)
+    print(f"Loaded {len(rows)} rows from {args.input}")
+
+    llm_params = {
+        "model": args.model,
+        "temperature": args.temperature,
+        "max_tokens": args.max_tokens,
+        "priority": config.LLM_PRIORITY_BATCH
+    }
+    retrieve_fn = None if args.no_rag else make_retrieve_fn()
+
+    totals = run_batch(rows, args.output, llm_params, retrieve_fn=retrieve_fn, workers=args.workers)
+    print(f"Batch complete: {totals['ok']} ok, {totals['failed']} failed, {totals['skipped']} skipped. "
+          f"Results: {args.output}")
+    if totals["failed"]:
+        print("Run the same command again to retry the failed rows.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Throughput benchmark for chunking on the longest stories in the archive.
+
+Measures, per story:
+- chunk_story over the story as written (newline separated paragraphs)
+- split_large_paragraph over the whole story as ONE paragraph (worst case for the
+  sentence splitter), against the previous string-growing implementation
+
+Usage:
+    python src/scripts/bench_chunking.py --top 20
+"""
+import argparse
+import heapq
+import json
+import os
+import sys
+import time
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(os.path.dirname(current_dir))
+sys.path.insert(0, project_root)
+
+from src import generate_chunks
+from src.generate_chunks import TokenCounter, chunk_story, split_large_paragraph, get_token_count
+
+
+def legacy_split_large_paragraph(text, max_tokens):
+    """The previous splitter: re-splits the growing part into words for every sentence."""
+    sentences = text.replace(".", ".|").replace("?", "?|").replace("!", "!|").split("|")
+    sub_chunks = []
+    current_sub = ""
+    for sent in sentences:
+        if not sent.strip():
+            continue
+        proposed = current_sub + sent
+        if get_token_count(proposed) > max_tokens:
+            if current_sub:
+                sub_chunks.append(current_sub)
+            current_sub = sent
+        else:
+            current_sub = proposed
+    if current_sub:
+        sub_chunks.append(current_sub)
+    return sub_chunks
+
+
+def longest_stories(base_dir, top):
+    heap = []
+    for root, _, filenames in os.walk(base_dir):
+        for filename in filenames:
+            if not (filename.startswith("చందమామ_") and filename.endswith(".json")):
+                continue
+            with open(os.path.join(root, filename), "r", encoding="utf-8") as f:
+                data = json.load(f)
+            for story in data.get("stories", []):
+                content = story.get("content") or ""
+                item = (len(content), story.get("story_id", ""), story)
+                if len(heap) < top:
+                    heapq.heappush(heap, item)
+                elif item[0] > heap[0][0]:
+                    heapq.heapreplace(heap, item)
+    return [story for _, _, story in sorted(heap, key=lambda x: -x[0])]
+
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark chunking throughput on the longest archive stories")
+    parser.add_argument("--base-dir", default=generate_chunks.BASE_DIR)
+    parser.add_argument("--top", type=int, default=20, help="Number of longest stories")
+    args = parser.parse_args(argv)
+
+    stories = longest_stories(args.base_dir, args.top)
+    if not stories:
+        print(f"No stories found under {args.base_dir}")
+        return 1
+    counter = TokenCounter("estimate")
+    hard_max = counter.limits()[3]
+
+    totals = {"chars": 0, "chunk": 0.0, "split_new": 0.0, "split_legacy": 0.0}
+    print(f"{'Story':<14} {'Chars':>8} {'chunk_story':>12} {'split (new)':>12} {'split (old)':>12} {'Parts':>6}")
+    for story in stories:
+        content = story.get("content") or ""
+        flat = " ".join(content.split())
+        counter.clear()
+
+        _, t_chunk = _timed(chunk_story, story, "0000", "00", "bench", counter)
+        parts, t_new = _timed(split_large_paragraph, flat, hard_max, counter)
+        _, t_old = _timed(legacy_split_large_paragraph, flat, hard_max)
+        oversized = sum(1 for p in parts if get_token_count(p) > hard_max)
+
+        totals["chars"] += len(content)
+        totals["chunk"] += t_chunk
+        totals["split_new"] += t_new
+        totals["split_legacy"] += t_old
+        flag = f"  ({oversized} over cap)" if oversized else ""
+        print(f"{story.get('story_id', '?'):<14} {len(content):>8} {t_chunk * 1000:>10.1f}ms "
+              f"{t_new * 1000:>10.1f}ms {t_old * 1000:>10.1f}ms {len(parts):>6}{flag}")
+
+    mchars = totals["chars"] / 1e6
+    print(f"\nThroughput over {len(stories)} stories ({totals['chars']:,} chars):")
+    print(f"  chunk_story:            {mchars / max(totals['chunk'], 1e-9):.2f}M chars/s")
+    print(f"  split_large_paragraph:  {mchars / max(totals['split_new'], 1e-9):.2f}M chars/s")
+    print(f"  legacy splitter:        {mchars / max(totals['split_legacy'], 1e-9):.2f}M chars/s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
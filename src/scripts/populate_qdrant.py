@@ -1,9 +1,11 @@
 
 import os
 import sys
-import json
 import uuid
 import math
+import time
+import argparse
+import functools
 import multiprocessing
 from typing import List, Dict, Any
 from tqdm import tqdm
@@ -16,6 +18,9 @@ project_root = os.path.dirname(os.path.dirname(current_dir))
 sys.path.insert(0, project_root)
 
 from src import config
+from src.chunk_offsets import resolve_chunk_texts
+from src.story_embedder import data_loader
+from src.story_embedder.run_metrics import FileMetrics, RunMetrics, points_bytes
 
 # Configuration
 CHUNKS_DIR = os.path.join(project_root, "data", "chunks")
@@ -25,80 +30,108 @@ VECTOR_SIZE = 768
 BATCH_SIZE = 64
 
 def get_chunk_files(base_dir: str) -> List[str]:
-    chunk_files = []
-    for root, _, files in os.walk(base_dir):
-        for file in files:
-            if file.endswith("_chunks.json"):
-                chunk_files.append(os.path.join(root, file))
-    return sorted(chunk_files)
+    # One file per issue, whatever mix of json / jsonl / jsonl.zst is on disk
+    return data_loader.scan_chunk_files(base_dir)
 
-def load_chunks(file_path: str) -> List[Dict[str, Any]]:
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except Exception as e:
-        print(f"Error loading {file_path}: {e}")
-        return []
+def iter_chunk_batches(file_path: str, batch_size: int = BATCH_SIZE):
+    """Streams a chunk file in embedding batches, with offset chunks resolved to text."""
+    batch = []
+    for chunk in data_loader.iter_chunks(file_path):
+        batch.append(chunk)
+        if len(batch) == batch_size:
+            yield resolve_chunk_texts(batch)
+            batch = []
+    if batch:
+        yield resolve_chunk_texts(batch)
 
 # Worker Function
-def process_chunks_worker(file_path):
+def process_chunks_worker(file_path, collection_name=COLLECTION_NAME):
     stats = {
         'processed': 0,
         'indexed': 0,
         'file': file_path,
         'error': None
     }
+    # Plain dict back to the parent, which writes the run metrics
+    metrics = FileMetrics(file_path)
     
     try:
         # Lazy import SentenceTransformer to be process-safe
         from sentence_transformers import SentenceTransformer
         
-        chunks = load_chunks(file_path)
-        if not chunks:
-            return stats
-            
-        stats['processed'] = len(chunks)
-        
-        # Initialize Client Per Worker
-        if config.QDRANT_URL and config.QDRANT_API_KEY:
-            client = QdrantClient(url=config.QDRANT_URL, api_key=config.QDRANT_API_KEY)
-        else:
-            client = QdrantClient(path=config.QDRANT_PATH)
-            
-        # Initialize Model Per Worker (or rely on efficiency if small)
-        # Re-initializing model per file is expensive if files are small.
-        # But for multiprocessing safety, it's the standard way without shared memory.
-        model = SentenceTransformer(MODEL_NAME)
+        with metrics.stage("model_load"):
+            # Initialize Client Per Worker
+            if config.QDRANT_URL and config.QDRANT_API_KEY:
+                client = QdrantClient(url=config.QDRANT_URL, api_key=config.QDRANT_API_KEY)
+            else:
+                client = QdrantClient(path=config.QDRANT_PATH)
+                
+            # Initialize Model Per Worker (or rely on efficiency if small)
+            # Re-initializing model per file is expensive if files are small.
+            # But for multiprocessing safety, it's the standard way without shared memory.
+            model = SentenceTransformer(MODEL_NAME)
         
-        # Process in batches
+        # Stream the file in batches: embedding starts before the whole file is parsed.
+        # Window chunks store offsets into the archive; payloads and embeddings need the text
         total_indexed = 0
+        batches = iter_chunk_batches(file_path)
         
-        for i in range(0, len(chunks), BATCH_SIZE):
-            batch = chunks[i:i + BATCH_SIZE]
+        while True:
+            with metrics.stage("load"):
+                batch = next(batches, None)
+            if batch is None:
+                break
+            stats['processed'] += len(batch)
+            metrics.count(chunks=len(batch))
             
             texts_to_embed = [f"passage: {c['text']}" for c in batch]
-            embeddings = model.encode(texts_to_embed, normalize_embeddings=True)
+            with metrics.stage("tokenize"):
+                tokens = sum(len(ids) for ids in model.tokenizer(texts_to_embed, truncation=True)["input_ids"])
+            metrics.count(tokens=tokens)
+            start = time.perf_counter()
+            with metrics.stage("encode"):
+                embeddings = model.encode(texts_to_embed, normalize_embeddings=True)
+            encode_s = time.perf_counter() - start
             
             points = []
             for j, chunk in enumerate(batch):
                 point_id = str(uuid.uuid5(uuid.NAMESPACE_DNS, chunk['chunk_id']))
                 payload = chunk.copy()
                 points.append(models.PointStruct(id=point_id, vector=embeddings[j].tolist(), payload=payload))
+            upsert_bytes = points_bytes((p.id, p.vector, p.payload) for p in points)
             
+            start = time.perf_counter()
+            upsert_error = None
             try:
-                client.upsert(collection_name=COLLECTION_NAME, points=points)
+                with metrics.stage("upsert"):
+                    client.upsert(collection_name=collection_name, points=points)
                 total_indexed += len(points)
+                metrics.count(points=len(points), upsert_bytes=upsert_bytes)
             except Exception as e:
-                pass # Fail silently for partial batch or log?
+                # Keep going with the next batch, but mark the file failed with the first error
+                upsert_error = str(e)
+                metrics.skip("upsert_failed", len(points))
+                metrics.error = metrics.error or f"upsert failed: {upsert_error}"
+            metrics.batch(size=len(batch), tokens=tokens, encode_s=round(encode_s, 4),
+                          upsert_s=round(time.perf_counter() - start, 4), upsert_bytes=upsert_bytes,
+                          error=upsert_error)
                 
         stats['indexed'] = total_indexed
         
     except Exception as e:
         stats['error'] = str(e)
+        metrics.error = str(e)
         
+    stats['metrics'] = metrics.to_dict()
     return stats
 
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Embed chunk files into Qdrant")
+    parser.add_argument("--chunks-dir", default=CHUNKS_DIR, help="e.g. data/chunks_window for sliding-window chunks")
+    parser.add_argument("--collection", default=COLLECTION_NAME)
+    args = parser.parse_args(argv)
+    collection_name = args.collection
+
     print(f"Initializing Parallel Chunk Injection...")
     print(f"Target Database: {config.QDRANT_PATH}")
     
@@ -108,15 +141,15 @@ def main():
     else:
         client = QdrantClient(path=config.QDRANT_PATH)
 
-    if not client.collection_exists(collection_name=COLLECTION_NAME):
-        print(f"Creating collection '{COLLECTION_NAME}'...")
+    if not client.collection_exists(collection_name=collection_name):
+        print(f"Creating collection '{collection_name}'...")
         client.create_collection(
-            collection_name=COLLECTION_NAME,
+            collection_name=collection_name,
             vectors_config=models.VectorParams(size=VECTOR_SIZE, distance=models.Distance.COSINE)
         )
     
     # Get Files
-    chunk_files = get_chunk_files(CHUNKS_DIR)
+    chunk_files = get_chunk_files(args.chunks_dir)
     print(f"Found {len(chunk_files)} chunk files.")
     
     # Workers
@@ -125,21 +158,22 @@ def main():
     print(f"Using Workers: {workers} (75% of {total_cores} Cores)")
     
     total_chunks = 0
+    run_metrics = RunMetrics("populate_qdrant", workers=workers)
     
-    # Parallel Execution
+    # Parallel Execution: metrics are written as each file finishes
     with multiprocessing.Pool(processes=workers) as pool:
-        results = list(tqdm(
-            pool.imap_unordered(process_chunks_worker, chunk_files),
+        for res in tqdm(
+            pool.imap_unordered(functools.partial(process_chunks_worker, collection_name=collection_name), chunk_files),
             total=len(chunk_files),
             desc="Parallel Indexing"
-        ))
-        
-        for res in results:
+        ):
+            run_metrics.add_file(res['metrics'])
             total_chunks += res['indexed']
             if res['error']:
                 print(f"Error in {res['file']}: {res['error']}")
 
     print(f"Ingestion complete. Total chunks indexed: {total_chunks}")
+    run_metrics.finish()
 
 if __name__ == "__main__":
     multiprocessing.freeze_support()
@@ -23,6 +23,8 @@ os.makedirs(LOG_DIR, exist_ok=True)
 
 # Files
 SKIPPED_STORIES_LOG = os.path.join(LOG_DIR, "skipped_stories.csv")
+# Per-story content/metadata hashes of what is in the collection (see manifest.py)
+MANIFEST_PATH = os.path.join(PROJECT_ROOT, "data", "story_manifest.json")
 
 # Qdrant Settings
 COLLECTION_NAME = config.STORY_COLLECTION_NAME 
@@ -30,6 +32,7 @@ VECTOR_SIZE = 768
 
 # Model Settings
 MODEL_NAME = config.STORY_EMBEDDING_MODEL_NAME
+MODEL_VERSION = config.STORY_EMBEDDING_MODEL_VERSION
 MAX_TOKEN_LIMIT = config.STORY_MAX_TOKEN_LIMIT 
 
 # Processing Settings
@@ -1,38 +1,53 @@
 import os
-import json
-from typing import List, Dict, Any, Generator
+from typing import List, Dict, Any, Generator, Optional
 from . import config
+from src.chunk_format import FORMAT_PREFERENCE, CHUNK_SUFFIXES, chunk_file_format, chunk_file_stem, iter_chunk_file
 
 def scan_chunk_files(base_dir: str = config.CHUNKS_DIR) -> List[str]:
     """
-    Recursively find all *_chunks.json files in the base directory.
+    Recursively find all chunk files (*_chunks.json / .jsonl / .jsonl.zst) in the base directory.
+    An issue present in several formats is returned once: the newest file, then the most compact format.
     Returns a sorted list of absolute file paths.
     """
-    chunk_files = []
+    by_stem = {}
     if not os.path.exists(base_dir):
         print(f"Warning: Chunks directory not found at {base_dir}")
         return []
         
     for root, _, files in os.walk(base_dir):
         for file in files:
-            if file.endswith("_chunks.json"):
-                chunk_files.append(os.path.join(root, file))
+            fmt = chunk_file_format(file)
+            if not fmt:
+                continue
+            path = os.path.join(root, file)
+            rank = (os.path.getmtime(path), -FORMAT_PREFERENCE.index(fmt))
+            stem = chunk_file_stem(path)
+            if stem not in by_stem or rank > by_stem[stem][0]:
+                by_stem[stem] = (rank, path)
     
     # Sort for deterministic processing order
-    return sorted(chunk_files)
+    return sorted(path for _, path in by_stem.values())
+
+def find_chunk_file(year: str, month: str, base_dir: str = config.CHUNKS_DIR) -> Optional[str]:
+    """Chunk file of one issue (chunks/YYYY/చందమామ_YYYY_MM_chunks.*), in any format, or None."""
+    stem = os.path.join(base_dir, year, f"చందమామ_{year}_{month}")
+    candidates = [stem + CHUNK_SUFFIXES[fmt] for fmt in FORMAT_PREFERENCE]
+    existing = [p for p in candidates if os.path.exists(p)]
+    if not existing:
+        return None
+    return max(existing, key=lambda p: (os.path.getmtime(p), -candidates.index(p)))
+
+def iter_chunks(file_path: str) -> Generator[Dict[str, Any], None, None]:
+    """
+    Stream chunk dicts from a chunk file of any format, with story metadata filled in.
+    JSON Lines files are read line by line.
+    """
+    yield from iter_chunk_file(file_path)
 
 def load_raw_chunks(file_path: str) -> List[Dict[str, Any]]:
     """
-    Load raw chunk data from a JSON file.
+    Load raw chunk data from a chunk file (json, jsonl or jsonl.zst).
+    Read and parse errors propagate: an unreadable file must not look like an empty one,
+    or its stories would be treated as removed from the archive.
     """
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            if isinstance(data, list):
-                return data
-            else:
-                print(f"Warning: File {file_path} did not contain a list of chunks.")
-                return []
-    except Exception as e:
-        print(f"Error reading {file_path}: {e}")
-        return []
+    return list(iter_chunks(file_path))
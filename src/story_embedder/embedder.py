@@ -1,8 +1,9 @@
+import time
 from sentence_transformers import SentenceTransformer
 from typing import List, Tuple, Any, Dict
 import numpy as np # Implicit dependency of sentence-transformers but good to have for typing if needed
 from . import config
-from .story_processor import Story
+from .story_processor import Story, embedding_text
 from . import skipped_log
 
 class StoryEmbedder:
@@ -23,29 +24,16 @@ class StoryEmbedder:
         """
         valid_stories = []
         valid_texts = []
+        # Read by the run metrics after each call (pipelines are single-threaded per embedder)
+        self.last_run = {"tokens": 0, "skipped": {}, "tokenize_s": 0.0, "encode_s": 0.0}
         
         # 1. Filter stories by length
         filtered_results = []
+        tokenize_start = time.perf_counter()
         
         for story in stories:
-            # [METADATA INFUSION]
-            # Construct a rich context string including Title, Author, and Keywords.
-            # This ensures the vector captures the "Meta-Context" not just the raw narrative.
-            
-            meta_header = []
-            if story.metadata.get('title'):
-                meta_header.append(f"Title: {story.metadata['title']}")
-            if story.metadata.get('author'):
-                meta_header.append(f"Author: {story.metadata['author']}")
-            if story.metadata.get('keywords'):
-                # Key words might be a list or a comma-separated string
-                kws = story.metadata['keywords']
-                if isinstance(kws, list):
-                    kws = ", ".join(kws)
-                meta_header.append(f"Keywords: {kws}")
-                
-            header_text = "\n".join(meta_header)
-            full_content = f"{header_text}\n\n{story.text}"
+            # [METADATA INFUSION] Title/Author/Keywords header + full text
+            full_content = embedding_text(story)
             
             # Use 'passage: ' prefix if model requires it (GTE/E5 usually do for retrieval docs)
             text_to_embed = f"{full_content}" # Alibaba GTE might not strictly need 'passage:', but 'text_to_embed' var name kept.
@@ -59,17 +47,22 @@ class StoryEmbedder:
             if token_count > config.MAX_TOKEN_LIMIT:
                 print(f"Skipping story {story.story_id}: {token_count} tokens (Limit: {config.MAX_TOKEN_LIMIT})")
                 skipped_log.log_skipped_story(story.story_id, "Exceeds token limit", token_count)
+                self.last_run["skipped"]["token_limit"] = self.last_run["skipped"].get("token_limit", 0) + 1
                 continue
                 
             valid_stories.append(story)
             valid_texts.append(text_to_embed)
+            self.last_run["tokens"] += token_count
+        self.last_run["tokenize_s"] = time.perf_counter() - tokenize_start
             
         if not valid_stories:
             return []
 
         # 2. Generate embeddings for valid stories
         print(f"Embedding {len(valid_stories)} stories...")
+        encode_start = time.perf_counter()
         embeddings = self.model.encode(valid_texts, normalize_embeddings=True, batch_size=config.BATCH_SIZE)
+        self.last_run["encode_s"] = time.perf_counter() - encode_start
         
         # 3. Pack results
         results = []
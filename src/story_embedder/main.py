@@ -1,84 +1,229 @@
 import argparse
+import contextlib
+import os
 import time
 from tqdm import tqdm
 from . import config
 from . import data_loader
 from . import story_processor
-from .storage import QdrantStorage
-from .embedder import StoryEmbedder 
+from .storage import QdrantStorage, connect_client
+from .manifest import StoryManifest, current_model, file_fingerprint, file_sha256, plan_stories
 from . import skipped_log
+from .run_metrics import FileMetrics, RunMetrics, points_bytes, record_embedding
 
-def process_single_file(file_path, storage, embedder):
+def process_single_file(file_path, storage, embedder, state=None, dry_run=False, metrics=None):
     """
     Sequential processor that uses persistent storage/embedder instances.
+    With a manifest `state`, only stories whose hashes changed are embedded or updated,
+    and the state is updated with what was written. Stage timings go to `metrics` (FileMetrics).
     """
+    metrics = metrics or FileMetrics(file_path)
     stats = {
         'processed': 0,
         'embedded': 0,
         'updated': 0,
+        'unchanged': 0,
         'failed': 0,
+        'deleted': 0,
+        'story_ids': [],
         'file': file_path,
         'error': None
     }
+    entries = state["stories"] if state is not None else {}
     
     try:
-        # 1. Load Chunks
-        chunks = data_loader.load_raw_chunks(file_path)
+        # 1. Load Chunks (a read/parse error raises and fails the file)
+        with metrics.stage("load"):
+            chunks = data_loader.load_raw_chunks(file_path)
+        metrics.count(chunks=len(chunks))
         if not chunks:
+            metrics.skip("empty_file")
             return stats
             
         # 2. Process Stories
-        stories = story_processor.process_file_to_stories(file_path, chunks)
+        with metrics.stage("load"):
+            stories = story_processor.process_file_to_stories(file_path, chunks)
         if not stories:
+            metrics.skip("no_stories")
             return stats
+        metrics.count(stories=len(stories))
             
         stats['processed'] = len(stories)
+        stats['story_ids'] = [s.story_id for s in stories]
         
-        # 3. Check Existing
-        # Even if DB is cleared, this check is fast and safe.
-        story_ids = [s.story_id for s in stories]
-        existing_ids = storage.check_existing(story_ids)
+        # 3. Compare with the manifest; stories it does not know are checked in Qdrant
+        with metrics.stage("plan"):
+            unknown_ids = [s.story_id for s in stories if s.story_id not in entries]
+            existing_ids = storage.check_existing(unknown_ids) if unknown_ids else set()
+            stories_to_embed, stories_to_update, unchanged = plan_stories(stories, entries, existing_ids)
+        stats['unchanged'] = len(unchanged)
+        metrics.skip("unchanged", len(unchanged))
         
-        stories_to_embed = []
-        stories_to_update = []
-        
-        for s in stories:
-            if s.story_id in existing_ids:
-                stories_to_update.append(s)
-            else:
-                stories_to_embed.append(s)
+        if dry_run:
+            stats['embedded'], stats['updated'] = len(stories_to_embed), len(stories_to_update)
+            return stats
         
-        # 4. Update Payloads (if any found)
+        # 4. Update Payloads (metadata-only changes)
         if stories_to_update:
-            count = storage.update_payloads(stories_to_update)
+            with metrics.stage("update"):
+                count = storage.update_payloads(stories_to_update)
             stats['updated'] = count
+            metrics.count(updated=count)
+            if count and state is not None:
+                for s in stories_to_update:
+                    StoryManifest.record(state, s)
             
-        # 5. Embed New (Ingest)
+        # 5. Embed New / Changed (Ingest)
         if stories_to_embed:
+            start = time.perf_counter()
             embeddings_data = embedder.generate_embeddings(stories_to_embed)
-            if embeddings_data:
-                count = storage.upsert_stories(embeddings_data)
-                stats['embedded'] = count
+            tokens, encode_s = record_embedding(metrics, embedder, time.perf_counter() - start)
+            upsert_bytes = points_bytes(embeddings_data)
+            with metrics.stage("upsert"):
+                start = time.perf_counter()
+                count = storage.upsert_stories(embeddings_data) if embeddings_data else 0
+                upsert_s = time.perf_counter() - start
+            stats['embedded'] = count
+            metrics.count(points=count, upsert_bytes=upsert_bytes if count else 0)
+            if embeddings_data and not count:
+                metrics.skip("upsert_failed", len(embeddings_data))
+            metrics.batch(size=len(stories_to_embed), embedded=count, tokens=tokens,
+                          encode_s=round(encode_s, 4), upsert_s=round(upsert_s, 4), upsert_bytes=upsert_bytes)
+            if state is not None and (count or not embeddings_data):
+                embedded_ids = {sid for sid, _, _ in embeddings_data}
+                # A story that had a point but is skipped now (e.g. grew over the token limit)
+                # must not keep serving its old vector
+                stale = [s.story_id for s in stories_to_embed if s.story_id not in embedded_ids
+                         and entries.get(s.story_id, {}).get("embedded", False)]
+                deleted = 0
+                if stale:
+                    with metrics.stage("delete"):
+                        deleted = storage.delete_stories(stale)
+                    metrics.count(deleted=deleted)
+                stats['deleted'] = deleted
+                for s in stories_to_embed:
+                    if s.story_id in stale and deleted != len(stale):
+                        continue  # keeps its old entry (embedded, old hashes), so the next run retries
+                    # Stories skipped for length are recorded too, so they are retried only when they change
+                    StoryManifest.record(state, s, embedded=s.story_id in embedded_ids)
+                if deleted != len(stale):
+                    raise RuntimeError(f"Could not delete {len(stale)} stale points of skipped stories")
                 
     except Exception as e:
         stats['error'] = str(e)
         stats['failed'] = 1
+        metrics.error = str(e)
         print(f"❌ Error processing {file_path}: {e}")
         
     return stats
 
-def main(dry_run=False):
+def sync_files(files, storage, embedder, manifest, state, base_dir=config.CHUNKS_DIR, dry_run=False,
+               run_metrics=None):
+    """
+    Brings `state`'s collection in line with the chunk files. Unchanged files (same size/mtime,
+    or same sha256) are not parsed; stories that vanished from the archive are deleted.
+    Per-file and per-batch metrics go to `run_metrics` (RunMetrics) when given.
+    """
+    totals = {'files_skipped': 0, 'processed': 0, 'embedded': 0, 'updated': 0, 'unchanged': 0,
+              'deleted': 0, 'failed_files': 0}
+    seen_ids = set()
+    seen_files = set()
+    
+    for file_path in tqdm(files, desc="Sequential Processing"):
+        rel_path = os.path.relpath(file_path, base_dir).replace("\\", "/")
+        seen_files.add(rel_path)
+        known = state["files"].get(rel_path)
+        fingerprint = file_fingerprint(file_path)
+        
+        if known and all(known.get(k) == v for k, v in fingerprint.items()):
+            seen_ids.update(known["stories"])
+            totals['files_skipped'] += 1
+            if run_metrics:
+                run_metrics.skip("file_unchanged")
+            continue
+        sha = file_sha256(file_path)
+        if known and known.get("sha256") == sha:
+            # Touched but identical (e.g. a fresh checkout)
+            if not dry_run:
+                known.update(fingerprint)
+            seen_ids.update(known["stories"])
+            totals['files_skipped'] += 1
+            if run_metrics:
+                run_metrics.skip("file_unchanged")
+            continue
+            
+        file_metrics = FileMetrics(file_path)
+        res = process_single_file(file_path, storage, embedder, state, dry_run, file_metrics)
+        if run_metrics:
+            run_metrics.add_file(file_metrics.to_dict())
+        seen_ids.update(res['story_ids'])
+        for key in ('processed', 'embedded', 'updated', 'unchanged', 'deleted'):
+            totals[key] += res[key]
+        if res['failed']:
+            totals['failed_files'] += 1
+            if known:
+                seen_ids.update(known["stories"])
+            continue
+        if not dry_run:
+            state["files"][rel_path] = {**fingerprint, "sha256": sha, "stories": res['story_ids']}
+            manifest.save()  # checkpoint: an interrupted run resumes from here
+    
+    vanished = sorted(set(state["stories"]) - seen_ids)
+    if totals['failed_files']:
+        print(f"Skipping deletion of {len(vanished)} vanished stories: {totals['failed_files']} files failed.")
+    elif vanished:
+        print(f"{len(vanished)} stories vanished from the archive.")
+        if not dry_run:
+            embedded = [sid for sid in vanished if state["stories"][sid].get("embedded", True)]
+            with run_metrics.stage("delete") if run_metrics else contextlib.nullcontext():
+                totals['deleted'] = storage.delete_stories(embedded) if embedded else 0
+            if totals['deleted'] == len(embedded):
+                for sid in vanished:
+                    del state["stories"][sid]
+        else:
+            totals['deleted'] = len(vanished)
+    if not dry_run:
+        for rel_path in set(state["files"]) - seen_files:
+            del state["files"][rel_path]
+        manifest.save()
+    return totals
+
+def main(dry_run=False, full=False):
     start_time = time.time()
     
     print("=== Sequential Story Embedding Pipeline ===")
-    print("Mode: SEQUENTIAL (Single Thread)")
+    print("Mode: SEQUENTIAL (Single Thread), incremental via manifest")
     print("Loading Models & Connections ONCE...")
     
-    # Initialize ONCE
-    storage = QdrantStorage()
-    embedder = None
+    # Decide where to write: the active collection, or a fresh one for a new model / --full
+    client = connect_client()
+    manifest = StoryManifest()
+    model = current_model()
+    abandoned = manifest.pending["collection"] if manifest.pending else None
+    serving = QdrantStorage.serving_collection(client, manifest.alias)
+    state, rebuilding = manifest.resolve_target(model, serving, full)
+    if abandoned == state["collection"]:
+        abandoned = None
     
+    if rebuilding:
+        print(f"Full embed of model {model['name']} (v{model['version']}) into '{state['collection']}'; "
+              f"alias '{manifest.alias}' switches when it completes.")
+    else:
+        print(f"Incremental update of '{state['collection']}' (model {model['name']} v{model['version']}).")
+    
+    if dry_run:
+        storage = QdrantStorage(state["collection"], client=client, create=False)
+    else:
+        storage = QdrantStorage(state["collection"], client=client)
+        if abandoned:
+            print(f"Dropping abandoned build '{abandoned}'...")
+            storage.drop_collection(abandoned)
+        manifest.save()
+    
+    # Initialize ONCE (imported here so planning and dry runs need no model)
+    embedder = None
     if not dry_run:
+        from .embedder import StoryEmbedder
         embedder = StoryEmbedder()
     
     # 1. Scan files
@@ -88,40 +233,41 @@ def main(dry_run=False):
     # Initialize skipped log
     skipped_log.init_log()
     
-    total_processed = 0
-    total_embedded = 0
-    total_updated = 0
-    total_failed = 0
+    run_metrics = RunMetrics("story_embedder" + ("_dry_run" if dry_run else ""))
+    totals = sync_files(files, storage, embedder, manifest, state, dry_run=dry_run, run_metrics=run_metrics)
     
-    # Sequential Loop
-    for file_path in tqdm(files, desc="Sequential Processing"):
-        if dry_run:
-            # Fake processing
-            print(f"Would process: {file_path}")
-            continue
-            
-        res = process_single_file(file_path, storage, embedder)
-        
-        total_processed += res['processed']
-        total_embedded += res['embedded']
-        total_updated += res['updated']
-        if res['failed']:
-            total_failed += 1
+    if rebuilding and not dry_run:
+        if totals['failed_files']:
+            print(f"Build incomplete ({totals['failed_files']} files failed); alias unchanged. Re-run to resume.")
+        else:
+            previous = storage.swap_alias(manifest.alias)
+            manifest.promote()
+            manifest.save()
+            print(f"Alias '{manifest.alias}' -> '{state['collection']}'.")
+            if previous and previous != state["collection"]:
+                print(f"Dropping retired collection '{previous}'...")
+                storage.drop_collection(previous)
 
     end_time = time.time()
     duration = end_time - start_time
     
-    print("\n=== Pipeline Complete ===")
+    print("\n=== Pipeline Complete ===" + (" (dry run)" if dry_run else ""))
     print(f"Duration: {duration:.2f} seconds")
-    print(f"Total Stories Scanned: {total_processed}")
-    print(f"Updated (Payload Only): {total_updated}")
-    print(f"Successfully Embedded: {total_embedded}")
-    print(f"Failed Files: {total_failed}")
+    print(f"Unchanged Files (not parsed): {totals['files_skipped']}")
+    print(f"Total Stories Scanned: {totals['processed']}")
+    print(f"Unchanged Stories: {totals['unchanged']}")
+    print(f"Updated (Payload Only): {totals['updated']}")
+    print(f"Successfully Embedded: {totals['embedded']}")
+    print(f"Deleted (Vanished or Now Skipped): {totals['deleted']}")
+    print(f"Failed Files: {totals['failed_files']}")
     print(f"Check {config.SKIPPED_STORIES_LOG} for skipped items.")
+    run_metrics.finish()
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Run story embedding pipeline")
-    parser.add_argument("--dry-run", action="store_true", help="Scan files but do not embed or store")
+    parser.add_argument("--dry-run", action="store_true", help="Plan the update (no embedding or writes)")
+    parser.add_argument("--full", action="store_true",
+                        help="Re-embed everything into a new collection, then swap the alias")
     args = parser.parse_args()
     
-    main(dry_run=args.dry_run)
+    main(dry_run=args.dry_run, full=args.full)
@@ -0,0 +1,146 @@
+"""
+Embedding manifest: what the story collection holds, so rebuilds only touch what changed.
+
+The manifest (config.MANIFEST_PATH) records, per Qdrant target:
+- active:  the collection behind the serving alias (config.COLLECTION_NAME), the model
+           name/version it was embedded with, and per-story content/metadata hashes
+- pending: a full rebuild in progress (new model or --full), resumable until its alias swap
+
+Per chunk file it also keeps size/mtime/sha256, so unchanged files are not even parsed.
+"""
+import hashlib
+import json
+import os
+import re
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from . import config
+from .story_processor import Story, embedding_text
+
+MANIFEST_FORMAT = 1
+
+
+def current_model() -> Dict[str, str]:
+    return {"name": config.MODEL_NAME, "version": str(config.MODEL_VERSION)}
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def story_hashes(story: Story) -> Tuple[str, str]:
+    """(content hash, metadata hash). The content hash covers exactly what is embedded."""
+    content = _sha256(embedding_text(story).encode("utf-8"))
+    metadata = _sha256(json.dumps(story.metadata, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8"))
+    return content, metadata
+
+
+def file_fingerprint(path: str) -> Dict[str, int]:
+    st = os.stat(path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def collection_name_for(alias: str, model: Dict[str, str]) -> str:
+    """
+    A fresh physical collection name for a build,
+    e.g. chandamama_stories__gte_multilingual_base_v1_20260101T120000_3f9a.
+    """
+    slug = re.sub(r"[^a-z0-9]+", "_", model["name"].split("/")[-1].lower()).strip("_")
+    return f"{alias}__{slug}_v{model['version']}_{datetime.now().strftime('%Y%m%dT%H%M%S')}_{uuid.uuid4().hex[:4]}"
+
+
+def plan_stories(stories: List[Story], entries: Dict[str, Dict[str, Any]],
+                 existing_ids=frozenset()) -> Tuple[List[Story], List[Story], List[Story]]:
+    """
+    Splits a file's stories into (to_embed, to_update, unchanged) against the manifest entries.
+    Stories without an entry fall back to `existing_ids` (points already in Qdrant):
+    those get a payload update, like the pre-manifest pipeline did.
+    """
+    to_embed, to_update, unchanged = [], [], []
+    for story in stories:
+        entry = entries.get(story.story_id)
+        content, metadata = story_hashes(story)
+        if entry is None:
+            (to_update if story.story_id in existing_ids else to_embed).append(story)
+        elif entry["content"] != content:
+            to_embed.append(story)
+        elif entry["metadata"] != metadata and entry.get("embedded", True):
+            # (stories skipped for length have no point to update)
+            to_update.append(story)
+        else:
+            unchanged.append(story)
+    return to_embed, to_update, unchanged
+
+
+class StoryManifest:
+    def __init__(self, path: str = config.MANIFEST_PATH, target: str = config.QDRANT_PATH,
+                 alias: str = config.COLLECTION_NAME):
+        self.path = path
+        self.data = {"format": MANIFEST_FORMAT, "qdrant": target, "alias": alias, "active": None, "pending": None}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("qdrant") != target or data.get("alias") != alias:
+                print(f"Manifest at {path} describes {data.get('qdrant')} / {data.get('alias')}; starting a new one.")
+            else:
+                self.data = data
+
+    @property
+    def alias(self) -> str:
+        return self.data["alias"]
+
+    @property
+    def active(self) -> Optional[Dict[str, Any]]:
+        return self.data["active"]
+
+    @property
+    def pending(self) -> Optional[Dict[str, Any]]:
+        return self.data["pending"]
+
+    @staticmethod
+    def new_state(collection: str, model: Dict[str, str]) -> Dict[str, Any]:
+        return {"collection": collection, "model": dict(model), "created_at": datetime.now().isoformat(),
+                "files": {}, "stories": {}}
+
+    def resolve_target(self, model: Dict[str, str], serving: Optional[str] = None,
+                       full: bool = False) -> Tuple[Dict[str, Any], bool]:
+        """
+        The state to sync into and whether it is a rebuild (needs an alias swap when done).
+        `serving` is the collection currently behind the alias; a pre-manifest collection
+        is adopted as active (it was embedded with the configured model).
+        """
+        if not full and self.pending and self.pending["model"] == model:
+            return self.pending, True
+        if self.active is None and serving and not full:
+            self.data["active"] = self.new_state(serving, model)
+        if not full and self.active and self.active["model"] == model:
+            return self.active, False
+        self.data["pending"] = self.new_state(collection_name_for(self.alias, model), model)
+        return self.pending, True
+
+    def promote(self) -> Optional[Dict[str, Any]]:
+        """Makes the finished rebuild active; returns the retired state."""
+        retired = self.data["active"]
+        self.data["active"], self.data["pending"] = self.data["pending"], None
+        return retired
+
+    @staticmethod
+    def record(state: Dict[str, Any], story: Story, embedded: bool = True):
+        content, metadata = story_hashes(story)
+        state["stories"][story.story_id] = {"content": content, "metadata": metadata, "embedded": embedded}
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
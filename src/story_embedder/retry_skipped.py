@@ -2,6 +2,7 @@
 import os
 import csv
 import sys
+import time
 import collections
 from typing import List, Dict, Set
 from tqdm import tqdm
@@ -19,8 +20,10 @@ if __name__ == "__main__" and __package__ is None:
 from . import config
 from . import story_processor
 from .embedder import StoryEmbedder
-from .storage import QdrantStorage
+from .storage import QdrantStorage, connect_client
+from .manifest import StoryManifest, current_model
 from . import data_loader
+from .run_metrics import RunMetrics, points_bytes, record_embedding
 
 def get_skipped_ids() -> Set[str]:
     """Read the log file and return a set of skipped story IDs."""
@@ -42,8 +45,8 @@ def get_skipped_ids() -> Set[str]:
 
 def map_ids_to_files(skipped_ids: Set[str]) -> Dict[str, List[str]]:
     """
-    Map story IDs to their expected chunk file paths.
-    Format: YYYY_MM_XX -> chunks/YYYY/చందమామ_YYYY_MM_chunks.json
+    Map story IDs to their chunk file paths.
+    Format: YYYY_MM_XX -> chunks/YYYY/చందమామ_YYYY_MM_chunks.{json,jsonl,jsonl.zst}
     """
     files_map = collections.defaultdict(list)
     
@@ -53,9 +56,10 @@ def map_ids_to_files(skipped_ids: Set[str]) -> Dict[str, List[str]]:
             year = parts[0]
             month = parts[1]
             try:
-                # Construct path
-                filename = f"చందమామ_{year}_{month}_chunks.json"
-                file_path = os.path.join(config.CHUNKS_DIR, year, filename)
+                file_path = data_loader.find_chunk_file(year, month)
+                if file_path is None:
+                    print(f"No chunk file found for {sid}")
+                    continue
                 files_map[file_path].append(sid)
             except Exception:
                 print(f"Skipping malformed ID: {sid}")
@@ -78,9 +82,20 @@ def main():
     print(f"Stories are distributed across {len(file_map)} files.")
     
     # 3. Initialize components
-    # Assuming config is already updated to new model (checked in previous steps)
-    storage = QdrantStorage()
+    # Retried stories go into the active collection and are recorded in its manifest state,
+    # so the next incremental run sees them as embedded
+    client = connect_client()
+    manifest = StoryManifest()
+    state = manifest.active
+    if state is not None and state["model"] != current_model():
+        print(f"Active collection '{state['collection']}' uses model {state['model']['name']} "
+              f"v{state['model']['version']}, not the configured one. Run the main pipeline first.")
+        return
+    if state is None:
+        print("No embedding manifest yet; writing through the alias without recording.")
+    storage = QdrantStorage(state["collection"] if state else config.COLLECTION_NAME, client=client)
     embedder = StoryEmbedder()
+    run_metrics = RunMetrics("retry_skipped")
     
     total_embedded = 0
     total_failed = 0
@@ -91,35 +106,58 @@ def main():
         try:
             if not os.path.exists(file_path):
                 print(f"Warning: File not found: {file_path}")
+                run_metrics.skip("file_missing", len(target_ids))
                 continue
                 
-            # Load chunks
-            chunks = data_loader.load_raw_chunks(file_path)
-            if not chunks:
-                continue
-            
-            # Convert to stories
-            all_stories = story_processor.process_file_to_stories(file_path, chunks)
-            
-            # Filter for only the skipped ones
-            target_set = set(target_ids)
-            stories_to_retry = [s for s in all_stories if s.story_id in target_set]
-            
-            if not stories_to_retry:
-                # This might happen if the ID in log doesn't match ID in file (unlikely)
-                print(f"Warning: None of the target stories found in {os.path.basename(file_path)}")
-                continue
+            with run_metrics.file(file_path) as metrics:
+                # Load chunks
+                with metrics.stage("load"):
+                    chunks = data_loader.load_raw_chunks(file_path)
+                metrics.count(chunks=len(chunks))
+                if not chunks:
+                    metrics.skip("empty_file", len(target_ids))
+                    continue
                 
-            # Embed and Upsert
-            # The embedder will check the new token limit (8192)
-            embeddings_data = embedder.generate_embeddings(stories_to_retry)
-            
-            if embeddings_data:
-                count = storage.upsert_stories(embeddings_data)
-                total_embedded += count
-                # Optional: Remove from log or mark as done? 
-                # For now, just appending to log is default behavior of embedder on fail.
-                # We don't remove from CSV, user can delete file later.
+                # Convert to stories
+                with metrics.stage("load"):
+                    all_stories = story_processor.process_file_to_stories(file_path, chunks)
+                
+                # Filter for only the skipped ones
+                target_set = set(target_ids)
+                stories_to_retry = [s for s in all_stories if s.story_id in target_set]
+                metrics.count(stories=len(stories_to_retry))
+                metrics.skip("not_in_file", len(target_set) - len(stories_to_retry))
+                
+                if not stories_to_retry:
+                    # This might happen if the ID in log doesn't match ID in file (unlikely)
+                    print(f"Warning: None of the target stories found in {os.path.basename(file_path)}")
+                    continue
+                    
+                # Embed and Upsert
+                # The embedder will check the new token limit (8192)
+                start = time.perf_counter()
+                embeddings_data = embedder.generate_embeddings(stories_to_retry)
+                tokens, encode_s = record_embedding(metrics, embedder, time.perf_counter() - start)
+                
+                if embeddings_data:
+                    upsert_bytes = points_bytes(embeddings_data)
+                    start = time.perf_counter()
+                    with metrics.stage("upsert"):
+                        count = storage.upsert_stories(embeddings_data)
+                    metrics.count(points=count, upsert_bytes=upsert_bytes if count else 0)
+                    metrics.batch(size=len(stories_to_retry), embedded=count, tokens=tokens,
+                                  encode_s=round(encode_s, 4), upsert_s=round(time.perf_counter() - start, 4),
+                                  upsert_bytes=upsert_bytes)
+                    total_embedded += count
+                    if count and state is not None:
+                        embedded_ids = {sid for sid, _, _ in embeddings_data}
+                        for s in stories_to_retry:
+                            if s.story_id in embedded_ids:
+                                StoryManifest.record(state, s)
+                        manifest.save()
+                    # Optional: Remove from log or mark as done? 
+                    # For now, just appending to log is default behavior of embedder on fail.
+                    # We don't remove from CSV, user can delete file later.
             
             files_processed += 1
             
@@ -131,6 +169,7 @@ def main():
     print(f"Total Files Processed: {files_processed}/{len(file_map)}")
     print(f"Total Stories Successfully Re-Embedded: {total_embedded}")
     print("Note: If any stories were skipped again, they are appended to the log.")
+    run_metrics.finish()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,216 @@
+"""
+Structured metrics for ingestion runs (story_embedder.main, retry_skipped, scripts/populate_qdrant).
+
+Each run writes JSONL to logs/ingest/<pipeline>_<timestamp>.jsonl:
+    {"type": "run_start", ...}
+    {"type": "batch", "file": ..., "size": ..., "tokens": ..., "encode_s": ..., "upsert_s": ..., "upsert_bytes": ...}
+    {"type": "file", "file": ..., "stages": {"load": s, "encode": s, "upsert": s, ...}, "counts": {...}, "skips": {...}}
+    {"type": "run_end", ...the report...}
+and prints an end-of-run report: stories/chunks/tokens per second and how much of the run
+each stage took, which tells a model-bound rebuild (encode) from a disk-bound (load) or a
+Qdrant-bound (upsert) one.
+
+FileMetrics is a plain object so multiprocessing workers can fill one and return
+to_dict(); the parent passes it to RunMetrics.add_file.
+"""
+import json
+import os
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from . import config
+
+# Report order; other stages follow alphabetically
+STAGE_ORDER = ("load", "plan", "tokenize", "encode", "upsert", "update", "delete")
+
+
+def points_bytes(embeddings_data: Iterable[Tuple[str, List[float], Dict[str, Any]]]) -> int:
+    """Approximate upsert request size: float32 vectors plus JSON payloads."""
+    total = 0
+    for _, vector, payload in embeddings_data:
+        total += 4 * len(vector) + len(json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8"))
+    return total
+
+
+def record_embedding(metrics: "FileMetrics", embedder: Any, elapsed: float) -> Tuple[int, float]:
+    """
+    Splits one generate_embeddings() call into tokenize/encode stages using the embedder's
+    last_run stats (when it has them). Returns (tokens, encode seconds).
+    """
+    last_run = getattr(embedder, "last_run", None) or {}
+    tokenize_s = min(elapsed, last_run.get("tokenize_s", 0.0))
+    metrics.stages["tokenize"] += tokenize_s
+    metrics.stages["encode"] += elapsed - tokenize_s
+    tokens = last_run.get("tokens", 0)
+    metrics.count(tokens=tokens)
+    for reason, n in last_run.get("skipped", {}).items():
+        metrics.skip(reason, n)
+    return tokens, elapsed - tokenize_s
+
+
+class FileMetrics:
+    """Stage timings, counts, skips and batches for one input file."""
+    def __init__(self, file_path: str):
+        self.file = file_path
+        self.stages: Dict[str, float] = defaultdict(float)
+        self.counts: Counter = Counter()
+        self.skips: Counter = Counter()
+        self.batches: List[Dict[str, Any]] = []
+        self.error: Optional[str] = None
+        self._start = time.perf_counter()
+        self.elapsed: Optional[float] = None
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.stages[name] += time.perf_counter() - start
+
+    def count(self, **values: int):
+        self.counts.update({k: v for k, v in values.items() if v})
+
+    def skip(self, reason: str, n: int = 1):
+        if n:
+            self.skips[reason] += n
+
+    def batch(self, **fields):
+        self.batches.append(fields)
+
+    def to_dict(self) -> Dict[str, Any]:
+        elapsed = self.elapsed if self.elapsed is not None else time.perf_counter() - self._start
+        return {
+            "file": self.file,
+            "elapsed_s": round(elapsed, 4),
+            "stages": {k: round(v, 4) for k, v in self.stages.items()},
+            "counts": dict(self.counts),
+            "skips": dict(self.skips),
+            "batches": self.batches,
+            "error": self.error,
+        }
+
+
+class RunMetrics:
+    """Collects FileMetrics for one pipeline run, writes JSONL and prints the end-of-run report."""
+    def __init__(self, pipeline: str, path: Optional[str] = None, workers: int = 1):
+        self.pipeline = pipeline
+        stamp = time.strftime("%Y%m%d_%H%M%S")
+        self.path = path or os.path.join(config.LOG_DIR, "ingest", f"{pipeline}_{stamp}.jsonl")
+        self.workers = max(1, workers)
+        self.stages: Dict[str, float] = defaultdict(float)
+        self.counts: Counter = Counter()
+        self.skips: Counter = Counter()
+        self.files = 0
+        self.failed_files = 0
+        self._start = time.perf_counter()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._out = open(self.path, "a", encoding="utf-8")
+        self._emit({"type": "run_start", "pipeline": pipeline, "workers": self.workers})
+
+    def _emit(self, record: Dict[str, Any]):
+        record = {"ts": time.strftime("%Y-%m-%dT%H:%M:%S"), **record}
+        self._out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._out.flush()
+
+    @contextmanager
+    def file(self, file_path: str):
+        """Times one file in-process; the file's record is written when the block exits."""
+        metrics = FileMetrics(file_path)
+        try:
+            yield metrics
+        except Exception as e:
+            metrics.error = str(e)
+            raise
+        finally:
+            metrics.elapsed = time.perf_counter() - metrics._start
+            self.add_file(metrics.to_dict())
+
+    @contextmanager
+    def stage(self, name: str):
+        """Times run-level work outside any file (e.g. deleting vanished stories)."""
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.stages[name] += time.perf_counter() - start
+
+    def skip(self, reason: str, n: int = 1):
+        """A skip outside any file (e.g. a file left unparsed because it is unchanged)."""
+        if n:
+            self.skips[reason] += n
+
+    def add_file(self, record: Dict[str, Any]):
+        """Aggregates a FileMetrics.to_dict() (possibly from a worker process) and writes it out."""
+        for batch in record.get("batches", []):
+            self._emit({"type": "batch", "file": record["file"], **batch})
+        self._emit({"type": "file", **{k: v for k, v in record.items() if k != "batches"},
+                    "batch_count": len(record.get("batches", []))})
+        for name, seconds in record.get("stages", {}).items():
+            self.stages[name] += seconds
+        self.counts.update(record.get("counts", {}))
+        self.skips.update(record.get("skips", {}))
+        self.files += 1
+        if record.get("error"):
+            self.failed_files += 1
+
+    def report(self) -> Dict[str, Any]:
+        wall = time.perf_counter() - self._start
+        busy = wall * self.workers
+        measured = sum(self.stages.values())
+        stages = list(STAGE_ORDER) + sorted(set(self.stages) - set(STAGE_ORDER))
+        utilization = {
+            name: {
+                "seconds": round(self.stages[name], 3),
+                # Share of the run's worker time; the rest is untimed overhead (tqdm, manifest, ...)
+                "utilization": round(self.stages[name] / busy, 4) if busy > 0 else None,
+                "share_of_measured": round(self.stages[name] / measured, 4) if measured > 0 else None,
+            }
+            for name in stages if name in self.stages
+        }
+        rates = {f"{name}_per_sec": round(self.counts[name] / wall, 3) if wall > 0 else None
+                 for name in ("stories", "chunks", "tokens", "points")}
+        bound = max(utilization, key=lambda n: utilization[n]["seconds"]) if utilization else None
+        return {
+            "pipeline": self.pipeline,
+            "wall_s": round(wall, 3),
+            "workers": self.workers,
+            "files": self.files,
+            "failed_files": self.failed_files,
+            "counts": dict(self.counts),
+            "skips": dict(self.skips),
+            **rates,
+            "stages": utilization,
+            "dominant_stage": bound,
+        }
+
+    def format_report(self, report: Dict[str, Any]) -> str:
+        counts = report["counts"]
+        lines = [
+            f"Files: {report['files']} ({report['failed_files']} failed)  Wall: {report['wall_s']:.1f}s  "
+            f"Workers: {report['workers']}",
+            f"Stories: {counts.get('stories', 0)} ({report['stories_per_sec'] or 0:.2f}/s)  "
+            f"Chunks: {counts.get('chunks', 0)} ({report['chunks_per_sec'] or 0:.2f}/s)  "
+            f"Tokens: {counts.get('tokens', 0)} ({report['tokens_per_sec'] or 0:.0f}/s)  "
+            f"Upserted: {counts.get('points', 0)} points, {counts.get('upsert_bytes', 0) / 2**20:.1f}MB",
+            f"{'Stage':<10} {'Seconds':>9} {'Util':>7} {'Share':>7}",
+        ]
+        for name, stage in report["stages"].items():
+            lines.append(f"{name:<10} {stage['seconds']:>9.2f} {stage['utilization'] * 100:>6.1f}% "
+                         f"{stage['share_of_measured'] * 100:>6.1f}%")
+        if report["dominant_stage"]:
+            lines.append(f"Dominant stage: {report['dominant_stage']}")
+        if report["skips"]:
+            lines.append("Skips: " + ", ".join(f"{reason}={n}" for reason, n in sorted(report["skips"].items())))
+        return "\n".join(lines)
+
+    def finish(self) -> Dict[str, Any]:
+        report = self.report()
+        self._emit({"type": "run_end", **report})
+        self._out.close()
+        print(f"\n=== Run Metrics ({self.pipeline}) ===")
+        print(self.format_report(report))
+        print(f"Metrics log: {self.path}")
+        return report
@@ -1,40 +1,57 @@
 import uuid
-from typing import List, Tuple, Dict, Any, Set
+from typing import List, Tuple, Dict, Any, Set, Optional
 from qdrant_client import QdrantClient
 from qdrant_client.http import models
 from . import config
 # Use the main config for mode detection
 from src import config as main_config
 
+def connect_client() -> QdrantClient:
+    """Client for the configured Qdrant (cloud when QDRANT_URL/QDRANT_API_KEY are set, else local)."""
+    # Check if we are in Cloud mode
+    if getattr(main_config, "QDRANT_MODE", "local") == "cloud":
+        print(f"Connecting to Qdrant Cloud at {main_config.QDRANT_URL}...")
+        return QdrantClient(
+            url=main_config.QDRANT_URL,
+            api_key=main_config.QDRANT_API_KEY
+        )
+    # Local Mode
+    print(f"Connecting to Local Qdrant at {config.QDRANT_PATH}...")
+    return QdrantClient(path=config.QDRANT_PATH)
+
 class QdrantStorage:
-    def __init__(self):
-        # Check if we are in Cloud mode
-        if getattr(main_config, "QDRANT_MODE", "local") == "cloud":
-            print(f"Connecting to Qdrant Cloud at {main_config.QDRANT_URL}...")
-            self.client = QdrantClient(
-                url=main_config.QDRANT_URL,
-                api_key=main_config.QDRANT_API_KEY
-            )
-        else:
-            # Local Mode
-            print(f"Connecting to Local Qdrant at {config.QDRANT_PATH}...")
-            self.client = QdrantClient(path=config.QDRANT_PATH)
-            
-        self.ensure_collection()
+    def __init__(self, collection_name: str = config.COLLECTION_NAME, client: Optional[QdrantClient] = None,
+                 create: bool = True):
+        # A physical collection, or the serving alias (config.COLLECTION_NAME) which Qdrant resolves
+        self.collection_name = collection_name
+        # Pass a client to share one connection (local Qdrant allows one client per path)
+        self.client = client if client is not None else connect_client()
+        if create:
+            self.ensure_collection()
+
+    @staticmethod
+    def serving_collection(client: QdrantClient, alias_name: str = config.COLLECTION_NAME) -> Optional[str]:
+        """The physical collection searches on `alias_name` hit: its alias target, or a real collection of that name."""
+        for alias in client.get_aliases().aliases:
+            if alias.alias_name == alias_name:
+                return alias.collection_name
+        if alias_name in {c.name for c in client.get_collections().collections}:
+            return alias_name
+        return None
 
     def ensure_collection(self):
         """Create the collection if it doesn't exist."""
-        if not self.client.collection_exists(collection_name=config.COLLECTION_NAME):
-            print(f"Creating collection '{config.COLLECTION_NAME}'...")
+        if not self.client.collection_exists(collection_name=self.collection_name):
+            print(f"Creating collection '{self.collection_name}'...")
             self.client.create_collection(
-                collection_name=config.COLLECTION_NAME,
+                collection_name=self.collection_name,
                 vectors_config=models.VectorParams(
                     size=config.VECTOR_SIZE,
                     distance=models.Distance.COSINE
                 )
             )
         else:
-            # print(f"Collection '{config.COLLECTION_NAME}' already exists.")
+            # print(f"Collection '{self.collection_name}' already exists.")
             pass
 
     def check_existing(self, story_ids: List[str]) -> Set[str]:
@@ -45,6 +62,9 @@ class QdrantStorage:
         # Qdrant requires UUIDs or integers for Point IDs.
         # We process story IDs into UUIDs (deterministically) to query.
         
+        if not self.client.collection_exists(collection_name=self.collection_name):
+            return set()  # e.g. planning a build whose collection is not created yet
+            
         # Map UUID back to original story_id to return the set of EXISTING original IDs
         uuid_map = {}
         points_to_check = []
@@ -57,7 +77,7 @@ class QdrantStorage:
             
         # Retrieve by ID (metadata_only=True to save bandwidth)
         existing_points = self.client.retrieve(
-            collection_name=config.COLLECTION_NAME,
+            collection_name=self.collection_name,
             ids=points_to_check,
             with_payload=False,
             with_vectors=False
@@ -96,7 +116,7 @@ class QdrantStorage:
             
         try:
             self.client.upsert(
-                collection_name=config.COLLECTION_NAME,
+                collection_name=self.collection_name,
                 points=points
             )
             return len(points)
@@ -130,10 +150,57 @@ class QdrantStorage:
             # Qdrant batch update requires 'body' to be list of operations
             # client.batch_update_points(collection_name, update_operations)
             self.client.batch_update_points(
-                collection_name=config.COLLECTION_NAME,
+                collection_name=self.collection_name,
                 update_operations=ops
             )
             return len(stories)
         except Exception as e:
             print(f"Error updating payloads: {e}")
             return 0
+
+    def delete_stories(self, story_ids: List[str]) -> int:
+        """Deletes the points of the given story IDs."""
+        if not story_ids:
+            return 0
+        point_ids = [str(uuid.uuid5(uuid.NAMESPACE_DNS, sid)) for sid in story_ids]
+        try:
+            self.client.delete(
+                collection_name=self.collection_name,
+                points_selector=models.PointIdsList(points=point_ids)
+            )
+            return len(point_ids)
+        except Exception as e:
+            print(f"Error deleting stories: {e}")
+            return 0
+
+    def swap_alias(self, alias_name: str) -> Optional[str]:
+        """
+        Points `alias_name` at this storage's (versioned) collection in one atomic alias update
+        (delete + create), so searches never see a missing or half-built collection.
+        Returns the collection that served the name before, if any; the caller drops it after the swap.
+        A pre-alias real collection of that name keeps serving until then.
+        """
+        previous = self.serving_collection(self.client, alias_name)
+        legacy = previous == alias_name
+        ops = []
+        if previous and not legacy:
+            ops.append(models.DeleteAliasOperation(delete_alias=models.DeleteAlias(alias_name=alias_name)))
+        ops.append(models.CreateAliasOperation(
+            create_alias=models.CreateAlias(collection_name=self.collection_name, alias_name=alias_name)
+        ))
+        try:
+            self.client.update_collection_aliases(change_aliases_operations=ops)
+        except Exception as e:
+            if not legacy:
+                raise
+            # Servers that refuse an alias named like an existing collection: free the name first
+            print(f"Alias '{alias_name}' refused next to the legacy collection ({e}); dropping it first...")
+            self.client.delete_collection(collection_name=alias_name)
+            self.client.update_collection_aliases(change_aliases_operations=ops)
+            return None
+        return previous
+
+    def drop_collection(self, collection_name: str):
+        """Deletes a (retired) physical collection. Never resolves aliases."""
+        if collection_name in {c.name for c in self.client.get_collections().collections}:
+            self.client.delete_collection(collection_name=collection_name)
@@ -81,3 +81,23 @@ def process_file_to_stories(file_path: str, raw_chunks: List[Dict[str, Any]]) ->
         ))
         
     return stories
+
+def embedding_text(story: Story) -> str:
+    """
+    The text that is embedded for a story: a Title/Author/Keywords header, then the full text.
+    [METADATA INFUSION] The vector captures the "Meta-Context", not just the raw narrative.
+    """
+    meta_header = []
+    if story.metadata.get('title'):
+        meta_header.append(f"Title: {story.metadata['title']}")
+    if story.metadata.get('author'):
+        meta_header.append(f"Author: {story.metadata['author']}")
+    if story.metadata.get('keywords'):
+        # Key words might be a list or a comma-separated string
+        kws = story.metadata['keywords']
+        if isinstance(kws, list):
+            kws = ", ".join(kws)
+        meta_header.append(f"Keywords: {kws}")
+        
+    header_text = "\n".join(meta_header)
+    return f"{header_text}\n\n{story.text}"
@@ -1,7 +1,20 @@
 import os
 import time
+import json
+import hashlib
 
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
+
+from src import config
+
+
+class GenerationError(Exception):
+    """The LLM call failed (before or mid-stream) or returned no text."""
+
+
+class ReplayedText(str):
+    """Checkpointed chapter text replayed on resume; not produced by the LLM in this call."""
+    replayed = True
 
 
 # GENRE-SPECIFIC ADDITIONS (conditionally added based on genre)
@@ -154,177 +167,21 @@ STRICT WRITING RULES (ANTI-REPETITION)
 """
 
 
-def generate_story(facets: Dict[str, Any], context_text: str = "", llm_params: Dict[str, Any] = None) -> str:
-    """
-    Generates a NEW, ORIGINAL Telugu story based on user facets and RAG context.
-    """
-    
-    # Extract facets with defaults
-    genre = facets.get("genre", "Folklore")
-    keywords = facets.get("keywords", [])
-    chars = facets.get("characters", [])
-    locations = facets.get("locations", [])
-    
-    # New facets
-    content_type = facets.get("content_type", "SINGLE")
-    num_chapters = facets.get("num_chapters", 1)
+# PROMPT LAYOUT (PROVIDER PROMPT CACHING)
+# Each prompt is a STATIC system prompt (identical bytes on every call, so provider-side prompt
+# caches hit) followed by a VARIABLE user message (facets, RAG context, story so far).
+# Never format per-request values into the *_SYSTEM_PROMPT constants.
 
-    # Format lists for prompt
-    keywords_str = ", ".join(keywords) if keywords else "None"
-    chars_str = ", ".join(chars) if chars else "Generic Characters"
-    locations_str = ", ".join(locations) if locations else "Generic Village"
-
-    # User's custom prompt
-    custom_instruction = facets.get("prompt_input", "").strip()
-
-    # Determine derived variables (Shared logic)
-    genre_key = genre.lower().replace(" ", "_")
-    
-    # Add Tone if present in facets
-    tone = facets.get("tone", "traditional")
-    tone_instruction = TONE_ADDITIONS.get(tone.lower(), "")
-    
-    # Add Genre specific guidelines
-    genre_guidelines = GENRE_ADDITIONS.get(genre_key, "")
-    
-    if content_type == "SERIAL":
-        prompt = f"""
-You are a master Telugu storyteller (Katha Rachayita) specializing in SERIAL STORIES (ధారావాహికలు).
-
-Your task is to write a MULTI-CHAPTER SERIAL STORY in Telugu based on the user's request.
-
-==================================================
-CONFIG
-==================================================
-Genre: {genre}
-Number of Chapters to Generate: {num_chapters}
-Keywords: {keywords_str}
-Characters: {chars_str}
-Locations: {locations_str}
-User Plot Idea: {custom_instruction if custom_instruction else "Create a gripping serial story."}
-
-==================================================
-SERIAL STORY RULES (STRICT)
-==================================================
-1. You MUST generate EXACTLY {num_chapters} chapters in this single response.
-2. Label each chapter clearly as:
-   ## అధ్యాయం 1: [Chapter Title]
-   [Story Content...]
-   
-   ## అధ్యాయం 2: [Chapter Title]
-   [Story Content...]
-   
-   (and so on...)
-
-3. CONTINUITY: 
-   - The story MUST be continuous. Chapter 2 must start exactly where Chapter 1 ended.
-   - Do NOT restart the story in each chapter.
-   - if too many characters are given introduce them slowly over the chapters but maintain logic over the stories.
-   - squeeze the full dramatic potential of its premise.
-   - No Rushed execution. 
-   - All chapters need not have same token count. count may vary based on the story.
-   -Each chapter must justify the existence of the next chapter.
-   - Maintain consistent characters and setting throughout.
-   -Each chapter must increase at least one of these: stakes, risk, moral cost, emotional pressure
-   -If a chapter only: travels, explains, reveals without resistance then it must introduce a new problem by the end.
-   -Concrete enforcement: Any test / puzzle / challenge must: fail once OR cost something (time, safety, trust, emotion)
-   -❌ No instant success
-   -❌ No back-to-back victories
-   -Every major action must leave a residue.
-   -Show the value through action, not explanation.
-   -Enforce: Characters act according to values, Narrator does not explain the lesson directly
-   -❌ Avoid:“ఈ కథ మనకు నేర్పింది…” or “అలా ధర్మం గెలిచింది…”
-
-4. CLIFFHANGERS & CONCLUSION (CRITICALLY IMPORTANT):
-   - Chapters 1 to {num_chapters - 1}: MUST end with a SUSPENSE HOOK or CLIFFHANGER. The reader must feel "What happens next?"
-   - FINAL CHAPTER (Chapter {num_chapters}): MUST RESOLVE everything.
-     - PROHIBITED: Do NOT end the last chapter with a cliffhanger.
-     - REQUIRED: Tie up all loose ends. Solve the mystery. complete the character arcs.
-     - It must feel like a satisfying CONCLUSION to the serial.
-
-5. STYLE:
-   - Use classical/magazine style Telugu (Chandamama style).
-   - Descriptive, engaging, and emotional.
-   - Avoid English words.
-
-6. Before finalizing each chapter, ask internally:
-
-“What is still unresolved?”
-
-“Why must the reader continue?”
-
-“What did this chapter cost the characters?”
-
-{KEYWORD_INTEGRATION_LOGIC}
-
-{genre_guidelines}
-
-**TONE:** {tone_instruction}
-
-{ANTI_REPETITION_RULES}
-
-==================================================
-ARCHIVE CONTEXT (STYLE SOURCES)
-==================================================
-Use these only for style inspiration:
-{context_text}
-
-==================================================
-OUTPUT FORMAT
-==================================================
-Title: [Serial Title - Big and Catchy]
-
-## అధ్యాయం 1: [Title]
-[Content...]
-
-## అధ్యాయం 2: [Title]
-[Content...]
-
-...
-
-(Moral is optional for serials, but if applicable, add at the very end).
-
-Label:
-ఈ ధారావాహిక కథ కొత్తగా రూపొందించబడింది (AI Generated Serial).
-"""
-    else:
-        # SINGLE STORY PROMPT
-        
-        # Calculate derived variables
-        word_count = "400-600" # Default
-        
-        # Determine format based on genre
-        ending_format = ""
-        
-        if "moral" in genre_key or "children" in genre_key or "folklore" in genre_key:
-             ending_format = "Moral:\n<One clear sentence>"
+DEFAULT_SYSTEM_PROMPT = "You are a creative storyteller."
 
-        # CORE SYSTEM PROMPT (always included)
-        prompt = f"""
+SINGLE_STORY_SYSTEM_PROMPT = """
 You are an expert Telugu storyteller who writes engaging, well-crafted stories.
 
-==================================================
-ARCHIVE CONTEXT (STYLE REFERENCE)
-==================================================
-Learn narrative rhythm, vocabulary, and flow from these examples.
+The user message gives ARCHIVE CONTEXT (style reference), the STORY REQUEST
+(genre, themes, characters, setting), optional genre guidelines and tone.
+Learn narrative rhythm, vocabulary, and flow from the archive examples.
 DO NOT copy plots or characters.
-
-{context_text}
-
-==================================================
-STORY REQUEST
-==================================================
-Genre: {genre}
-Themes/Keywords: {keywords_str}
-Characters: {chars_str}
-Setting: {locations_str}
-Additional Instructions: {custom_instruction if custom_instruction else "Create an engaging story."}
-
-Use these as creative inspiration—integrate naturally, don't force.
-
-{genre_guidelines}
-
-**TONE:** {tone_instruction}
+Use the request as creative inspiration—integrate naturally, don't force.
 
 ==================================================
 UNIVERSAL QUALITY STANDARDS
@@ -367,11 +224,7 @@ UNIVERSAL QUALITY STANDARDS
 - Climax (decision/turning point)
 - Resolution (earned consequences)
 - Satisfying conclusion
-
-{KEYWORD_INTEGRATION_LOGIC}
-
-{ANTI_REPETITION_RULES}
-
+""" + KEYWORD_INTEGRATION_LOGIC + ANTI_REPETITION_RULES + """
 ==================================================
 SELF-REVISION CHECKLIST
 ==================================================
@@ -391,82 +244,192 @@ Title:
 <Appropriate to genre and tone>
 
 Story:
-<Full Telugu story, {word_count} words>
-
-{ending_format}
+<Full Telugu story, 400-600 words>
 
 Label:
 ఈ కథ కొత్తగా రూపొందించబడింది (Inspired by Archive).
 """
 
+SINGLE_STORY_REQUEST = """
+==================================================
+ARCHIVE CONTEXT (STYLE REFERENCE)
+==================================================
+{context}
+
+==================================================
+STORY REQUEST
+==================================================
+Genre: {genre}
+Themes/Keywords: {keywords}
+Characters: {characters}
+Setting: {locations}
+Additional Instructions: {instructions}
+
+{genre_guidelines}
+
+**TONE:** {tone_instruction}
+
+{ending_format}
+"""
+
+def generate_story(facets: Dict[str, Any], context_text: str = "", llm_params: Dict[str, Any] = None,
+                   raise_errors: bool = False) -> str:
+    """
+    Generates a NEW, ORIGINAL Telugu story based on user facets and RAG context.
+    Failures are streamed as an error message, or raised as GenerationError with raise_errors.
+    SERIAL facets are delegated to generate_serial_story (chapter by chapter, checkpointed).
+    """
+    if facets.get("content_type") == "SERIAL":
+        yield from generate_serial_story(facets, context_text, llm_params, raise_errors=raise_errors)
+        return
+
+    # Extract facets with defaults
+    genre = facets.get("genre", "Folklore")
+    keywords = facets.get("keywords", [])
+    chars = facets.get("characters", [])
+    locations = facets.get("locations", [])
+    
+    # Format lists for prompt
+    keywords_str = ", ".join(keywords) if keywords else "None"
+    chars_str = ", ".join(chars) if chars else "Generic Characters"
+    locations_str = ", ".join(locations) if locations else "Generic Village"
+
+    # User's custom prompt
+    custom_instruction = facets.get("prompt_input", "").strip()
+
+    # Determine derived variables (Shared logic)
+    genre_key = genre.lower().replace(" ", "_")
+    
+    # Add Tone if present in facets
+    tone = facets.get("tone", "traditional")
+    tone_instruction = TONE_ADDITIONS.get(tone.lower(), "")
+    
+    # Add Genre specific guidelines
+    genre_guidelines = GENRE_ADDITIONS.get(genre_key, "")
     
+    # Determine format based on genre
+    ending_format = ""
+    
+    if "moral" in genre_key or "children" in genre_key or "folklore" in genre_key:
+        ending_format = "After the story (before the Label), add:\nMoral:\n<One clear sentence>"
+
+    system_prompt = SINGLE_STORY_SYSTEM_PROMPT
+    prompt = SINGLE_STORY_REQUEST.format(
+        context=context_text,
+        genre=genre,
+        keywords=keywords_str,
+        characters=chars_str,
+        locations=locations_str,
+        instructions=custom_instruction if custom_instruction else "Create an engaging story.",
+        genre_guidelines=genre_guidelines,
+        tone_instruction=tone_instruction,
+        ending_format=ending_format
+    )
+
     # Call isolated LLM function with streaming
     try:
-        stream = _call_llm_creative(prompt, llm_params)
+        stream = _call_llm_creative(prompt, llm_params, system_prompt)
         
         full_text = ""
         for chunk in stream:
             full_text += chunk
             yield chunk
             time.sleep(0.005) # Slightly faster streaming
+        if not full_text.strip():
+            raise GenerationError("The model returned no text")
             
         # Append Mandatory Label
-        if content_type == "SERIAL":
-             if "AI Generated Serial" not in full_text:
-                  label = "\n\n(ఈ ధారావాహిక కథ కొత్తగా రూపొందించబడింది - AI Generated Serial)"
-                  yield label
-        else:
-            label = "\n\n(ఈ కథ కొత్తగా రూపొందించబడింది - AI Generated)"
-            yield label
+        yield "\n\n(ఈ కథ కొత్తగా రూపొందించబడింది - AI Generated)"
 
     except Exception as e:
+        if raise_errors:
+            raise GenerationError(f"Error generating story: {e}") from e
         yield f"Error generating story: {str(e)}"
 
 
-def _call_llm_creative(prompt: str, params: Dict[str, Any] = None):
-    """
-    Calls Multi-LLM backend (OpenAI, Groq, HF) with streaming.
-    """
-    try:
-        from src.local_llm_multi import generate_response_multi, config
-        
-        # Default Params
-        if not params:
-            params = {}
-            
-        model_id = params.get("model", config.AVAILABLE_MODELS[0])
-        temp = params.get("temperature", 0.7)
-        max_tok = params.get("max_tokens", 3500)
-
-        return generate_response_multi(
-            model_id=model_id, 
-            prompt=prompt, 
-            system_prompt="You are a creative storyteller.", 
-            temperature=temp, 
-            max_tokens=max_tok,
-            stream=True
-        )
-    except Exception as e:
-        return f"LLM Error: {str(e)}"
+# INCREMENTAL SERIAL ENGINE
+SERIAL_CHAPTER_SYSTEM_PROMPT = """
+You are a master Telugu storyteller (Katha Rachayita) specializing in SERIAL STORIES (ధారావాహికలు).
 
-def generate_poem(facets: Dict[str, Any], llm_params: Dict[str, Any] = None) -> str:
-    """
-    Generates a Telugu POEM/SONG based on facets.
-    """
-    theme = facets.get("theme", "Nature")
-    keywords = facets.get("keywords", [])
-    style = facets.get("style", "Metric Poem (Padyam)")
-    
-    keywords_str = ", ".join(keywords) if keywords else "None"
-    
-    prompt = f"""
-You are a playful Telugu Poet (Kavi) writing for a children's magazine.
+You are writing ONE chapter of a multi-chapter serial at a time. The user message gives the
+CONFIG, the STORY SO FAR, YOUR TASK (which chapter to write), optional genre guidelines and
+tone, ARCHIVE CONTEXT, and the OUTPUT FORMAT for this chapter.
 
-Goal: Write a {style} in Telugu.
+CONTINUITY RULES (STRICT):
+- Start exactly where the previous chapter ended. Do NOT restart or recap the story.
+- Keep characters, names and settings consistent with the story so far.
+- Introduce new characters slowly; every character must have a clear role.
+- The chapter must increase at least one of: stakes, risk, moral cost, emotional pressure.
+- Any test / puzzle / challenge must fail once OR cost something (time, safety, trust, emotion).
+- ❌ No instant success. ❌ No back-to-back victories.
+- Show values through action; the narrator does not explain the lesson directly.
 
-Parameters:
-- Theme: {theme}
-- Keywords: {keywords_str}
+STYLE:
+- Classical/magazine style Telugu (Chandamama style).
+- Descriptive, engaging and emotional. Avoid English words.
+""" + KEYWORD_INTEGRATION_LOGIC + ANTI_REPETITION_RULES
+
+SERIAL_CHAPTER_PROMPT = """
+==================================================
+CONFIG
+==================================================
+Genre: {genre}
+Number of Chapters: {num_chapters}
+Keywords: {keywords}
+Characters: {characters}
+Locations: {locations}
+User Plot Idea: {plot_idea}
+
+==================================================
+STORY SO FAR
+==================================================
+{story_so_far}
+
+==================================================
+YOUR TASK
+==================================================
+Write ONLY Chapter {chapter_num} of {num_chapters}.
+{title_instruction}
+{chapter_role}
+
+{genre_guidelines}
+
+**TONE:** {tone_instruction}
+
+==================================================
+ARCHIVE CONTEXT (STYLE SOURCES)
+==================================================
+Use these only for style inspiration:
+{context}
+
+==================================================
+OUTPUT FORMAT
+==================================================
+{output_format}
+"""
+
+SERIAL_SUMMARY_SYSTEM_PROMPT = """
+You maintain the running summary of a Telugu serial story.
+
+The user message gives the PREVIOUS SUMMARY and the NEW CHAPTER.
+Write an UPDATED summary covering every chapter so far, in Telugu, at most 150 words.
+Keep: main events in order, each character's current state and goal, unresolved threads,
+and exactly how the new chapter ended (the cliffhanger).
+Output ONLY the summary.
+"""
+
+SERIAL_SUMMARY_PROMPT = """
+PREVIOUS SUMMARY (Chapters 1-{prev_chapter}):
+{summary}
+
+NEW CHAPTER ({chapter_num}):
+{chapter_text}
+"""
+
+POEM_SYSTEM_PROMPT = """
+You are a playful Telugu Poet (Kavi) writing for a children's magazine.
+
+The user message gives the poem style, theme and keywords.
 
 Requirements:
 - Simple, rhythmic Telugu.
@@ -482,9 +445,252 @@ Title: <Title>
 
 (Meaning/Bhavam - Optional but good for children)
 """
+
+POEM_PROMPT = """
+Goal: Write a {style} in Telugu.
+
+Parameters:
+- Theme: {theme}
+- Keywords: {keywords}
+"""
+
+
+def _serial_checkpoint_path(checkpoint_dir: str, facets: Dict[str, Any], context_text: str,
+                            llm_params: Dict[str, Any]) -> str:
+    """
+    Checkpoints are keyed by everything that shapes the serial, so a retry with the
+    same inputs resumes while a changed request starts fresh.
+    """
+    key_data = json.dumps(
+        {"facets": facets, "context": context_text, "model": llm_params.get("model")},
+        ensure_ascii=False, sort_keys=True, default=str
+    )
+    key = hashlib.sha1(key_data.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(checkpoint_dir, f"serial_{key}.json")
+
+
+def _expire_serial_checkpoints(checkpoint_dir: str, max_age_seconds: float):
+    """Deletes checkpoints of serials abandoned more than max_age_seconds ago."""
+    try:
+        names = os.listdir(checkpoint_dir)
+    except OSError:
+        return
+    cutoff = time.time() - max_age_seconds
+    for name in names:
+        if not name.startswith("serial_"):
+            continue
+        path = os.path.join(checkpoint_dir, name)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+        except OSError:
+            pass  # removed concurrently, or not ours to delete
+
+
+def _load_serial_checkpoint(path: str) -> Dict[str, Any]:
+    try:
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+    except Exception as e:
+        print(f"Warning: Ignoring unreadable serial checkpoint {path}: {e}")
+    return {"chapters": [], "summary": ""}
+
+
+def _save_serial_checkpoint(path: str, state: Dict[str, Any]):
+    # Write-then-rename so a crash mid-write never corrupts finished chapters
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def _summarize_serial(summary: str, chapter_text: str, chapter_num: int, llm_params: Dict[str, Any]) -> str:
+    """
+    Folds a finished chapter into the rolling summary used to prompt the next chapter.
+    Falls back to the chapter's closing lines if the summary call fails.
+    """
+    prompt = SERIAL_SUMMARY_PROMPT.format(
+        prev_chapter=chapter_num - 1,
+        summary=summary if summary else "(This is the first chapter.)",
+        chapter_num=chapter_num,
+        chapter_text=chapter_text
+    )
+    params = dict(llm_params)
+    params["max_tokens"] = config.SERIAL_SUMMARY_MAX_TOKENS
+    params["temperature"] = 0.3
+
+    try:
+        new_summary = "".join(_call_llm_creative(prompt, params, SERIAL_SUMMARY_SYSTEM_PROMPT)).strip()
+    except Exception as e:
+        print(f"Serial summary failed ({e}); using the closing lines of chapter {chapter_num}")
+        new_summary = ""
+
+    if not new_summary:
+        tail = chapter_text[-config.SERIAL_CONTINUITY_CHARS:]
+        return f"{summary}\n[Chapter {chapter_num} ending] {tail}".strip()
+    return new_summary
+
+
+def generate_serial_story(
+    facets: Dict[str, Any],
+    context_text: str = "",
+    llm_params: Dict[str, Any] = None,
+    checkpoint_dir: Optional[str] = None,
+    raise_errors: bool = False
+):
+    """
+    Generates a SERIAL story one chapter at a time.
+
+    Chapter N+1 is prompted with a compact rolling summary of chapters 1..N (plus the
+    closing lines of chapter N), so each completion stays small and every chapter
+    streams as soon as it is written. Finished chapters are checkpointed to disk;
+    calling again with the same inputs replays them and resumes with the next chapter.
+    Checkpoints untouched for config.SERIAL_CHECKPOINT_MAX_AGE_DAYS are deleted.
+    A chapter is checkpointed only if its stream finished without error; a failure is
+    streamed as a message, or raised as GenerationError with raise_errors.
+    """
+    llm_params = dict(llm_params) if llm_params else {}
+    checkpoint_dir = checkpoint_dir or config.SERIAL_CHECKPOINT_DIR
+
+    genre = facets.get("genre", "Folklore")
+    keywords = facets.get("keywords", [])
+    chars = facets.get("characters", [])
+    locations = facets.get("locations", [])
+    num_chapters = max(1, int(facets.get("num_chapters", 3)))
+    custom_instruction = facets.get("prompt_input", "").strip()
+
+    genre_key = genre.lower().replace(" ", "_")
+    tone = facets.get("tone", "traditional")
+
+    # The serial budget is shared across chapters, but each chapter gets enough room to breathe
+    total_budget = llm_params.get("max_tokens", 6000)
+    chapter_params = dict(llm_params)
+    chapter_params["max_tokens"] = max(config.SERIAL_CHAPTER_MIN_TOKENS, total_budget // num_chapters)
+
+    _expire_serial_checkpoints(checkpoint_dir, config.SERIAL_CHECKPOINT_MAX_AGE_DAYS * 86400)
+    checkpoint_path = _serial_checkpoint_path(checkpoint_dir, facets, context_text, llm_params)
+    state = _load_serial_checkpoint(checkpoint_path)
+    chapters: List[Dict[str, Any]] = state.get("chapters", [])[:num_chapters]
+    summary = state.get("summary", "")
+
+    # Replay chapters finished by an earlier (interrupted) run
+    for chapter in chapters:
+        yield ReplayedText(chapter["text"] + "\n\n")
+
+    for chapter_num in range(len(chapters) + 1, num_chapters + 1):
+        if chapter_num == 1:
+            story_so_far = "(Nothing yet. This is the opening chapter.)"
+            title_instruction = "First line must be the serial title as: Title: [Serial Title - Big and Catchy]"
+            output_format = "Title: [Serial Title]\n\n## అధ్యాయం 1: [Chapter Title]\n[Content...]"
+        else:
+            last_text = chapters[-1]["text"]
+            story_so_far = (
+                f"Summary of Chapters 1-{chapter_num - 1}:\n{summary}\n\n"
+                f"Closing lines of Chapter {chapter_num - 1}:\n...{last_text[-config.SERIAL_CONTINUITY_CHARS:]}"
+            )
+            title_instruction = "Do NOT repeat the serial title."
+            output_format = f"## అధ్యాయం {chapter_num}: [Chapter Title]\n[Content...]"
+
+        if chapter_num < num_chapters:
+            chapter_role = (
+                "This chapter MUST end with a SUSPENSE HOOK or CLIFFHANGER. "
+                "The reader must feel \"What happens next?\""
+            )
+        else:
+            chapter_role = (
+                "This is the FINAL chapter. It MUST RESOLVE everything: tie up all loose ends, solve the mystery, "
+                "complete the character arcs. Do NOT end with a cliffhanger."
+            )
+
+        prompt = SERIAL_CHAPTER_PROMPT.format(
+            num_chapters=num_chapters,
+            genre=genre,
+            keywords=", ".join(keywords) if keywords else "None",
+            characters=", ".join(chars) if chars else "Generic Characters",
+            locations=", ".join(locations) if locations else "Generic Village",
+            plot_idea=custom_instruction if custom_instruction else "Create a gripping serial story.",
+            story_so_far=story_so_far,
+            chapter_num=chapter_num,
+            title_instruction=title_instruction,
+            chapter_role=chapter_role,
+            genre_guidelines=GENRE_ADDITIONS.get(genre_key, ""),
+            tone_instruction=TONE_ADDITIONS.get(tone.lower(), ""),
+            context=context_text,
+            output_format=output_format
+        )
+
+        chapter_text = ""
+        try:
+            for chunk in _call_llm_creative(prompt, chapter_params, SERIAL_CHAPTER_SYSTEM_PROMPT):
+                chapter_text += chunk
+                yield chunk
+                time.sleep(0.005)
+            if not chapter_text.strip():
+                raise GenerationError("The model returned no text")
+        except Exception as e:
+            # Earlier chapters stay checkpointed, so the next attempt resumes here
+            if raise_errors:
+                raise GenerationError(f"Error generating chapter {chapter_num}: {e}") from e
+            yield (f"\n\nError generating chapter {chapter_num}: {str(e)}"
+                   f"\n\n(Chapter {chapter_num} failed. Run again to resume from this chapter.)")
+            return
+
+        yield "\n\n"
+
+        if chapter_num < num_chapters:
+            summary = _summarize_serial(summary, chapter_text, chapter_num, llm_params)
+
+        chapters.append({"number": chapter_num, "text": chapter_text})
+        _save_serial_checkpoint(checkpoint_path, {"chapters": chapters, "summary": summary})
+
+    # Serial complete: the checkpoint has served its purpose
+    try:
+        os.remove(checkpoint_path)
+    except OSError:
+        pass
+
+    yield "(ఈ ధారావాహిక కథ కొత్తగా రూపొందించబడింది - AI Generated Serial)"
+
+
+def _call_llm_creative(prompt: str, params: Dict[str, Any] = None, system_prompt: str = DEFAULT_SYSTEM_PROMPT):
+    """
+    Calls Multi-LLM backend (OpenAI, Groq, HF) with streaming.
+    system_prompt should be one of the static *_SYSTEM_PROMPT constants so the provider
+    can reuse its cached prefix; everything request-specific goes in prompt.
+    Provider errors raise, including ones in the middle of the stream.
+    """
+    from src.local_llm_multi import hedged_stream, stream
+
+    # Default Params
+    if not params:
+        params = {}
+
+    open_stream = hedged_stream if config.LLM_HEDGING_ENABLED else stream
+    return open_stream(
+        model_id=params.get("model", config.AVAILABLE_MODELS[0]),
+        prompt=prompt,
+        system_prompt=system_prompt,
+        temperature=params.get("temperature", 0.7),
+        max_tokens=params.get("max_tokens", 3500),
+        priority=params.get("priority", config.LLM_PRIORITY_INTERACTIVE)
+    )
+
+def generate_poem(facets: Dict[str, Any], llm_params: Dict[str, Any] = None) -> str:
+    """
+    Generates a Telugu POEM/SONG based on facets.
+    """
+    theme = facets.get("theme", "Nature")
+    keywords = facets.get("keywords", [])
+    style = facets.get("style", "Metric Poem (Padyam)")
+    
+    keywords_str = ", ".join(keywords) if keywords else "None"
+    
+    prompt = POEM_PROMPT.format(style=style, theme=theme, keywords=keywords_str)
     try:
         # Pass params correctly
-        stream = _call_llm_creative(prompt, llm_params)
+        stream = _call_llm_creative(prompt, llm_params, POEM_SYSTEM_PROMPT)
         for chunk in stream:
             yield chunk
             time.sleep(0.02) # Slower streaming speed
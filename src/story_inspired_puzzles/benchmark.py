@@ -0,0 +1,194 @@
+"""
+Crossword generation benchmark and quality suite.
+
+Builds realistic Telugu answer lists from the archive (each story's characters,
+keywords and locations, consecutive stories joined for larger sizes), runs
+CrosswordGenerator over several lists and seeds per size, and reports latency
+percentiles, placed-word ratio and grid density.
+
+benchmarks/puzzle_bench.json is the committed baseline (default settings). Latencies
+depend on the machine, so regenerate it with --json where the comparison runs.
+
+Usage:
+    python -m src.story_inspired_puzzles.benchmark --baseline benchmarks/puzzle_bench.json
+    python -m src.story_inspired_puzzles.benchmark --json benchmarks/puzzle_bench.json
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+
+from src.perf.reporting import Check, add_report_args, check_baseline, compare_rows, fmt_ms, load_report, write_report
+from src.story_inspired_puzzles.puzzle_generator import CrosswordGenerator, start_search_pool
+from src.story_inspired_puzzles.utils import is_answer_candidate
+
+DEFAULT_BASE_DIR = os.path.join(os.getcwd(), "data", "1947-2012")
+DEFAULT_SIZES = [12, 25, 50]
+ANSWER_FIELDS = ("characters", "keywords", "locations")
+
+
+def iter_story_answers(base_dir: str, max_files: Optional[int] = None) -> Iterator[List[str]]:
+    """Yields the candidate answers of each archive story, in archive order."""
+    paths = []
+    for root, _, filenames in os.walk(base_dir):
+        for filename in filenames:
+            if filename.startswith("చందమామ_") and filename.endswith(".json"):
+                paths.append(os.path.join(root, filename))
+    paths.sort()
+    if max_files:
+        paths = paths[:max_files]
+
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        for story in data.get("stories", []):
+            answers = []
+            for field in ANSWER_FIELDS:
+                answers.extend(a.strip() for a in (story.get(field) or []) if isinstance(a, str))
+            answers = [a for a in dict.fromkeys(answers) if is_answer_candidate(a)]
+            if answers:
+                yield answers
+
+
+def build_answer_lists(stories: List[List[str]], size: int, count: int, seed: int = 0) -> List[List[str]]:
+    """
+    `count` answer lists of exactly `size` answers. Each starts at a random story
+    and joins the following stories until it is full.
+    """
+    rng = random.Random(seed * 100003 + size)
+    lists = []
+    for _ in range(count):
+        start = rng.randrange(len(stories))
+        answers = {}
+        for offset in range(len(stories)):
+            for a in stories[(start + offset) % len(stories)]:
+                answers.setdefault(a, None)
+            if len(answers) >= size:
+                break
+        if len(answers) < size:
+            break
+        lists.append(list(answers)[:size])
+    return lists
+
+
+def grid_density(layout: Dict[str, Any]) -> float:
+    """Filled cells / (width * height)."""
+    cells = set()
+    for w in layout["words"]:
+        for i in range(len(w["answer"])):
+            across = w["direction"] == "across"
+            cells.add((w["start_x"] + i, w["start_y"]) if across else (w["start_x"], w["start_y"] + i))
+    return len(cells) / (layout["width"] * layout["height"])
+
+
+def run_benchmark(stories: List[List[str]], sizes: List[int], lists_per_size: int = 5, seeds: int = 3,
+                  layout_kwargs: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """
+    Runs every (answer list, seed) pair for each size and aggregates:
+    latency p50/p95, mean placed-word ratio, mean density, and failures (no layout).
+    """
+    layout_kwargs = dict(layout_kwargs or {})
+    rows = []
+    for size in sizes:
+        answer_lists = build_answer_lists(stories, size, lists_per_size)
+        if not answer_lists:
+            print(f"Skipping size {size}: not enough answers in the archive sample.")
+            continue
+        print(f"Benchmarking {len(answer_lists)} lists x {seeds} seeds at size {size}...", flush=True)
+
+        latencies, ratios, densities, failures = [], [], [], 0
+        for answers in answer_lists:
+            words_data = [{"answer": a, "clue": a} for a in answers]
+            for seed in range(seeds):
+                start = time.perf_counter()
+                layout = CrosswordGenerator().generate_layout(words_data, seed=seed, **layout_kwargs)
+                latencies.append(time.perf_counter() - start)
+                if not layout:
+                    failures += 1
+                    ratios.append(0.0)
+                    continue
+                ratios.append(layout["placed_count"] / layout["total_count"])
+                densities.append(grid_density(layout))
+
+        rows.append({
+            "size": size,
+            "runs": len(latencies),
+            "latency_p50_s": float(np.percentile(latencies, 50)),
+            "latency_p95_s": float(np.percentile(latencies, 95)),
+            "placed_ratio": float(np.mean(ratios)),
+            "density": float(np.mean(densities)) if densities else 0.0,
+            "failures": failures,
+        })
+    return rows
+
+
+def compare_to_baseline(rows: List[Dict[str, Any]], baseline: List[Dict[str, Any]],
+                        max_regression: float, quality_tolerance: float = 0.02) -> List[str]:
+    """
+    Returns human readable regressions: latency growth beyond `max_regression`
+    (ignoring changes under 5ms), or placed ratio / density drops beyond `quality_tolerance`.
+    """
+    quality = dict(min_abs=quality_tolerance, fmt=lambda v: f"{v:.3f}", lower_is_worse=True, relative=False)
+    checks = [
+        Check("latency_p50_s", 0.005, fmt_ms),
+        Check("latency_p95_s", 0.005, fmt_ms),
+        Check("placed_ratio", **quality),
+        Check("density", **quality),
+    ]
+    return compare_rows(rows, baseline, "size", checks, max_regression, label=lambda row: f"size {row['size']}")
+
+
+def format_report(rows: List[Dict[str, Any]]) -> str:
+    lines = [f"{'Size':>5} {'Runs':>5} {'p50 (ms)':>9} {'p95 (ms)':>9} {'Placed':>7} {'Density':>8} {'Failed':>7}"]
+    lines.append("-" * 56)
+    for r in rows:
+        lines.append(
+            f"{r['size']:>5} {r['runs']:>5} {r['latency_p50_s'] * 1000:>9.1f} {r['latency_p95_s'] * 1000:>9.1f} "
+            f"{r['placed_ratio']:>7.1%} {r['density']:>8.1%} {r['failures']:>7}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark crossword layout generation on archive answer lists")
+    parser.add_argument("--base-dir", default=DEFAULT_BASE_DIR)
+    parser.add_argument("--max-files", type=int, default=60, help="Archive issues to read answers from")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--lists", type=int, default=5, help="Answer lists per size")
+    parser.add_argument("--seeds", type=int, default=3, help="Layout seeds per answer list")
+    parser.add_argument("--attempts", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Search each layout on a persistent pool of this many processes (default: sequential)")
+    parser.add_argument("--deadline", type=float, default=None, help="Per-layout search deadline (seconds)")
+    add_report_args(parser, max_regression=0.25)
+    args = parser.parse_args(argv)
+
+    stories = list(iter_story_answers(args.base_dir, args.max_files))
+    if not stories:
+        print(f"No archive stories with answers found under {args.base_dir}")
+        return 1
+    print(f"Loaded answers from {len(stories)} stories.")
+
+    layout_kwargs = {"attempts": args.attempts, "workers": args.workers, "deadline": args.deadline}
+    if args.workers and args.workers > 1:
+        start_search_pool(args.workers)  # process startup stays out of the latencies
+    rows = run_benchmark(stories, args.sizes, args.lists, args.seeds, layout_kwargs)
+    print("\n=== Crossword Benchmark ===")
+    print(format_report(rows))
+
+    if args.json:
+        write_report(args.json, {"settings": vars(args), "sizes": rows})
+
+    if args.baseline:
+        baseline = load_report(args.baseline).get("sizes", [])
+        return check_baseline(compare_to_baseline(rows, baseline, args.max_regression), "Crossword")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,303 @@
+"""
+Offline puzzle bank: crosswords precomputed from the archive, served without any LLM call.
+
+Answers come from each story's existing metadata:
+- characters / locations / keywords: clued by the story sentence that mentions them,
+  blanked (or by their role in the story when the text never names them)
+- moral: fill-in-the-blank clues on the story's moral sentence
+Layouts are built with CrosswordGenerator and stored in SQLite, keyed by
+(story_id, difficulty).
+
+Usage:
+    python -m src.story_inspired_puzzles.puzzle_bank
+    python -m src.story_inspired_puzzles.puzzle_bank --years 1960 1961 --workers 4
+"""
+import argparse
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional
+
+from src import config
+from src.story_inspired_puzzles.puzzle_generator import CrosswordGenerator
+from src.story_inspired_puzzles.utils import is_answer_candidate, clean_and_split_word
+
+DEFAULT_BASE_DIR = os.path.join(os.getcwd(), "data", "1947-2012")
+
+# Difficulty -> (answer sources in order of preference, max answers)
+DIFFICULTIES = {
+    "easy": (("characters", "locations"), 8),
+    "medium": (("characters", "locations", "keywords"), 12),
+    "hard": (("characters", "locations", "keywords", "moral"), 16),
+}
+
+# Fill-in-the-blank clues taken from one moral sentence
+MAX_MORAL_BLANKS = 2
+# Layouts with fewer words than this are not worth serving
+MIN_PLACED_WORDS = 3
+# Story text kept with each puzzle, so the app can show what it was drawn from
+EXCERPT_CHARS = 1200
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS puzzles (
+    story_id TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    title TEXT,
+    genre TEXT,
+    year INTEGER,
+    excerpt TEXT,
+    words_json TEXT NOT NULL,
+    layout_json TEXT NOT NULL,
+    placed_count INTEGER NOT NULL,
+    total_count INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (story_id, difficulty)
+);
+CREATE INDEX IF NOT EXISTS idx_puzzles_difficulty ON puzzles (difficulty, genre);
+"""
+
+
+# Sentence ends; single newlines are OCR line wraps, so only blank lines count
+_SENTENCE_END = re.compile(r"[.!?।]|\n\s*\n")
+
+
+def _context_clue(content: str, answer: str, width: int = 90) -> Optional[str]:
+    """
+    The sentence of the story that first mentions `answer`, with the answer blanked.
+    Long sentences are cut to about `width` characters on each side, at whitespace.
+    """
+    pos = content.find(answer)
+    if pos == -1:
+        return None
+    before = content[max(0, pos - width):pos]
+    ends = list(_SENTENCE_END.finditer(before))
+    if ends:
+        before = before[ends[-1].end():]
+    elif pos > width:
+        before = before.split(None, 1)[1] if len(before.split(None, 1)) > 1 else ""
+
+    after = content[pos + len(answer):pos + len(answer) + width]
+    end = _SENTENCE_END.search(after)
+    if end:
+        after = after[:end.start()]
+    elif pos + len(answer) + width < len(content):
+        after = after.rsplit(None, 1)[0] if len(after.rsplit(None, 1)) > 1 else ""
+
+    # Inflected forms elsewhere in the sentence would give the answer away too
+    sentence = " ".join(f"{before}_____{after}".split()).replace(answer, "_____")
+    return sentence if len(sentence) > 15 else None
+
+
+def derive_candidates(story: Dict[str, Any], sources) -> List[Dict[str, str]]:
+    """
+    Answer/clue pairs for one story, from the given metadata fields. Clues quote the
+    story sentence that mentions the answer; otherwise they name its role in the
+    story and give its first akshara.
+    """
+    title = (story.get("title") or "").strip()
+    content = story.get("content") or ""
+    in_story = f"'{title}' కథలో" if title else "ఈ కథలో"
+    clue_templates = {
+        "characters": f"{in_story}ని ఒక పాత్ర",
+        "locations": f"{in_story} వచ్చే ప్రదేశం",
+        "keywords": f"{in_story}ని ముఖ్యమైన పదం",
+    }
+
+    words = {}
+    for source in sources:
+        if source == "moral":
+            moral = (story.get("moral") or "").strip()
+            blanks = 0
+            for token in re.findall(r"[\u0C00-\u0C7F]+", moral):
+                # Short words make trivial blanks
+                if blanks < MAX_MORAL_BLANKS and token not in words and is_answer_candidate(token) \
+                        and len(clean_and_split_word(token)) >= 3:
+                    words[token] = "నీతి: " + moral.replace(token, "_____", 1)
+                    blanks += 1
+            continue
+        for value in story.get(source) or []:
+            answer = value.strip() if isinstance(value, str) else ""
+            if answer in words or not is_answer_candidate(answer):
+                continue
+            first = clean_and_split_word(answer)[0]
+            words[answer] = _context_clue(content, answer) or f"{clue_templates[source]} ({first}...)"
+    return [{"answer": a, "clue": c} for a, c in words.items()]
+
+
+def build_story_puzzles(story: Dict[str, Any], attempts: int = 100) -> List[Dict[str, Any]]:
+    """
+    Puzzle rows (one per difficulty) for a story. The layout seed is derived
+    from story_id, so rebuilding the bank gives the same grids.
+    """
+    rows = []
+    story_id = story.get("story_id")
+    if not story_id:
+        return rows
+    seed = zlib.crc32(story_id.encode("utf-8"))
+    for difficulty, (sources, max_answers) in DIFFICULTIES.items():
+        words_data = derive_candidates(story, sources)[:max_answers]
+        if len(words_data) < MIN_PLACED_WORDS:
+            continue
+        layout = CrosswordGenerator().generate_layout(words_data, attempts=attempts, seed=seed)
+        if not layout or layout["placed_count"] < MIN_PLACED_WORDS:
+            continue
+        rows.append({
+            "story_id": story_id,
+            "difficulty": difficulty,
+            "title": story.get("title"),
+            "genre": story.get("normalized_genre_code") or story.get("genre"),
+            "year": _story_year(story_id),
+            "excerpt": (story.get("content") or "")[:EXCERPT_CHARS],
+            "words": words_data,
+            "layout": layout,
+        })
+    return rows
+
+
+def _story_year(story_id: str) -> Optional[int]:
+    head = story_id.split("_", 1)[0]
+    return int(head) if head.isdigit() else None
+
+
+class PuzzleBank:
+    """SQLite-backed store of precomputed puzzles. Lookups are indexed by (story_id, difficulty)."""
+
+    def __init__(self, path: str = config.PUZZLE_BANK_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # Streamlit reruns scripts on different threads; the connection is shared read-mostly
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+
+    def put_many(self, rows: List[Dict[str, Any]]):
+        now = time.time()
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO puzzles VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    r["story_id"], r["difficulty"], r["title"], r["genre"], r["year"], r["excerpt"],
+                    json.dumps(r["words"], ensure_ascii=False), json.dumps(r["layout"], ensure_ascii=False),
+                    r["layout"]["placed_count"], r["layout"]["total_count"], now,
+                )
+                for r in rows
+            ],
+        )
+        self.conn.commit()
+
+    def has_story(self, story_id: str) -> bool:
+        return self.conn.execute("SELECT 1 FROM puzzles WHERE story_id = ? LIMIT 1", (story_id,)).fetchone() is not None
+
+    def get(self, story_id: str, difficulty: str) -> Optional[Dict[str, Any]]:
+        row = self.conn.execute(
+            "SELECT * FROM puzzles WHERE story_id = ? AND difficulty = ?", (story_id, difficulty)
+        ).fetchone()
+        return self._decode(row)
+
+    def random_puzzle(self, difficulty: str, genre: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        query = "SELECT * FROM puzzles WHERE difficulty = ?"
+        params = [difficulty]
+        if genre:
+            query += " AND genre = ?"
+            params.append(genre)
+        row = self.conn.execute(query + " ORDER BY RANDOM() LIMIT 1", params).fetchone()
+        return self._decode(row)
+
+    def genres(self) -> List[str]:
+        rows = self.conn.execute("SELECT DISTINCT genre FROM puzzles WHERE genre IS NOT NULL ORDER BY genre")
+        return [r[0] for r in rows]
+
+    def count(self) -> Dict[str, int]:
+        rows = self.conn.execute("SELECT difficulty, COUNT(*) FROM puzzles GROUP BY difficulty")
+        return {r[0]: r[1] for r in rows}
+
+    def close(self):
+        self.conn.close()
+
+    def _decode(self, row) -> Optional[Dict[str, Any]]:
+        if row is None:
+            return None
+        entry = dict(row)
+        entry["words"] = json.loads(entry.pop("words_json"))
+        entry["layout"] = json.loads(entry.pop("layout_json"))
+        return entry
+
+
+def iter_archive_stories(base_dir: str, years: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+    for root, _, filenames in sorted(os.walk(base_dir)):
+        if years and os.path.basename(root) not in years:
+            continue
+        for filename in sorted(filenames):
+            if filename.startswith("చందమామ_") and filename.endswith(".json"):
+                with open(os.path.join(root, filename), "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                yield from data.get("stories", [])
+
+
+def build_bank(bank: PuzzleBank, stories: Iterator[Dict[str, Any]], workers: int = 1,
+               attempts: int = 100, rebuild: bool = False, batch_size: int = 64) -> Dict[str, int]:
+    """
+    Computes puzzles for every story not in the bank yet (all stories with `rebuild`)
+    and commits them in batches, so an interrupted build resumes where it stopped.
+    """
+    stats = {"stories": 0, "skipped": 0, "puzzles": 0}
+
+    def pending_batches():
+        batch = []
+        for story in stories:
+            stats["stories"] += 1
+            if not rebuild and story.get("story_id") and bank.has_story(story["story_id"]):
+                stats["skipped"] += 1
+                continue
+            batch.append(story)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        for batch in pending_batches():
+            if pool:
+                results = pool.map(build_story_puzzles, batch, [attempts] * len(batch))
+            else:
+                results = (build_story_puzzles(s, attempts) for s in batch)
+            rows = [row for story_rows in results for row in story_rows]
+            bank.put_many(rows)
+            stats["puzzles"] += len(rows)
+            print(f"  {stats['stories']} stories scanned, {stats['puzzles']} puzzles stored", flush=True)
+    finally:
+        if pool:
+            pool.shutdown()
+    return stats
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Precompute crossword puzzles for archive stories")
+    parser.add_argument("--base-dir", default=DEFAULT_BASE_DIR)
+    parser.add_argument("--db", default=config.PUZZLE_BANK_PATH)
+    parser.add_argument("--years", nargs="+", help="Only these year folders (e.g. 1960 1961)")
+    parser.add_argument("--workers", type=int, default=config.PUZZLE_SEARCH_WORKERS)
+    parser.add_argument("--attempts", type=int, default=100, help="Layout restarts per puzzle")
+    parser.add_argument("--rebuild", action="store_true", help="Recompute stories already in the bank")
+    args = parser.parse_args(argv)
+
+    bank = PuzzleBank(args.db)
+    start = time.perf_counter()
+    stats = build_bank(bank, iter_archive_stories(args.base_dir, args.years),
+                       workers=args.workers, attempts=args.attempts, rebuild=args.rebuild)
+    elapsed = time.perf_counter() - start
+
+    print(f"\nScanned {stats['stories']} stories ({stats['skipped']} already banked) in {elapsed:.1f}s")
+    print(f"Stored {stats['puzzles']} puzzles. Bank now holds: {bank.count()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
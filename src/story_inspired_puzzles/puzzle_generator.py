@@ -1,7 +1,123 @@
 from typing import List, Dict, Any, Tuple, Optional
+import atexit
+import contextlib
+import multiprocessing as mp
 import random
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
 from src.story_inspired_puzzles.utils import clean_and_split_word
 
+class ClusterGrid:
+    """
+    Cells of one cluster plus indexes that are updated on every placement:
+    - positions: akshara -> cells holding it (candidate crossings without scanning the grid)
+    - rows/cols: occupancy bitmaps (bit x of rows[y] is set when (x, y) is filled),
+      so neighbour checks in _check_word_fit are a few integer ANDs per word.
+    """
+    # Keeps bit positions non-negative; a cluster never grows this far from its seed
+    ORIGIN = 1024
+
+    def __init__(self):
+        self.cells = {}  # (x, y) -> akshara_string
+        self.order = []  # cells in placement order, for "what is new since" queries
+        self.positions = {}
+        self.rows = {}
+        self.cols = {}
+
+    def place(self, x, y, char):
+        if (x, y) in self.cells:
+            return
+        self.cells[(x, y)] = char
+        self.order.append((x, y, char))
+        self.positions.setdefault(char, []).append((x, y))
+        self.rows[y] = self.rows.get(y, 0) | (1 << (x + self.ORIGIN))
+        self.cols[x] = self.cols.get(x, 0) | (1 << (y + self.ORIGIN))
+
+class OccupancyCanvas:
+    """
+    Dilated occupancy of the packed master grid as a growable NumPy bool array:
+    a cell is True when it is filled or touches a filled cell (8-neighbourhood),
+    which is exactly where no cell of another cluster may go.
+    """
+    # Extra margin allocated on every growth, so the array is rarely reallocated
+    SLACK = 32
+
+    def __init__(self):
+        self.x0 = 0
+        self.y0 = 0
+        self.blocked = np.zeros((0, 0), dtype=bool)
+
+    def cover(self, min_x, max_x, min_y, max_y):
+        """Grows the array so the inclusive coordinate range is addressable."""
+        h, w = self.blocked.shape
+        if h and self.x0 <= min_x and max_x < self.x0 + w and self.y0 <= min_y and max_y < self.y0 + h:
+            return
+        if h:
+            min_x, max_x = min(min_x, self.x0), max(max_x, self.x0 + w - 1)
+            min_y, max_y = min(min_y, self.y0), max(max_y, self.y0 + h - 1)
+        x0, y0 = min_x - self.SLACK, min_y - self.SLACK
+        grown = np.zeros((max_y - y0 + 1 + self.SLACK, max_x - x0 + 1 + self.SLACK), dtype=bool)
+        grown[self.y0 - y0:self.y0 - y0 + h, self.x0 - x0:self.x0 - x0 + w] = self.blocked
+        self.blocked, self.x0, self.y0 = grown, x0, y0
+
+    def add_cells(self, xs, ys):
+        """Marks the cells and their 8 neighbours."""
+        self.cover(int(xs.min()) - 1, int(xs.max()) + 1, int(ys.min()) - 1, int(ys.max()) + 1)
+        for dy in (-1, 0, 1):
+            for dx in (-1, 0, 1):
+                self.blocked[ys + dy - self.y0, xs + dx - self.x0] = True
+
+    def legal_offsets(self, xs, ys, off_x, off_y):
+        """
+        Bool array [len(off_y), len(off_x)]: True where shifting the cells by (ox, oy)
+        touches nothing. One gather of the dilated mask at every (cell, offset) pair.
+        """
+        self.cover(int(xs.min() + off_x[0]), int(xs.max() + off_x[-1]),
+                   int(ys.min() + off_y[0]), int(ys.max() + off_y[-1]))
+        hit = self.blocked[
+            ys[:, None, None] + off_y[None, :, None] - self.y0,
+            xs[:, None, None] + off_x[None, None, :] - self.x0,
+        ]
+        return ~hit.any(axis=0)
+
+# Cluster packing searches offsets up to this ring radius around the master centre
+PACK_SEARCH_LIMIT = 60
+
+# "No area recorded yet" for SearchBound (int64-safe)
+_NO_AREA = 2 ** 62
+
+class SearchBound:
+    """
+    Best (placed count, area) recorded so far. With `shared` (a multiprocessing
+    Array of two int64s) the bound is seen by every worker process of a search.
+    """
+    def __init__(self, shared=None):
+        self._values = shared if shared is not None else [-1, _NO_AREA]
+        self._lock = shared.get_lock() if shared is not None else contextlib.nullcontext()
+
+    def get(self) -> Tuple[int, int]:
+        with self._lock:
+            return self._values[0], self._values[1]
+
+    def can_beat(self, count, area) -> bool:
+        """True if a layout with `count` words and `area` would be better than the bound."""
+        best_count, best_area = self.get()
+        return count > best_count or (count == best_count and area < best_area)
+
+    def offer(self, count, area) -> bool:
+        """Records (count, area) if it beats the bound; returns whether it did."""
+        with self._lock:
+            best_count, best_area = self._values[0], self._values[1]
+            if count > best_count or (count == best_count and area < best_area):
+                self._values[0], self._values[1] = count, area
+                return True
+            return False
+
 class CrosswordGenerator:
     def __init__(self):
         self.grid = {}  # (x, y) -> akshara_string
@@ -11,12 +127,21 @@ class CrosswordGenerator:
         self.min_y = 0
         self.max_y = 0
 
-    def generate_layout(self, word_list: List[Dict[str, str]], grid_size: int = 20, attempts: int = 20) -> Dict[str, Any]:
+    def generate_layout(self, word_list: List[Dict[str, str]], grid_size: int = 20, attempts: int = 20,
+                        workers: Optional[int] = None, deadline: Optional[float] = None,
+                        seed: Optional[int] = None) -> Dict[str, Any]:
         """
         Takes a list of dicts.
         Returns a layout with Disjoint Clusters packed efficiently.
         Rule: Each cluster must have at least 3 words.
         Constraint: Minimize area (Compactness).
+
+        Each attempt is a random restart with its own seed (seed + i). With workers > 1
+        the seeds are spread over a persistent process pool (see _search_pool) that
+        shares the best (count, area) found so far; attempts that can no longer beat it
+        stop early. Parallel search is meant for CLI runs (benchmark); interactive callers
+        search sequentially. `deadline` (seconds) caps the whole search; at least one
+        attempt always completes.
         """
         # 1. Clean words
         clean_words = []
@@ -33,162 +158,219 @@ class CrosswordGenerator:
 
         if not clean_words:
             return None
+
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        seeds = [seed + i for i in range(attempts)]
+        deadline_at = time.time() + deadline if deadline else None
+
+        best = None
+        if workers and workers > 1 and attempts > 1:
+            best = self._search_parallel(clean_words, seeds, workers, deadline_at)
+        if best is None:
+            best = self._search(clean_words, seeds, SearchBound(), deadline_at)
+        if best is None:
+            return None
+        _, _, master_grid, master_placed = best
+        return self._build_result(master_grid, master_placed, len(clean_words))
+
+    def _search(self, clean_words, seeds, bound, deadline_at=None):
+        """
+        Runs one attempt per seed and returns the best (count, area, grid, placed),
+        or None. Past the deadline it stops, unless nothing has been attempted anywhere yet.
+        """
+        best = None
+        for i, attempt_seed in enumerate(seeds):
+            if deadline_at and time.time() >= deadline_at and (i or bound.get()[0] >= 0):
+                break
+            result = self._run_attempt(clean_words, random.Random(attempt_seed), bound)
+            if result and bound.offer(result[0], result[1]):
+                best = result
+        return best
+
+    def _search_parallel(self, clean_words, seeds, workers, deadline_at=None):
+        """Spreads the seeds over the persistent pool. Returns None if the pool is unavailable."""
+        # Several small tasks per worker keep the pool balanced when some attempts prune early
+        num_tasks = min(len(seeds), workers * 4)
+        chunks = [seeds[i::num_tasks] for i in range(num_tasks)]
+        try:
+            entry = _search_pool(workers)
+            # One search at a time per pool: they share its bound
+            with entry["lock"]:
+                shared = entry["shared"]
+                with shared.get_lock():
+                    shared[0], shared[1] = -1, _NO_AREA
+                futures = [entry["pool"].submit(_search_seeds, clean_words, chunk, deadline_at) for chunk in chunks]
+                results = [f.result() for f in futures]
+        except (OSError, BrokenProcessPool) as e:
+            _discard_search_pool(workers)
+            print(f"⚠️ Parallel crossword search unavailable ({e}); searching sequentially.")
+            return None
+
+        results = [r for r in results if r]
+        if not results:
+            return None
+        # Priority: 1. Count (Must be max), 2. Area (Must be min)
+        return max(results, key=lambda r: (r[0], -r[1]))
+
+    def _run_attempt(self, clean_words, rng, bound):
+        """
+        One random restart: grow clusters, then pack them.
+        Returns (count, area, master_grid, master_placed), or None when the attempt
+        provably cannot beat `bound` (fewer words, or as many words in no less area).
+        """
+        total_words = len(clean_words)
+        # Word dicts are never mutated (placements copy them), so a shallow copy suffices
+        words_pool = list(clean_words)
+        rng.shuffle(words_pool)
         
-        best_layout = None
-        best_word_count = -1
-        min_total_area = float('inf')
+        # Phase 1: Form Clusters (Greedy Growth)
+        clusters = [] 
+        dropped = 0
         
-        # Try multiple cluster seeds
-        for _ in range(attempts):
-            import copy
-            words_pool = copy.deepcopy(clean_words)
-            random.shuffle(words_pool)
+        while words_pool:
+            # Start new cluster with longest remaining word
+            words_pool.sort(key=lambda x: x['length'], reverse=True)
+            seed = words_pool.pop(0)
             
-            # Phase 1: Form Clusters (Greedy Growth)
-            clusters = [] 
+            cluster_grid = ClusterGrid()
+            cluster_placed = []
             
-            while words_pool:
-                # Start new cluster with longest remaining word
-                words_pool.sort(key=lambda x: x['length'], reverse=True)
-                seed = words_pool.pop(0)
+            # Place seed at 0,0 across
+            self._place_word_in_dict(seed, 0, 0, 'across', cluster_grid, cluster_placed)
+            
+            # Grow cluster: place every word that fits in one pass over the pool,
+            # and repeat passes only while the previous one added something.
+            # Occupancy only grows, so a word that failed can only fit at crossings
+            # created after its last check: retries look at new cells only.
+            checked_upto = {}
+            added_something = True
+            while added_something and words_pool:
+                added_something = False
+                remaining = []
                 
-                cluster_grid = {}
-                cluster_placed = []
+                for w in words_pool:
+                    since = checked_upto.get(w['id'], 0)
+                    checked_upto[w['id']] = len(cluster_grid.order)
+                    res = self._try_fit_in_cluster(w, cluster_grid, since, rng)
+                    if res:
+                        self._place_word_in_dict(w, res[0], res[1], res[2], cluster_grid, cluster_placed)
+                        added_something = True
+                    else:
+                        remaining.append(w)
                 
-                # Place seed at 0,0 across
-                self._place_word_in_dict(seed, 0, 0, 'across', cluster_grid, cluster_placed)
+                words_pool = remaining
                 
-                # Grow cluster
-                added_something = True
-                while added_something:
-                    added_something = False
-                    to_remove_indices = []
-                    
-                    for i, w in enumerate(words_pool):
-                        res = self._try_fit_in_cluster(w, cluster_grid)
-                        if res:
-                            self._place_word_in_dict(w, res[0], res[1], res[2], cluster_grid, cluster_placed)
-                            to_remove_indices.append(i)
-                            added_something = True
-                            break 
-                    
-                    for i in sorted(to_remove_indices, reverse=True):
-                        words_pool.pop(i)
-                    
-                # Cluster finished. Check size.
-                if len(cluster_placed) >= 3:
-                     clusters.append({
-                         'grid': cluster_grid,
-                         'words': cluster_placed
-                     })
+            # Cluster finished. Check size.
+            if len(cluster_placed) >= 3:
+                 clusters.append({
+                     'grid': cluster_grid.cells,
+                     'words': cluster_placed
+                 })
+            else:
+                dropped += len(cluster_placed)
+                if not bound.can_beat(total_words - dropped, 0):
+                    return None
+        
+        # Phase 2: Pack Clusters (Bin Packing - Best Fit Area + Rotation)
+        if not clusters:
+            return None
+
+        # Calculate bounds/area for sorting
+        for c in clusters:
+            self._enrich_cluster_bounds(c)
+        
+        # Sort largest area first
+        clusters.sort(key=lambda x: x['area'], reverse=True)
+
+        # Upper bound on words this attempt can still place; lower bound on its area
+        max_count = total_words - dropped
+        first_c = clusters[0]
+        if not bound.can_beat(max_count, (first_c['w'] - 1) * (first_c['h'] - 1)):
+            return None
+        
+        master_grid = {}
+        master_placed = []
+        canvas = OccupancyCanvas()
+        
+        # Place first cluster at 0,0
+        ox = -int(first_c['w'] / 2)
+        oy = -int(first_c['h'] / 2)
+        self._merge_cluster(first_c, ox, oy, master_grid, master_placed)
+        canvas.add_cells(first_c['xs'] + ox, first_c['ys'] + oy)
+        # Master bounds (min_x, max_x, min_y, max_y), maintained on every merge
+        mb = self._shift_bounds(first_c['bounds'], ox, oy)
+        
+        for c in clusters[1:]:
+            # Try placing 'c' AND 'c_rotated'
+            c_rot = self._transpose_cluster(c)
+            self._enrich_cluster_bounds(c_rot)
             
-            # Phase 2: Pack Clusters (Bin Packing - Best Fit Area + Rotation)
-            if not clusters:
+            spot = self._find_cluster_spot([c, c_rot], canvas, mb)
+            if spot:
+                win_c, wx, wy, current_area = spot
+                self._merge_cluster(win_c, wx, wy, master_grid, master_placed)
+                canvas.add_cells(win_c['xs'] + wx, win_c['ys'] + wy)
+                wb = self._shift_bounds(win_c['bounds'], wx, wy)
+                mb = (min(mb[0], wb[0]), max(mb[1], wb[1]), min(mb[2], wb[2]), max(mb[3], wb[3]))
+            else:
+                max_count -= len(c['words'])
+                current_area = (mb[1]-mb[0]) * (mb[3]-mb[2])
+
+            # The master area only grows from here on
+            if not bound.can_beat(max_count, current_area):
+                return None
+        
+        # Score this attempt
+        count = len(master_placed)
+        final_area = (mb[1]-mb[0]) * (mb[3]-mb[2])
+        return count, final_area, master_grid, master_placed
+
+    def _find_cluster_spot(self, variants, canvas, mb):
+        """
+        Offsets are searched on square rings of even radius around the master centre,
+        up to PACK_SEARCH_LIMIT: the nearest ring with a legal offset wins, and within
+        it the smallest (new area, |x| + |y|), ties going to the first variant, then
+        smallest x, then y. Rings are checked on the occupancy canvas a window at a
+        time (radius 8, 16, 32, ...), stopping at the first window with a legal offset.
+        Returns (variant, x, y, new_area) or None.
+        """
+        center_x = (mb[0] + mb[1]) // 2
+        center_y = (mb[2] + mb[3]) // 2
+        max_radius = PACK_SEARCH_LIMIT - 2
+        radius = min(8, max_radius)
+        while True:
+            steps = np.arange(-radius, radius + 1, 2)
+            off_x = center_x + steps
+            off_y = center_y + steps
+            legal = [canvas.legal_offsets(v['xs'], v['ys'], off_x, off_y) for v in variants]
+            if any(mask.any() for mask in legal):
+                break
+            if radius >= max_radius:
+                return None
+            radius = min(radius * 2, max_radius)
+
+        ring = np.maximum(np.abs(steps)[:, None], np.abs(steps)[None, :])  # indexed [y, x]
+        nearest = min(ring[mask].min() for mask in legal if mask.any())
+
+        rows = []  # (area, dist, variant index, x, y)
+        for vi, (v, mask) in enumerate(zip(variants, legal)):
+            yi, xi = np.nonzero(mask & (ring == nearest))
+            if not len(yi):
                 continue
+            xs, ys = off_x[xi], off_y[yi]
+            width = np.maximum(mb[1], xs + v['bounds'][1]) - np.minimum(mb[0], xs + v['bounds'][0])
+            height = np.maximum(mb[3], ys + v['bounds'][3]) - np.minimum(mb[2], ys + v['bounds'][2])
+            rows.append(np.stack([width * height, np.abs(xs) + np.abs(ys), np.full_like(xs, vi), xs, ys]))
+        rows = np.concatenate(rows, axis=1)
+        area, _, vi, x, y = (int(v) for v in rows[:, np.lexsort(rows[::-1])[0]])
+        return variants[vi], x, y, area
 
-            # Calculate bounds/area for sorting
-            for c in clusters:
-                self._enrich_cluster_bounds(c)
-            
-            # Sort largest area first
-            clusters.sort(key=lambda x: x['area'], reverse=True)
-            
-            master_grid = {}
-            master_placed = []
-            
-            # Place first cluster at 0,0
-            first_c = clusters[0]
-            ox = -int(first_c['w'] / 2)
-            oy = -int(first_c['h'] / 2)
-            self._merge_cluster(first_c, ox, oy, master_grid, master_placed)
-            
-            for c in clusters[1:]:
-                # Try placing 'c' AND 'c_rotated'
-                # Find best spot overall
-                
-                c_rot = self._transpose_cluster(c)
-                self._enrich_cluster_bounds(c_rot)
-                
-                candidates = [c, c_rot]
-                best_variant_spot = None # (cluster_variant, x, y)
-                best_variant_score = (float('inf'), float('inf')) # (Area, Dist)
-                
-                mb_min_x, mb_max_x, mb_min_y, mb_max_y = self._get_bounds(master_grid)
-                center_x = (mb_min_x + mb_max_x) // 2
-                center_y = (mb_min_y + mb_max_y) // 2
-                
-                # Search loop
-                search_limit = 60
-                
-                for r in range(0, search_limit, 2):
-                    found_in_ring = False
-                    
-                    for variant in candidates:
-                        # Optimization: if current best is area=0 (impossible), keep searching
-                        # If we found a good fit in previous ring, we might skip checking this variant if its dims are huge? No.
-                        
-                        limit_r_check = max(variant['w'], variant['h']) + r + 5 # Dynamic limit based on r roughly? 
-                        
-                        for x in range(center_x - r, center_x + r + 1, 2):
-                            for y in range(center_y - r, center_y + r + 1, 2):
-                                if abs(x - center_x) != r and abs(y - center_y) != r: continue
-                                
-                                if self._can_place_cluster(variant, x, y, master_grid):
-                                    # Calc Metric
-                                    nb_min_x = min(mb_min_x, x + variant['bounds'][0])
-                                    nb_max_x = max(mb_max_x, x + variant['bounds'][1])
-                                    nb_min_y = min(mb_min_y, y + variant['bounds'][2])
-                                    nb_max_y = max(mb_max_y, y + variant['bounds'][3])
-                                    
-                                    new_area = (nb_max_x - nb_min_x) * (nb_max_y - nb_min_y)
-                                    dist = abs(x) + abs(y)
-                                    
-                                    score = (new_area, dist)
-                                    if score < best_variant_score:
-                                        best_variant_score = score
-                                        best_variant_spot = (variant, x, y)
-                                    
-                                    found_in_ring = True
-                    
-                    if found_in_ring and best_variant_spot:
-                        # We found something in this ring. 
-                        # To ensure GLOBAL best in this expanding wavefront, we finish the ring.
-                        # Maybe break outer loop? 
-                        # Yes, generally first ring hit is best for compactness.
-                        break
-                
-                if best_variant_spot:
-                    win_c, wx, wy = best_variant_spot
-                    self._merge_cluster(win_c, wx, wy, master_grid, master_placed)
-                
-            
-            # Score this attempt
-            count = len(master_placed)
-            
-            # Calculate final area
-            fb = self._get_bounds(master_grid)
-            final_area = (fb[1]-fb[0]) * (fb[3]-fb[2])
-            
-            # Priority: 1. Count (Must be max), 2. Area (Must be min)
-            if count > best_word_count:
-                best_word_count = count
-                min_total_area = final_area
-                best_layout = self._build_result(master_grid, master_placed, len(clean_words))
-            elif count == best_word_count:
-                if final_area < min_total_area:
-                    min_total_area = final_area
-                    best_layout = self._build_result(master_grid, master_placed, len(clean_words))
-            
-            if best_word_count >= len(clean_words) and attempts > 5:  
-                # If we got all words, maybe continue to find tighter packing?
-                # But speed matters.
-                pass
-                
-        return best_layout
+    def _shift_bounds(self, bounds, ox, oy):
+        return (bounds[0] + ox, bounds[1] + ox, bounds[2] + oy, bounds[3] + oy)
 
     def _transpose_cluster(self, cluster):
         # Swap x,y and directions
-        import copy
         new_c = { 'grid': {}, 'words': [] }
         
         # Transpose Grid: (x,y) -> (y,x)
@@ -197,7 +379,7 @@ class CrosswordGenerator:
             
         # Transpose Words
         for w in cluster['words']:
-            nw = copy.deepcopy(w)
+            nw = dict(w)
             nw['x'], nw['y'] = w['y'], w['x']
             nw['direction'] = 'down' if w['direction'] == 'across' else 'across'
             new_c['words'].append(nw)
@@ -205,7 +387,10 @@ class CrosswordGenerator:
         return new_c
 
     def _enrich_cluster_bounds(self, c):
-        c['bounds'] = self._get_bounds(c['grid']) 
+        # Cell coordinates as arrays, for the occupancy canvas
+        c['xs'] = np.fromiter((x for x, _ in c['grid']), dtype=np.int64, count=len(c['grid']))
+        c['ys'] = np.fromiter((y for _, y in c['grid']), dtype=np.int64, count=len(c['grid']))
+        c['bounds'] = (int(c['xs'].min()), int(c['xs'].max()), int(c['ys'].min()), int(c['ys'].max()))
         c['w'] = c['bounds'][1] - c['bounds'][0] + 1
         c['h'] = c['bounds'][3] - c['bounds'][2] + 1
         c['area'] = c['w'] * c['h']
@@ -214,71 +399,76 @@ class CrosswordGenerator:
         word = word_obj['clean_word']
         for i, char in enumerate(word):
             cx, cy = (x + i, y) if direction == 'across' else (x, y + i)
-            grid[(cx, cy)] = char
-        import copy
-        w_copy = copy.deepcopy(word_obj)
+            grid.place(cx, cy, char)
+        w_copy = dict(word_obj)
         w_copy['x'] = x
         w_copy['y'] = y
         w_copy['direction'] = direction
         placed_list.append(w_copy)
 
-    def _try_fit_in_cluster(self, word_obj, grid):
+    def _try_fit_in_cluster(self, word_obj, grid, since=0, rng=random):
+        """
+        Finds crossings for the word. Only cells holding one of its aksharas are
+        considered; with `since`, only cells placed after grid.order[since].
+        """
         word = word_obj['clean_word']
+        if since:
+            crossings = [
+                (i, gx, gy)
+                for gx, gy, gchar in grid.order[since:]
+                for i, char in enumerate(word) if char == gchar
+            ]
+        else:
+            crossings = [
+                (i, gx, gy)
+                for i, char in enumerate(word)
+                for gx, gy in grid.positions.get(char, ())
+            ]
         potential = []
-        for i, char in enumerate(word):
-            for (gx, gy), gchar in grid.items():
-                if gchar == char:
-                    sx, sy = gx - i, gy
-                    if self._check_word_fit(word, sx, sy, 'across', grid):
-                        potential.append((sx, sy, 'across'))
-                    sx, sy = gx, gy - i
-                    if self._check_word_fit(word, sx, sy, 'down', grid):
-                        potential.append((sx, sy, 'down'))
+        for i, gx, gy in crossings:
+            sx, sy = gx - i, gy
+            if self._check_word_fit(word, sx, sy, 'across', grid):
+                potential.append((sx, sy, 'across'))
+            sx, sy = gx, gy - i
+            if self._check_word_fit(word, sx, sy, 'down', grid):
+                potential.append((sx, sy, 'down'))
         if not potential: return None
-        return random.choice(potential)
+        return rng.choice(potential)
 
     def _check_word_fit(self, word, sx, sy, direction, grid):
-        for i, char in enumerate(word):
-            cx, cy = (sx + i, sy) if direction == 'across' else (sx, sy + i)
-            if (cx, cy) in grid:
-                if grid[(cx, cy)] != char: return False
-            else:
-                if direction == 'across':
-                    neighbors = [(cx, cy-1), (cx, cy+1)]
-                else:
-                    neighbors = [(cx-1, cy), (cx+1, cy)]
-                for nx, ny in neighbors:
-                    if (nx, ny) in grid: return False
-        bx, by = (sx - 1, sy) if direction == 'across' else (sx, sy - 1)
-        if (bx, by) in grid: return False
-        ex, ey = (sx + len(word), sy) if direction == 'across' else (sx, sy + len(word))
-        if (ex, ey) in grid: return False
-        return True
+        if direction == 'across':
+            lines, line_key, start = grid.rows, sy, sx
+        else:
+            lines, line_key, start = grid.cols, sx, sy
+        length = len(word)
+        shift = start + ClusterGrid.ORIGIN
+        span = ((1 << length) - 1) << shift
 
-    def _get_bounds(self, grid):
-        if not grid: return (0,0,0,0)
-        xs = [k[0] for k in grid]
-        ys = [k[1] for k in grid]
-        return (min(xs), max(xs), min(ys), max(ys))
-
-    def _can_place_cluster(self, cluster, ox, oy, master_grid):
-        grid = cluster['grid']
-        for (cx, cy) in grid:
-            mx, my = cx + ox, cy + oy
-            check_points = [
-                (mx, my), (mx+1, my), (mx-1, my), (mx, my+1), (mx, my-1),
-                (mx+1, my+1), (mx-1, my-1), (mx+1, my-1), (mx-1, my+1) 
-            ]
-            for p in check_points:
-                if p in master_grid: return False
+        line = lines.get(line_key, 0)
+        # Cells just before and after the word must be empty
+        if line & ((1 << (shift - 1)) | (1 << (shift + length))): return False
+
+        occupied = line & span
+        # Empty cells of the word must not touch parallel words on either side
+        neighbours = lines.get(line_key - 1, 0) | lines.get(line_key + 1, 0)
+        if neighbours & span & ~occupied: return False
+
+        # Crossed cells must already hold the same akshara
+        bits = occupied >> shift
+        i = 0
+        while bits:
+            if bits & 1:
+                cell = (sx + i, sy) if direction == 'across' else (sx, sy + i)
+                if grid.cells[cell] != word[i]: return False
+            bits >>= 1
+            i += 1
         return True
 
     def _merge_cluster(self, cluster, ox, oy, master_grid, master_placed):
         for (cx, cy), char in cluster['grid'].items():
             master_grid[(cx + ox, cy + oy)] = char
         for w in cluster['words']:
-            import copy
-            nw = copy.deepcopy(w)
+            nw = dict(w)
             nw['x'] += ox
             nw['y'] += oy
             master_placed.append(nw)
@@ -318,3 +508,57 @@ class CrosswordGenerator:
             'placed_count': len(final_words),
             'total_count': total_input_count
         }
+
+# Persistent search pools by worker count. Workers are spawned, never forked: a fork of a
+# multithreaded parent (the Streamlit server, torch) can inherit locks held by other threads.
+# Started once and reused, so a search does not pay process startup.
+_SEARCH_POOLS: Dict[int, Dict[str, Any]] = {}
+_SEARCH_POOLS_LOCK = threading.Lock()
+
+def _search_pool(workers: int) -> Dict[str, Any]:
+    """The pool for `workers` processes with its shared bound and search lock, started on first use."""
+    with _SEARCH_POOLS_LOCK:
+        entry = _SEARCH_POOLS.get(workers)
+        if entry is None:
+            ctx = mp.get_context("spawn")
+            shared = ctx.Array('q', [-1, _NO_AREA])
+            pool = ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                                       initializer=_init_search_worker, initargs=(shared,))
+            entry = {"pool": pool, "shared": shared, "lock": threading.Lock()}
+            _SEARCH_POOLS[workers] = entry
+        return entry
+
+def _discard_search_pool(workers: int):
+    with _SEARCH_POOLS_LOCK:
+        entry = _SEARCH_POOLS.pop(workers, None)
+    if entry is not None:
+        entry["pool"].shutdown(wait=False, cancel_futures=True)
+
+def start_search_pool(workers: int):
+    """Starts the pool's worker processes now, so the first timed search does not include spawning them."""
+    try:
+        pool = _search_pool(workers)["pool"]
+        for future in [pool.submit(_ping) for _ in range(workers)]:
+            future.result()
+    except (OSError, BrokenProcessPool) as e:
+        _discard_search_pool(workers)
+        print(f"⚠️ Could not start crossword search workers ({e}).")
+
+def shutdown_search_pools():
+    for workers in list(_SEARCH_POOLS):
+        _discard_search_pool(workers)
+
+atexit.register(shutdown_search_pools)
+
+# Process-pool workers: the shared bound is inherited once per worker process
+_WORKER_BOUND = None
+
+def _ping():
+    return True
+
+def _init_search_worker(shared):
+    global _WORKER_BOUND
+    _WORKER_BOUND = SearchBound(shared)
+
+def _search_seeds(clean_words, seeds, deadline_at):
+    return CrosswordGenerator()._search(clean_words, seeds, _WORKER_BOUND, deadline_at)
@@ -198,8 +198,12 @@ if st.session_state.story_text:
                 
                 # 2. Generate Layout via Python Algorithm
                 generator = CrosswordGenerator()
-                # Run with 100 attempts for better density
-                layout = generator.generate_layout(words_data, attempts=100)
+                # Sequential seeded restarts, capped by a deadline for interactive use
+                layout = generator.generate_layout(
+                    words_data,
+                    attempts=config.PUZZLE_SEARCH_ATTEMPTS,
+                    deadline=config.PUZZLE_SEARCH_DEADLINE_SECONDS,
+                )
                 
                 if layout:
                     st.session_state.puzzle_layout = layout
@@ -13,7 +13,8 @@ load_dotenv()
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from src import config
-from src.local_llm_multi import generate_response_multi
+from src import local_llm_multi
+from src.prompt_runner import run_concurrently
 from src import search_utils
 from src import rag
 from qdrant_client import QdrantClient
@@ -390,7 +391,7 @@ st.title("🧪 Prompt Playground & Story Lab")
 st.caption("A/B Testing Laboratory with Data-Driven Facets")
 
 # Model Selection
-model_options = list(set([config.LLM_MODEL_ID] + config.COUNCIL_MODELS))
+model_options = list(dict.fromkeys([config.LLM_MODEL_ID] + config.AVAILABLE_MODELS))
 selected_model = st.selectbox("Select Model", model_options, index=model_options.index(config.LLM_MODEL_ID) if config.LLM_MODEL_ID in model_options else 0)
 
 # --- Faceted Inputs ---
@@ -498,32 +499,52 @@ if st.button("🚀 Run All Prompts", type="primary"):
     res_r2 = st.columns(3)
     all_res_cols = res_r1 + res_r2
     
+    jobs = []
+    status_slots, output_slots = [], []
     for i, variant in enumerate(VARIANTS):
+        final_user_prompt = variant["template"]
+        # Robust replacement
+        for k, v in variables.items():
+            key = "{" + k + "}"
+            if key in final_user_prompt:
+                final_user_prompt = final_user_prompt.replace(key, str(v))
+        jobs.append({"name": variant["name"], "kwargs": {
+            "model_id": selected_model,
+            "prompt": final_user_prompt,
+            "system_prompt": "You are a creative storyteller.",
+            "max_tokens": 2500,
+            "temperature": 0.7,
+        }})
         with all_res_cols[i]:
-            st.info(f"Generating {variant['name']}...")
-            
-            final_user_prompt = variant["template"]
-            
-            try:
-                # Robust replacement
-                for k, v in variables.items():
-                    key = "{" + k + "}"
-                    if key in final_user_prompt:
-                        final_user_prompt = final_user_prompt.replace(key, str(v))
-                
-                start_time = time.time()
-                response = generate_response_multi(
-                    model_id=selected_model,
-                    prompt=final_user_prompt,
-                    system_prompt="You are a creative storyteller.",
-                    max_tokens=2500,
-                    temperature=0.7
-                )
-                end_time = time.time()
-                duration = end_time - start_time
-                
-                st.success(f"Time: {duration:.2f}s")
-                st.text_area(f"Output ({variant['name']})", value=response, height=600, key=f"out_{i}")
-                
-            except Exception as e:
-                st.error(f"Error: {e}")
+            st.markdown(f"**{variant['name']}**")
+            status_slots.append(st.empty())
+            output_slots.append(st.empty())
+            status_slots[i].info("Generating...")
+    
+    # All variants start at once; worker threads only queue text, this thread draws it
+    round_start = time.perf_counter()
+    streamed = [""] * len(jobs)
+    last_draw = [0.0] * len(jobs)
+    results = [None] * len(jobs)
+    for kind, i, payload in run_concurrently(jobs, local_llm_multi.stream, config.PLAYGROUND_MAX_CONCURRENCY):
+        if kind == "delta":
+            streamed[i] += payload
+            now = time.perf_counter()
+            if now - last_draw[i] >= 0.15:  # throttle redraws; six streams share this thread
+                last_draw[i] = now
+                output_slots[i].markdown(streamed[i] + " ▌")
+            continue
+        
+        res = results[i] = payload
+        if res.error:
+            status_slots[i].error(f"Error: {res.error}")
+        else:
+            tps = f"{res.tokens_per_sec:.1f} tok/s" if res.tokens_per_sec else "n/a"
+            ttft = f"{res.ttft:.2f}s" if res.ttft is not None else "n/a"
+            status_slots[i].success(f"TTFT: {ttft} | Total: {res.latency:.2f}s | {tps} ({res.output_tokens} tokens)")
+        with output_slots[i].container():
+            st.text_area(f"Output ({res.name})", value=res.text, height=600, key=f"out_{i}")
+    
+    round_time = time.perf_counter() - round_start
+    sequential_time = sum(r.latency for r in results if r)
+    st.caption(f"Round wall time: {round_time:.2f}s (sequential would be ~{sequential_time:.2f}s)")
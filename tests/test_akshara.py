@@ -0,0 +1,70 @@
+import sys
+import os
+import glob
+import json
+import random
+import unittest
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.akshara import split_aksharas, split_word, split_many, count_many, count_aksharas
+from src.story_inspired_puzzles.utils import clean_and_split_word
+
+def reference_aksharas(text):
+    """The original character-walk segmentation, kept as the oracle."""
+    aksharas = []
+    current = ""
+    for char in text:
+        if not current:
+            current += char
+            continue
+        codepoint = ord(char)
+        if not (0x0C00 <= codepoint <= 0x0C7F):
+            aksharas.append(current)
+            current = char
+            continue
+        is_mark = (0x0C01 <= codepoint <= 0x0C03) or (0x0C3E <= codepoint <= 0x0C56) or (0x0C62 <= codepoint <= 0x0C63)
+        if is_mark or codepoint == 0x0C4D:
+            current += char
+        elif ord(current[-1]) == 0x0C4D:
+            current += char
+        else:
+            aksharas.append(current)
+            current = char
+    if current:
+        aksharas.append(current)
+    return aksharas
+
+class TestAkshara(unittest.TestCase):
+    def test_known_words(self):
+        self.assertEqual(split_aksharas("రాముడు"), ["రా", "ము", "డు"])
+        self.assertEqual(split_aksharas("క్షేమం"), ["క్షే", "మం"])
+        self.assertEqual(split_aksharas("స్త్రీ"), ["స్త్రీ"])
+        self.assertEqual(split_aksharas(""), [])
+        self.assertEqual(clean_and_split_word(" సీత "), ["సీ", "త"])
+        self.assertEqual(split_word("లంక"), ("లం", "క"))
+
+    def test_matches_reference_on_random_strings(self):
+        """Regex engine must reproduce the original walk exactly, including odd inputs."""
+        rng = random.Random(7)
+        alphabet = [chr(cp) for cp in range(0x0C00, 0x0C80)] + list(" .,!aZ\n")
+        batch = []
+        for _ in range(2000):
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+            self.assertEqual(split_aksharas(text), reference_aksharas(text), repr(text))
+            self.assertEqual(count_aksharas(text), len(reference_aksharas(text)), repr(text))
+            batch.append(text)
+        self.assertEqual(count_many(batch), [len(reference_aksharas(t)) for t in batch])
+
+    def test_matches_reference_on_archive(self):
+        files = sorted(glob.glob(os.path.join(os.path.dirname(__file__), '..', 'data', '1947-2012', '1957', '*.json')))[:2]
+        texts = []
+        for path in files:
+            with open(path, encoding="utf-8") as f:
+                texts.extend(s.get("content", "") for s in json.load(f).get("stories", []))
+        for text, segments, count in zip(texts, split_many(texts), count_many(texts)):
+            self.assertEqual(segments, reference_aksharas(text))
+            self.assertEqual(count, count_aksharas(text))
+        print(f"\n[PASSED] Akshara engine matches reference on {len(texts)} archive stories")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import sys
+import os
+import json
+import unittest
+import tempfile
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from types import SimpleNamespace as NS
+from src import local_llm_multi
+from src.scripts.batch_generate import generate_text, load_rows, run_batch
+
+class TestBatchGenerate(unittest.TestCase):
+    def test_batch_writes_incrementally_and_resumes(self):
+        """Rows are read from CSV, results appended as JSONL, and a re-run only retries failed rows."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            input_path = os.path.join(tmp_dir, "rows.csv")
+            with open(input_path, "w", encoding="utf-8") as f:
+                f.write("id,genre,keywords,content_type,num_chapters\n"
+                        "a,Folklore,అడవి;చిలుక,SINGLE,\n"
+                        "b,Adventure,నిధి,SERIAL,2\n"
+                        "c,Moral,,SINGLE,\n")
+            rows = load_rows(input_path)
+            self.assertEqual(rows[0]["facets"]["keywords"], ["అడవి", "చిలుక"])
+            self.assertEqual(rows[1]["facets"]["num_chapters"], 2)
+
+            calls = []
+            broken = {"c"}
+            def fake_generate(facets, context_text, llm_params):
+                calls.append(facets["genre"])
+                if facets["genre"] == "Moral" and "c" in broken:
+                    raise RuntimeError("timeout")
+                return f"{facets['genre']} కథ ({context_text})"
+
+            output_path = os.path.join(tmp_dir, "out.jsonl")
+            params = {"model": "fake", "priority": 10}
+            def retrieve(facets):
+                return "సందర్భం", ["1960_01_01"]
+            totals = run_batch(rows, output_path, params, retrieve, fake_generate, workers=3)
+            self.assertEqual((totals["ok"], totals["failed"]), (2, 1))
+
+            # Crash leftovers: a torn final line is ignored on resume
+            with open(output_path, "a", encoding="utf-8") as f:
+                f.write('{"row_id": "c", "sta')
+            broken.clear()
+            calls.clear()
+            totals = run_batch(rows, output_path, params, retrieve, fake_generate, workers=3)
+            self.assertEqual(totals, {"ok": 1, "failed": 0, "skipped": 2})
+            self.assertEqual(calls, ["Moral"])
+
+            with open(output_path, "r", encoding="utf-8") as f:
+                records = [json.loads(line) for line in f if line.strip().endswith("}")]
+            ok = {r["row_id"]: r for r in records if r["status"] == "ok"}
+            self.assertEqual(sorted(ok), ["a", "b", "c"])
+            self.assertEqual(ok["a"]["context_story_ids"], ["1960_01_01"])
+            self.assertIn("సందర్భం", ok["a"]["story"])
+        print("\n[PASSED] Batch Generation Resume")
+
+    def test_error_mid_stream_fails_the_row(self):
+        """A provider error after the first chunk is a failed row, not a story with error text inside."""
+        def create(model, messages, max_tokens, temperature, stream, **kwargs):
+            def chunks():
+                yield NS(choices=[NS(delta=NS(content="ఒకానొకప్పుడు"))])
+                raise RuntimeError("connection reset")
+            return chunks()
+
+        local_llm_multi._client_instances["fake/broken-stream"] = ("openai", NS(chat=NS(completions=NS(create=create))))
+        rows = [{"row_id": "single", "facets": {"genre": "Folklore", "content_type": "SINGLE"}},
+                {"row_id": "serial", "facets": {"genre": "Adventure", "content_type": "SERIAL", "num_chapters": 2}}]
+        try:
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                output_path = os.path.join(tmp_dir, "out.jsonl")
+                totals = run_batch(rows, output_path, {"model": "fake/broken-stream"}, generate_fn=generate_text,
+                                   workers=2)
+                self.assertEqual((totals["ok"], totals["failed"]), (0, 2))
+                with open(output_path, "r", encoding="utf-8") as f:
+                    records = [json.loads(line) for line in f]
+                self.assertEqual({r["status"] for r in records}, {"error"})
+                self.assertTrue(all("connection reset" in r["error"] for r in records))
+        finally:
+            local_llm_multi._client_instances.pop("fake/broken-stream", None)
+        print("[PASSED] Batch Mid-Stream Error")
+
+    def test_interrupt_leaves_no_queued_rows(self):
+        """Rows are submitted through a small window, so Ctrl-C does not keep generating the rest."""
+        import threading
+        calls = []
+        lock = threading.Lock()
+        def fake_generate(facets, context_text, llm_params):
+            with lock:
+                calls.append(facets["genre"])
+                if len(calls) == 3:
+                    raise KeyboardInterrupt
+            return "కథ"
+
+        rows = [{"row_id": str(i), "facets": {"genre": str(i), "content_type": "SINGLE"}} for i in range(200)]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with self.assertRaises(KeyboardInterrupt):
+                run_batch(rows, os.path.join(tmp_dir, "out.jsonl"), {"model": "fake"}, generate_fn=fake_generate,
+                          workers=2)
+        self.assertLessEqual(len(calls), 2 * 2 + 2)
+        print("[PASSED] Batch Interrupt")
+
+if __name__ == '__main__':
+    unittest.main()
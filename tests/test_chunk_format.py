@@ -0,0 +1,60 @@
+import sys
+import os
+import unittest
+import tempfile
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.chunk_format import write_chunk_file, iter_chunk_file
+from src.story_embedder import data_loader
+
+def make_chunks():
+    chunks = []
+    for story, count in (("1960_01_01", 3), ("1960_01_02", 2)):
+        for i in range(count):
+            chunks.append({
+                "story_id": story, "chunk_id": f"{story}_{i:02d}", "chunk_index": i,
+                "year": "1960", "month": "01", "title": f"కథ {story}", "author": "రచయిత",
+                "keywords": ["రాజు", "అడవి"], "source_path": "1960/చందమామ_1960_01.json",
+                "text": f"పేరా {i}",
+            })
+    return chunks
+
+class TestChunkFormat(unittest.TestCase):
+    def test_jsonl_round_trip_and_scan(self):
+        """JSON Lines files store story metadata once, stream back identical chunks and win over stale .json files."""
+        chunks = make_chunks()
+        with tempfile.TemporaryDirectory() as base_dir:
+            os.makedirs(os.path.join(base_dir, "1960"))
+            json_path = os.path.join(base_dir, "1960", "చందమామ_1960_01_chunks.json")
+            jsonl_path = os.path.join(base_dir, "1960", "చందమామ_1960_01_chunks.jsonl")
+            write_chunk_file(json_path, chunks, "json")
+            write_chunk_file(jsonl_path, chunks, "jsonl")
+            os.utime(json_path, (1, 1))
+
+            with open(jsonl_path, "r", encoding="utf-8") as f:
+                lines = f.read().splitlines()
+            self.assertEqual(len(lines), 1 + 2 + 5)  # header, two stories, five chunks
+            self.assertEqual(sum("రచయిత" in line for line in lines), 2)
+            self.assertLess(os.path.getsize(jsonl_path), os.path.getsize(json_path))
+
+            self.assertEqual(list(iter_chunk_file(jsonl_path)), chunks)
+            self.assertEqual(data_loader.load_raw_chunks(jsonl_path), chunks)
+            self.assertEqual(data_loader.scan_chunk_files(base_dir), [jsonl_path])
+            self.assertEqual(data_loader.find_chunk_file("1960", "01", base_dir), jsonl_path)
+            self.assertIsNone(data_loader.find_chunk_file("1960", "02", base_dir))
+        print("\n[PASSED] JSON Lines Chunk Format")
+
+    def test_zstd_round_trip(self):
+        try:
+            import zstandard  # noqa: F401
+        except ImportError:
+            self.skipTest("zstandard not installed")
+        chunks = make_chunks()
+        with tempfile.TemporaryDirectory() as base_dir:
+            path = os.path.join(base_dir, "చందమామ_1960_01_chunks.jsonl.zst")
+            write_chunk_file(path, chunks, "jsonl.zst")
+            self.assertEqual(list(iter_chunk_file(path)), chunks)
+        print("[PASSED] Compressed Chunk Format")
+
+if __name__ == '__main__':
+    unittest.main()
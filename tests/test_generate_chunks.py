@@ -0,0 +1,118 @@
+import sys
+import os
+import unittest
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.generate_chunks import TokenCounter, chunk_story, split_sentences, split_large_paragraph
+
+class FakeTokenizer:
+    """Stands in for a HF fast tokenizer: one token per character, records batch calls."""
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, texts, add_special_tokens=False, return_attention_mask=False):
+        self.batches.append(list(texts))
+        return {"input_ids": [list(range(len(t))) for t in texts]}
+
+class TestGenerateChunks(unittest.TestCase):
+    def test_tokenizer_counts_are_batched_and_bound_chunks(self):
+        """Paragraphs are tokenized once, in one batch, and chunks respect the real-token cap."""
+        counter = TokenCounter("tokenizer")
+        fake = FakeTokenizer()
+        counter._tokenizer = fake
+        target_min, target_max, hard_min, hard_max = counter.limits()
+        self.assertLessEqual(hard_max, 512)
+
+        paragraphs = [("కథ " * (20 + i * 3)).strip() for i in range(30)]
+        story = {"story_id": "1960_01_01", "title": "t", "content": "\n".join(paragraphs)}
+        chunks = chunk_story(story, "1960", "01", "1960/x.json", counter)
+
+        self.assertEqual(len(fake.batches), 1)
+        self.assertEqual(sorted(fake.batches[0]), sorted(set(paragraphs)))
+        self.assertGreater(len(chunks), 1)
+        for c in chunks:
+            self.assertLessEqual(sum(len(p) for p in c["text"].split("\n")), hard_max)
+
+        # Estimate mode keeps the configured limits and needs no model
+        self.assertEqual(TokenCounter("estimate").count("ఒక రోజు"), 4)
+        with self.assertRaises(ValueError):
+            TokenCounter("words")
+        print("\n[PASSED] Tokenizer Chunk Sizing")
+
+    def test_sentence_splitter_handles_danda_and_long_sentences(self):
+        """Splits on . ? ! । ॥ losslessly, and parts never exceed the cap (even without sentence marks)."""
+        text = 'రాజు వచ్చాడు। "ఏమిటి?" అన్నాడు. ఇంకా ఏమీ లేదు॥ చివర'
+        sentences = split_sentences(text)
+        self.assertEqual(sentences, ['రాజు వచ్చాడు।', ' "ఏమిటి?"', ' అన్నాడు.', ' ఇంకా ఏమీ లేదు॥', ' చివర'])
+        self.assertEqual("".join(sentences), text)
+
+        counter = TokenCounter("estimate")
+        long_text = "ఒక రాజు అడవికి వెళ్ళాడు। " * 200 + "పదం " * 500
+        parts = split_large_paragraph(long_text, 100, counter)
+        self.assertTrue(all(counter.count(p) <= 100 for p in parts))
+        self.assertEqual("".join(long_text.split()), "".join("".join(parts).split()))
+        print("[PASSED] Telugu Sentence Splitter")
+
+    def test_window_chunks_are_offsets_with_exact_overlap(self):
+        """Window chunks store offsets that resolve against the archive, with a fixed token stride."""
+        import json
+        import tempfile
+        from src.generate_chunks import window_chunk_story
+        from src.chunk_offsets import resolve_chunk_texts
+
+        words = [f"పదం{i}" for i in range(250)]
+        content = "  " + " ".join(words[:120]) + "\n\n" + " ".join(words[120:])
+        story = {"story_id": "1960_01_01", "title": "t", "content": content}
+        counter = TokenCounter("estimate")  # two tokens per word
+        chunks = window_chunk_story(story, "1960", "01", "1960/chandamama_1960_01.json", counter,
+                                    window_tokens=100, stride_tokens=80)
+        self.assertTrue(all("text" not in c for c in chunks))
+
+        with tempfile.TemporaryDirectory() as base_dir:
+            os.makedirs(os.path.join(base_dir, "1960"))
+            with open(os.path.join(base_dir, "1960", "chandamama_1960_01.json"), "w", encoding="utf-8") as f:
+                json.dump({"stories": [story]}, f, ensure_ascii=False)
+            texts = [c["text"].split() for c in resolve_chunk_texts(chunks, base_dir)]
+
+        # 50-word windows every 40 words: 10 words of overlap, last window ends at the story end
+        self.assertEqual(texts[0], words[:50])
+        self.assertEqual(texts[1], words[40:90])
+        self.assertEqual(texts[-1][-1], words[-1])
+        self.assertEqual(len(chunks), 6)
+        print("[PASSED] Sliding Window Offsets")
+
+    def test_rewrite_replaces_legacy_format_and_counts_once(self):
+        """Regenerating an issue as JSONL drops its old _chunks.json; count_chunks reads one file per issue."""
+        import io
+        import json
+        import tempfile
+        from contextlib import redirect_stdout
+        from unittest import mock
+        from src.generate_chunks import process_file
+        from utils import count_chunks
+
+        story = {"story_id": "1960_01_01", "title": "t", "content": "ఒక కథ.\n\nరెండవ పేరా."}
+        with tempfile.TemporaryDirectory() as tmp:
+            src_path = os.path.join(tmp, "1960", "చందమామ_1960_01.json")
+            os.makedirs(os.path.dirname(src_path))
+            with open(src_path, "w", encoding="utf-8") as f:
+                json.dump({"stories": [story]}, f, ensure_ascii=False)
+            out_dir = os.path.join(tmp, "chunks")
+
+            process_file(src_path, output_dir=out_dir, fmt="json")
+            legacy = os.path.join(out_dir, "1960", "చందమామ_1960_01_chunks.json")
+            self.assertTrue(os.path.exists(legacy))
+
+            # A legacy copy left beside a newer JSONL file is not counted twice
+            process_file(src_path, output_dir=out_dir, fmt="jsonl")
+            self.assertFalse(os.path.exists(legacy))
+            with open(legacy, "w", encoding="utf-8") as f:
+                json.dump([{"chunk_id": "old", "text": "x"}] * 5, f)
+            out = io.StringIO()
+            with mock.patch.object(count_chunks, "CHUNKS_DIR", out_dir), redirect_stdout(out):
+                count_chunks.count_chunks()
+            self.assertIn("Total Files Scanned: 1", out.getvalue())
+        print("[PASSED] Legacy Chunk Format Replaced")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+import sys
+import os
+import unittest
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.perf.import_profiler import profile_target, compare_to_baseline
+
+class TestImportProfiler(unittest.TestCase):
+    def test_isolated_profile_and_baseline(self):
+        """Profiles a stdlib import in a child interpreter and flags regressions."""
+        result = profile_target(["json"])
+        self.assertIsNone(result["error"])
+        self.assertGreaterEqual(result["wall_s"], 0)
+        self.assertGreater(result["tracemalloc_peak_bytes"], 0)
+        self.assertIn("rss_delta_bytes", result)
+
+        # Wall time and RSS come from a run without tracemalloc; the peak from a separate traced run
+        from src.perf.import_profiler import _run_child
+        self.assertNotIn("tracemalloc_peak_bytes", _run_child(["json"], "time", 60))
+        self.assertNotIn("wall_s", _run_child(["json"], "trace", 60))
+
+        failed = profile_target(["module_that_does_not_exist"])
+        self.assertIn("ModuleNotFoundError", failed["error"])
+
+        baseline = [{"target": "x", "wall_s": 1.0, "rss_delta_bytes": 0, "tracemalloc_peak_bytes": 0, "error": None}]
+        slower = [{"target": "x", "wall_s": 2.0, "rss_delta_bytes": 0, "tracemalloc_peak_bytes": 0, "error": None}]
+        self.assertEqual(len(compare_to_baseline(slower, baseline, 0.25)), 1)
+        self.assertEqual(compare_to_baseline(baseline, baseline, 0.25), [])
+        print("\n[PASSED] Import Profiler")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import sys
+import os
+import json
+import unittest
+from types import SimpleNamespace as NS
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src import config, local_llm_multi
+from src.local_provider import LocalLLMServer
+from src.perf.loadtest import DEFAULT_FACETS, compare_to_baseline, percentile, run_load_test
+
+class TestLoadTest(unittest.TestCase):
+    def tearDown(self):
+        local_llm_multi._client_instances.clear()
+
+    def test_concurrent_users_report_stage_percentiles(self):
+        """Virtual users drive retrieval, context and generation against the stand-in; the report is JSON-ready."""
+        self.assertEqual(percentile([1, 2, 3, 4], 50), 2)
+        self.assertEqual(percentile([1, 2, 3, 4], 99), 4)
+
+        searched = []
+        def fake_retrieve(query):
+            searched.append(query)
+            return [NS(payload={"title": "కథ", "story_id": "1960_01_01", "text": "ఒక రాజు ఉండేవాడు."})]
+
+        original_url = config.LOCAL_LLM_URL
+        with LocalLLMServer(ttft=0.05, tokens_per_sec=0, text="ఒక చిన్న కథ.") as server:
+            config.LOCAL_LLM_URL = server.url
+            local_llm_multi._client_instances.clear()
+            try:
+                report = run_load_test(3, DEFAULT_FACETS, {"model": "local/telugu", "max_tokens": 50},
+                                       retrieve_fn=fake_retrieve, requests_per_user=2)
+            finally:
+                config.LOCAL_LLM_URL = original_url
+            self.assertEqual(server.requests, 6)
+
+        self.assertEqual((report["requests"], report["errors"]), (6, 0))
+        self.assertEqual(len(searched), 6)
+        for stage in ("retrieval", "context", "ttft", "generation", "total"):
+            stats = report["stages"][stage]
+            self.assertEqual(stats["count"], 6)
+            self.assertLessEqual(stats["p50"], stats["p95"])
+            self.assertLessEqual(stats["p95"], stats["p99"])
+        self.assertGreaterEqual(report["stages"]["ttft"]["p50"], 0.05)
+        self.assertGreater(report["throughput_rps"], 0)
+        self.assertGreater(report["rss"]["peak_bytes"], 0)
+        json.dumps(report)
+
+        slower = json.loads(json.dumps(report))
+        slower["throughput_rps"] = report["throughput_rps"] * 3
+        self.assertTrue(any("throughput" in r for r in compare_to_baseline(report, slower, 0.2)))
+        self.assertEqual(compare_to_baseline(report, report, 0.2), [])
+        print("\n[PASSED] Concurrent Load Test")
+
+if __name__ == '__main__':
+    unittest.main()
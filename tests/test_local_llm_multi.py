@@ -0,0 +1,234 @@
+import sys
+import os
+import threading
+import time
+import unittest
+from types import SimpleNamespace as NS
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src import local_llm_multi
+
+USAGE = NS(prompt_tokens=120, completion_tokens=3, prompt_tokens_details=NS(cached_tokens=100))
+
+class FakeCompletions:
+    """Mimics client.chat.completions for OpenAI-compatible providers."""
+    def __init__(self, fail=False, delay=0.0, text="ఒక రాజు ఉండేవాడు"):
+        self.fail = fail
+        self.delay = delay
+        self.words = text.split(" ")
+        self.calls = []
+
+    def create(self, model, messages, max_tokens, temperature, stream, **kwargs):
+        self.calls.append({"messages": messages, "stream": stream, **kwargs})
+        if self.fail:
+            raise RuntimeError("service unavailable")
+        if not stream:
+            return NS(choices=[NS(message=NS(content="ఒక రాజు ఉండేవాడు"))], usage=USAGE)
+        return self._stream()
+
+    def _stream(self):
+        time.sleep(self.delay)
+        for i, word in enumerate(self.words):
+            yield NS(choices=[NS(delta=NS(content=word + (" " if i < len(self.words) - 1 else "")))])
+        yield NS(choices=[], usage=USAGE)
+
+class StalledResponse:
+    """A provider stream stuck before its first chunk until close() shuts the connection."""
+    def __init__(self):
+        self.closed = threading.Event()
+
+    def __iter__(self):
+        if self.closed.wait(5):
+            raise ConnectionError("connection closed")
+        yield NS(choices=[NS(delta=NS(content="ఆలస్యం"))])
+
+    def close(self):
+        self.closed.set()
+
+class FixedTracker:
+    """Hedge after a fixed delay; records observations."""
+    def __init__(self, delay):
+        self.delay = delay
+        self.observed = []
+        self.censored = []
+
+    def threshold(self, model_id):
+        return self.delay
+
+    def observe(self, model_id, ttft):
+        self.observed.append((model_id, ttft))
+
+    def observe_censored(self, model_id, lower_bound):
+        self.censored.append((model_id, lower_bound))
+
+def install_fake(model_id, client_type="openai", fail=False, delay=0.0, text="ఒక రాజు ఉండేవాడు"):
+    completions = FakeCompletions(fail, delay, text)
+    local_llm_multi._client_instances[model_id] = (client_type, NS(chat=NS(completions=completions)))
+    return completions
+
+class TestLocalLLMMulti(unittest.TestCase):
+    def tearDown(self):
+        local_llm_multi._client_instances.clear()
+
+    def test_complete_and_stream_report_usage(self):
+        """complete() returns text with usage; stream() yields pieces and fills usage/TTFT at the end."""
+        fake = install_fake("fake/model")
+        seen = []
+        local_llm_multi.add_usage_listener(seen.append)
+        try:
+            result = local_llm_multi.complete("fake/model", "కథ చెప్పు", system_prompt="sys")
+            self.assertEqual(result.text, "ఒక రాజు ఉండేవాడు")
+            self.assertEqual((result.prompt_tokens, result.completion_tokens, result.cached_tokens), (120, 3, 100))
+            self.assertEqual(fake.calls[0]["messages"][0], {"role": "system", "content": "sys"})
+
+            llm_stream = local_llm_multi.stream("fake/model", "కథ చెప్పు")
+            self.assertEqual(list(llm_stream), ["ఒక ", "రాజు ", "ఉండేవాడు"])
+            self.assertEqual(llm_stream.result.text, result.text)
+            self.assertEqual(llm_stream.result.completion_tokens, 3)
+            self.assertIsNotNone(llm_stream.result.ttft)
+            self.assertEqual(fake.calls[1]["stream_options"], {"include_usage": True})
+            self.assertEqual(len(seen), 2)
+            self.assertAlmostEqual(result.cache_hit_ratio, 100 / 120)
+            before = local_llm_multi.prompt_cache_stats()["fake/model"]["cached_tokens"]
+            local_llm_multi.complete("fake/model", "కథ చెప్పు")
+            self.assertEqual(local_llm_multi.prompt_cache_stats()["fake/model"]["cached_tokens"], before + 100)
+        finally:
+            local_llm_multi.remove_usage_listener(seen.append)
+        print("\n[PASSED] LLM complete/stream usage")
+
+    def test_compat_wrapper_types(self):
+        """generate_response_multi returns a str without stream=True, and errors become text."""
+        install_fake("fake/model")
+        self.assertIsInstance(local_llm_multi.generate_response_multi("fake/model", "p"), str)
+        self.assertEqual("".join(local_llm_multi.generate_response_multi("fake/model", "p", stream=True)),
+                         "ఒక రాజు ఉండేవాడు")
+
+        install_fake("fake/broken", fail=True)
+        self.assertEqual(local_llm_multi.generate_response_multi("fake/broken", "p"),
+                         "Error (fake/broken): service unavailable")
+        streamed = list(local_llm_multi.generate_response_multi("fake/broken", "p", stream=True))
+        self.assertEqual(streamed, ["Error (fake/broken): service unavailable"])
+        with self.assertRaises(RuntimeError):
+            local_llm_multi.complete("fake/broken", "p")
+        print("[PASSED] LLM compat wrapper")
+
+    def test_hedged_stream_uses_backup_for_slow_or_failed_primary(self):
+        """A stalled primary is hedged after the delay, a failing one falls back at once; the loser is cancelled."""
+        from src.local_llm_multi import HedgedStream
+        install_fake("fake/slow", delay=1.0, text="నెమ్మది")
+        install_fake("fake/fast", text="వేగం గా")
+        tracker = FixedTracker(0.1)
+        start = time.perf_counter()
+        hedged = HedgedStream("fake/slow", "p", backup_model="fake/fast", tracker=tracker)
+        self.assertEqual("".join(hedged), "వేగం గా")
+        self.assertLess(time.perf_counter() - start, 0.8)
+        self.assertEqual(hedged.result.model_id, "fake/fast")
+        self.assertTrue(hedged.result.extra["hedged"])
+        # The cancelled primary's wait is a censored lower bound, kept out of the TTFT samples
+        self.assertEqual([m for m, _ in tracker.censored], ["fake/slow"])
+        self.assertEqual(tracker.observed, [])
+
+        install_fake("fake/broken", fail=True)
+        hedged = HedgedStream("fake/broken", "p", backup_model="fake/fast", tracker=FixedTracker(5.0))
+        start = time.perf_counter()
+        self.assertEqual("".join(hedged), "వేగం గా")
+        self.assertLess(time.perf_counter() - start, 1.0)
+
+        # A healthy primary never triggers the backup
+        install_fake("fake/ok", text="సరే")
+        hedged = HedgedStream("fake/ok", "p", backup_model="fake/fast", tracker=FixedTracker(5.0))
+        self.assertEqual("".join(hedged), "సరే")
+        self.assertFalse(hedged.result.extra["hedged"])
+
+        # Time spent waiting for rate-limit budget does not count toward the hedge delay
+        from src.local_llm_multi import RateLimitScheduler
+        scheduler = RateLimitScheduler({"HF_TOKEN": {"rpm": 120}})  # 2 requests/s
+        scheduler.penalize("HF_TOKEN")
+        original_scheduler = local_llm_multi._SCHEDULER
+        local_llm_multi._SCHEDULER = scheduler
+        try:
+            hedged = HedgedStream("fake/ok", "p", backup_model="fake/fast", tracker=FixedTracker(0.1))
+            self.assertEqual("".join(hedged), "సరే")
+        finally:
+            local_llm_multi._SCHEDULER = original_scheduler
+        self.assertFalse(hedged.result.extra["hedged"])
+        self.assertGreater(hedged.result.extra["queue_wait"], 0.3)
+
+        # A stalled loser is closed by the winner right away, not after its next piece
+        stalled = StalledResponse()
+        slow = install_fake("fake/stalled")
+        slow.create = lambda *args, **kwargs: stalled
+        hedged = HedgedStream("fake/stalled", "p", backup_model="fake/fast", tracker=FixedTracker(0.1))
+        self.assertEqual("".join(hedged), "వేగం గా")
+        self.assertTrue(stalled.closed.wait(0.5))
+        loser = hedged._attempts[0]["stream"].result
+        self.assertTrue(loser.extra["cancelled"])
+        self.assertIsNone(loser.error)
+
+        # Censored samples never raise the learned hedge delay
+        from src import config
+        from src.local_llm_multi import TTFTTracker
+        tracker = TTFTTracker()
+        for _ in range(config.LLM_HEDGE_MIN_SAMPLES):
+            tracker.observe("m", 3.0)
+        for _ in range(config.LLM_HEDGE_MIN_SAMPLES):
+            tracker.observe_censored("m", 30.0)
+        self.assertEqual(tracker.threshold("m"), 3.0)
+        self.assertEqual(tracker.censored_share("m"), 0.5)
+        # One configured model: the backup is a second request to the same model
+        from src.local_llm_multi import backup_model_for
+        original_models = config.AVAILABLE_MODELS
+        config.AVAILABLE_MODELS = ["only/model"]
+        try:
+            self.assertEqual(backup_model_for("only/model"), "only/model")
+            config.LLM_HEDGE_SAME_MODEL = False
+            self.assertIsNone(backup_model_for("only/model"))
+        finally:
+            config.AVAILABLE_MODELS = original_models
+            config.LLM_HEDGE_SAME_MODEL = True
+        print("[PASSED] Hedged LLM Stream")
+
+    def test_scheduler_priority_and_429_retry(self):
+        """Interactive calls are served before queued batch calls; 429s are retried after backoff."""
+        import threading
+        from src import config
+        from src.local_llm_multi import RateLimitScheduler
+
+        scheduler = RateLimitScheduler({"KEY": {"rpm": 600, "tpm": 10 ** 6}})  # 10 requests/s
+        scheduler.acquire("KEY", 10)
+        scheduler.penalize("KEY")  # empty bucket: every caller has to queue
+        order = []
+        def call(name, priority):
+            scheduler.acquire("KEY", 10, priority)
+            order.append(name)
+        batch = threading.Thread(target=call, args=("batch", config.LLM_PRIORITY_BATCH))
+        batch.start()
+        time.sleep(0.02)
+        interactive = threading.Thread(target=call, args=("interactive", config.LLM_PRIORITY_INTERACTIVE))
+        interactive.start()
+        batch.join(2)
+        interactive.join(2)
+        self.assertEqual(order, ["interactive", "batch"])
+
+        class RateLimited(Exception):
+            status_code = 429
+        fake = install_fake("fake/limited")
+        failures = [RateLimited("429"), RateLimited("429")]
+        original_create = fake.create
+        def flaky_create(*args, **kwargs):
+            if failures:
+                raise failures.pop()
+            return original_create(*args, **kwargs)
+        fake.create = flaky_create
+        base = config.LLM_BACKOFF_BASE
+        config.LLM_BACKOFF_BASE = 0.01
+        try:
+            result = local_llm_multi.complete("fake/limited", "p")
+        finally:
+            config.LLM_BACKOFF_BASE = base
+        self.assertEqual(result.text, "ఒక రాజు ఉండేవాడు")
+        self.assertEqual(result.extra["rate_limit_retries"], 2)
+        print("[PASSED] Rate-Limit Scheduler")
+
+if __name__ == '__main__':
+    unittest.main()
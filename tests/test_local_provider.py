@@ -0,0 +1,58 @@
+import sys
+import os
+import unittest
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src import config, local_llm_multi
+from src.local_provider import LocalLLMServer
+
+class TestLocalProvider(unittest.TestCase):
+    def setUp(self):
+        self.original_url = config.LOCAL_LLM_URL
+
+    def tearDown(self):
+        config.LOCAL_LLM_URL = self.original_url
+        local_llm_multi._client_instances.clear()
+
+    def use(self, server):
+        config.LOCAL_LLM_URL = server.url
+        local_llm_multi._client_instances.clear()
+
+    def test_streams_with_configured_timing_and_usage(self):
+        """local/ models stream canned Telugu through the real OpenAI client, with TTFT, usage and cache hits."""
+        with LocalLLMServer(ttft=0.2, tokens_per_sec=200, text="ఒక రాజు ఉండేవాడు. అతనికి ఏడుగురు కొడుకులు.") as server:
+            self.use(server)
+            llm_stream = local_llm_multi.stream("local/telugu", "కథ చెప్పు", system_prompt="స్థిర సూచనలు " * 50)
+            self.assertEqual("".join(llm_stream), "ఒక రాజు ఉండేవాడు. అతనికి ఏడుగురు కొడుకులు.")
+            result = llm_stream.result
+            self.assertGreaterEqual(result.ttft, 0.2)
+            self.assertEqual(result.completion_tokens, 6)
+            self.assertEqual(result.cached_tokens, 0)
+
+            # Same system prompt again: the prefix is reported as cached; max_tokens caps the output
+            result = local_llm_multi.complete("local/telugu", "ఇంకో కథ", system_prompt="స్థిర సూచనలు " * 50, max_tokens=2)
+            self.assertEqual(result.text, "ఒక రాజు")
+            self.assertGreater(result.cached_tokens, 0)
+        print("\n[PASSED] Local LLM Provider Streaming")
+
+    def test_error_injection(self):
+        """error_rate fails requests with the configured status; the same seed fails the same requests."""
+        def failures(seed):
+            with LocalLLMServer(ttft=0, tokens_per_sec=0, error_rate=0.5, seed=seed) as server:
+                self.use(server)
+                outcome = []
+                for _ in range(8):
+                    try:
+                        local_llm_multi.complete("local/telugu", "p", max_tokens=3)
+                        outcome.append(False)
+                    except Exception as e:
+                        self.assertEqual(getattr(e, "status_code", None), 503)
+                        outcome.append(True)
+                return outcome
+        first = failures(seed=7)
+        self.assertTrue(any(first) and not all(first))
+        self.assertEqual(first, failures(seed=7))
+        print("[PASSED] Local LLM Error Injection")
+
+if __name__ == '__main__':
+    unittest.main()
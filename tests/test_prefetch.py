@@ -0,0 +1,53 @@
+import sys
+import os
+import time
+import unittest
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.retrieval.prefetch import ContextPrefetcher
+
+class TestContextPrefetcher(unittest.TestCase):
+    def test_debounced_prefetch_is_reused(self):
+        """Only the latest query is searched, and Generate reuses its result."""
+        searched = []
+
+        def fake_retrieve(query):
+            searched.append(query)
+            return [f"point for {query}"]
+
+        prefetcher = ContextPrefetcher(fake_retrieve, debounce_seconds=0.05)
+
+        # Rapid edits: only the last one should reach the retriever
+        prefetcher.prefetch("raja", channel="s1")
+        prefetcher.prefetch("raja mantri", channel="s1")
+        future = prefetcher.prefetch("raja mantri adavi", channel="s1")
+        future.result(timeout=2)
+
+        self.assertTrue(prefetcher.is_ready("raja mantri adavi"))
+        self.assertEqual(prefetcher.get("raja mantri adavi"), ["point for raja mantri adavi"])
+        self.assertEqual(searched, ["raja mantri adavi"])
+
+        # A superseded query clicked later is searched inline
+        time.sleep(0.1)
+        self.assertEqual(prefetcher.get("raja"), ["point for raja"])
+        self.assertEqual(searched, ["raja mantri adavi", "raja"])
+        print("\n[PASSED] Debounced RAG Prefetch")
+
+    def test_debounce_never_holds_a_worker(self):
+        """Other users' pending debounces do not delay a click, and a click skips its own debounce."""
+        searched = []
+        prefetcher = ContextPrefetcher(lambda query: searched.append(query) or [query], debounce_seconds=1.0)
+        for i in range(10):
+            prefetcher.prefetch(f"query {i}", channel=f"user{i}")
+
+        start = time.perf_counter()
+        self.assertEqual(prefetcher.get("query 3"), ["query 3"])
+        self.assertEqual(prefetcher.get("other"), ["other"])
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertEqual(searched, ["query 3", "other"])
+        # The clicked query is cached; its timer no longer fires a second search
+        self.assertTrue(prefetcher.is_ready("query 3"))
+        print("[PASSED] Prefetch Debounce Off The Worker Pool")
+
+if __name__ == '__main__':
+    unittest.main()
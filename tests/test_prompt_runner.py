@@ -0,0 +1,38 @@
+import sys
+import os
+import time
+import unittest
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.prompt_runner import run_concurrently
+
+def fake_stream(prompt, delay):
+    """Waits `delay` before the first piece, then streams the prompt word by word."""
+    time.sleep(delay)
+    if prompt == "boom":
+        raise RuntimeError("provider down")
+    for word in prompt.split():
+        yield word + " "
+
+class TestPromptRunner(unittest.TestCase):
+    def test_variants_run_concurrently(self):
+        """A round takes about max(latency), events stream in, and each variant reports TTFT and errors."""
+        jobs = [{"name": f"v{i}", "kwargs": {"prompt": "ఒక రాజు ఉండేవాడు", "delay": 0.2}} for i in range(5)]
+        jobs.append({"name": "bad", "kwargs": {"prompt": "boom", "delay": 0.1}})
+
+        start = time.perf_counter()
+        events = list(run_concurrently(jobs, fake_stream, max_workers=6))
+        elapsed = time.perf_counter() - start
+        self.assertLess(elapsed, 0.6)  # sequential would be 1.1s
+
+        results = {payload.name: payload for kind, _, payload in events if kind == "done"}
+        self.assertEqual(len(results), 6)
+        self.assertEqual(sum(1 for kind, i, _ in events if kind == "delta" and i == 0), 3)
+        self.assertEqual(results["v0"].text, "ఒక రాజు ఉండేవాడు ")
+        self.assertGreaterEqual(results["v0"].ttft, 0.2)
+        self.assertEqual(results["v0"].output_tokens, 3)
+        self.assertEqual(results["bad"].error, "provider down")
+        print("\n[PASSED] Concurrent Prompt Runner")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import sys
+import os
+import unittest
+import tempfile
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.story_inspired_puzzles.puzzle_bank import PuzzleBank, build_bank, derive_candidates
+
+STORY = {
+    "story_id": "1960_01_05",
+    "title": "రామాయణం",
+    "normalized_genre_code": "MYTHOLOGY_STORY",
+    "characters": ["రామలక్ష్మణులు", "సీతాదేవి", "హనుమంతుడు", "రావణుడు", "విభీషణుడు", "సుగ్రీవుడు"],
+    "locations": ["లంకాపురి"],
+    "keywords": ["వానరసేన", "సముద్రము", "వారధి"],
+    "moral": "ధర్మాన్ని ఆచరించేవారికి ఎప్పుడూ విజయం లభిస్తుంది.",
+    "content": "ఒకనాడు హనుమంతుడు సముద్రము దాటి లంకకు వెళ్ళాడు. అక్కడ సీతాదేవిని చూశాడు.",
+}
+
+class TestPuzzleBank(unittest.TestCase):
+    def test_build_and_serve(self):
+        """Derives clues from story metadata, banks layouts per difficulty and serves them."""
+        words = {w["answer"]: w["clue"] for w in derive_candidates(STORY, ("characters", "keywords", "moral"))}
+        self.assertIn("_____", words["హనుమంతుడు"])
+        self.assertNotIn("హనుమంతుడు", words["హనుమంతుడు"])
+        self.assertIn("(రా...)", words["రావణుడు"])
+        self.assertTrue(any(c.startswith("నీతి:") for c in words.values()))
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            bank = PuzzleBank(os.path.join(tmp_dir, "bank.sqlite"))
+            stats = build_bank(bank, iter([STORY, {"title": "no id"}]), attempts=20)
+            self.assertEqual(stats["stories"], 2)
+            self.assertGreater(stats["puzzles"], 0)
+
+            entry = bank.get("1960_01_05", "medium")
+            self.assertIsNotNone(entry)
+            self.assertGreaterEqual(entry["layout"]["placed_count"], 3)
+            self.assertEqual(entry["year"], 1960)
+            self.assertEqual(bank.random_puzzle("medium", genre="MYTHOLOGY_STORY")["story_id"], "1960_01_05")
+            self.assertIsNone(bank.random_puzzle("medium", genre="HUMOR_STORY"))
+
+            # Re-running skips stories already banked
+            again = build_bank(bank, iter([STORY]), attempts=20)
+            self.assertEqual((again["skipped"], again["puzzles"]), (1, 0))
+            bank.close()
+        print("\n[PASSED] Puzzle Bank")
+
+if __name__ == '__main__':
+    unittest.main()
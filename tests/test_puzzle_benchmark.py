@@ -0,0 +1,37 @@
+import sys
+import os
+import unittest
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.story_inspired_puzzles.benchmark import build_answer_lists, run_benchmark, compare_to_baseline
+from src.story_inspired_puzzles.utils import is_answer_candidate
+
+class TestPuzzleBenchmark(unittest.TestCase):
+    def test_benchmark_rows_and_baseline(self):
+        """Builds answer lists across stories, benchmarks them and flags regressions."""
+        self.assertTrue(is_answer_candidate("హనుమంతుడు"))
+        self.assertFalse(is_answer_candidate("నకుల సహదేవులు"))
+        self.assertFalse(is_answer_candidate("Rama"))
+
+        stories = [
+            ["రామలక్ష్మణులు", "సీతాదేవి", "లంకాపురి", "హనుమంతుడు"],
+            ["వానరసేన", "రావణుడు", "సముద్రము", "వారధి"],
+            ["విభీషణుడు", "సుగ్రీవుడు", "అంగదుడు", "జటాయువు"],
+        ]
+        lists = build_answer_lists(stories, size=6, count=2)
+        self.assertEqual(len(lists), 2)
+        self.assertTrue(all(len(answers) == 6 and len(set(answers)) == 6 for answers in lists))
+
+        rows = run_benchmark(stories, sizes=[6, 12], lists_per_size=2, seeds=2, layout_kwargs={"attempts": 10})
+        self.assertEqual([r["size"] for r in rows], [6, 12])
+        for r in rows:
+            self.assertEqual(r["runs"], 4)
+            self.assertTrue(0 <= r["placed_ratio"] <= 1 and 0 <= r["density"] <= 1)
+
+        worse = [dict(rows[0], placed_ratio=rows[0]["placed_ratio"] - 0.1, latency_p95_s=rows[0]["latency_p95_s"] + 1)]
+        self.assertEqual(len(compare_to_baseline(worse, rows, 0.25)), 2)
+        self.assertEqual(compare_to_baseline(rows, rows, 0.25), [])
+        print("\n[PASSED] Crossword Benchmark")
+
+if __name__ == '__main__':
+    unittest.main()
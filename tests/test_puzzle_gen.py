@@ -57,5 +57,89 @@ class TestPuzzleGen(unittest.TestCase):
             # So it should work.
             self.fail("Failed to generate puzzle layout from connectable words.")
 
+    def test_layout_cells_are_consistent(self):
+        """Crossing words must agree on every shared cell, and all words stay in the grid."""
+        words_data = [{"answer": w, "clue": w} for w in [
+            "రామలక్ష్మణులు", "సీతాదేవి", "లంకాపురి", "హనుమంతుడు", "వానరసేన", "రావణుడు",
+            "సముద్రము", "వారధి", "విభీషణుడు", "సుగ్రీవుడు", "అంగదుడు", "జటాయువు"
+        ]]
+        generator = CrosswordGenerator()
+        for _ in range(5):
+            layout = generator.generate_layout(words_data, attempts=10)
+            self.assertIsNotNone(layout)
+            cells = {}
+            for w in layout['words']:
+                for i, akshara in enumerate(w['answer']):
+                    x = w['start_x'] + i if w['direction'] == 'across' else w['start_x']
+                    y = w['start_y'] if w['direction'] == 'across' else w['start_y'] + i
+                    self.assertTrue(0 <= x < layout['width'] and 0 <= y < layout['height'])
+                    self.assertEqual(cells.setdefault((x, y), akshara), akshara)
+        print("[PASSED] Crossword Layout Consistency")
+
+    def test_seeded_and_parallel_search(self):
+        """Seeded searches are reproducible; the parallel search and deadline still return a layout."""
+        import time
+        from src.story_inspired_puzzles.puzzle_generator import SearchBound
+
+        words_data = [{"answer": w, "clue": w} for w in [
+            "రామలక్ష్మణులు", "సీతాదేవి", "లంకాపురి", "హనుమంతుడు", "వానరసేన", "రావణుడు",
+            "సముద్రము", "వారధి", "విభీషణుడు", "సుగ్రీవుడు", "అంగదుడు", "జటాయువు"
+        ]]
+        generator = CrosswordGenerator()
+        first = generator.generate_layout(words_data, attempts=20, seed=7)
+        second = generator.generate_layout(words_data, attempts=20, seed=7)
+        self.assertEqual(first, second)
+
+        parallel = generator.generate_layout(words_data, attempts=20, seed=7, workers=2)
+        self.assertIsNotNone(parallel)
+        # All seeds are still tried, so the parallel result is never worse
+        self.assertGreaterEqual(parallel['placed_count'], first['placed_count'])
+
+        start = time.time()
+        layout = generator.generate_layout(words_data, attempts=100000, seed=7, deadline=0.2)
+        self.assertIsNotNone(layout)
+        self.assertLess(time.time() - start, 2.0)
+
+        bound = SearchBound()
+        self.assertTrue(bound.offer(5, 100))
+        self.assertFalse(bound.can_beat(5, 100))
+        self.assertTrue(bound.can_beat(5, 99))
+        self.assertFalse(bound.can_beat(4, 1))
+        print("[PASSED] Seeded / Parallel Crossword Search")
+
+    def test_packing_matches_reference_layouts(self):
+        """
+        Seeded single-attempt layouts match the ones produced before cluster packing moved to
+        the occupancy canvas (digests recorded with the earlier dict-probing packer).
+        """
+        import hashlib
+        import json
+        import random
+
+        syllables = ["క", "మ", "ల", "రా", "న", "వ", "త", "ప", "సి", "గు", "డు", "ము",
+                     "చె", "ట్టు", "కో", "తి", "పు", "లి", "ఏ", "ను", "గ", "నె", "మ్మ", "ది"]
+
+        def answers(n):
+            rng = random.Random(n)
+            words = []
+            while len(words) < n:
+                word = "".join(rng.choice(syllables) for _ in range(rng.randint(2, 4)))
+                if word not in words:
+                    words.append(word)
+            return [{"answer": w, "clue": w} for w in words]
+
+        # (answers, seed) -> digest; every case packs at least one cluster next to another
+        reference = {
+            (20, 0): "78eaecddb1810ef6",
+            (20, 1): "3bcfe77175757855",
+            (40, 1): "fcea38c4df3160cd",
+            (80, 1): "f9ed3e0594db460e",
+        }
+        for (size, seed), expected in reference.items():
+            layout = CrosswordGenerator().generate_layout(answers(size), attempts=1, seed=seed)
+            encoded = json.dumps(layout, sort_keys=True, ensure_ascii=False).encode("utf-8")
+            self.assertEqual(hashlib.sha1(encoded).hexdigest()[:16], expected, f"{size} answers, seed {seed}")
+        print("[PASSED] Crossword Packing Matches Reference Layouts")
+
 if __name__ == '__main__':
     unittest.main()
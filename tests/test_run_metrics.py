@@ -0,0 +1,61 @@
+import sys
+import os
+import json
+import unittest
+import tempfile
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from qdrant_client import QdrantClient
+from src.chunk_format import write_chunk_file
+from src.story_embedder.main import sync_files
+from src.story_embedder.manifest import StoryManifest
+from src.story_embedder.run_metrics import RunMetrics
+from src.story_embedder.storage import QdrantStorage
+
+class FakeEmbedder:
+    """Constant vectors; reports tokens and a length skip through last_run like StoryEmbedder."""
+    def generate_embeddings(self, stories):
+        kept = [s for s in stories if len(s.text) < 50]
+        self.last_run = {"tokens": 10 * len(kept), "skipped": {"token_limit": len(stories) - len(kept)},
+                         "tokenize_s": 0.0, "encode_s": 0.0}
+        return [(s.story_id, [1.0] + [0.0] * 767, s.metadata) for s in kept]
+
+class TestRunMetrics(unittest.TestCase):
+    def test_sync_writes_file_batch_and_run_records(self):
+        """An embedding run logs per-file and per-batch JSONL, skip reasons, and an end-of-run report."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            base_dir = os.path.join(tmp_dir, "chunks")
+            os.makedirs(os.path.join(base_dir, "1960"))
+            chunks = [{"story_id": sid, "chunk_id": f"{sid}_00", "chunk_index": 0, "year": "1960", "month": "01",
+                       "title": "కథ", "text": text}
+                      for sid, text in [("1960_01_01", "ఒక రాజు"), ("1960_01_02", "ఒక మంత్రి"), ("1960_01_03", "పొడవు " * 20)]]
+            write_chunk_file(os.path.join(base_dir, "1960", "చందమామ_1960_01_chunks.jsonl"), chunks, "jsonl")
+            files = [os.path.join(base_dir, "1960", "చందమామ_1960_01_chunks.jsonl")]
+
+            client = QdrantClient(path=os.path.join(tmp_dir, "qdrant"))
+            manifest = StoryManifest(os.path.join(tmp_dir, "manifest.json"), target="test", alias="stories")
+            state, _ = manifest.resolve_target({"name": "test/model", "version": "1"}, None)
+            storage = QdrantStorage(state["collection"], client=client)
+
+            metrics_path = os.path.join(tmp_dir, "run.jsonl")
+            run_metrics = RunMetrics("test", path=metrics_path)
+            sync_files(files, storage, FakeEmbedder(), manifest, state, base_dir=base_dir, run_metrics=run_metrics)
+            sync_files(files, storage, FakeEmbedder(), manifest, state, base_dir=base_dir, run_metrics=run_metrics)
+            report = run_metrics.finish()
+            client.close()
+
+            self.assertEqual(report["counts"]["stories"], 3)
+            self.assertEqual((report["counts"]["tokens"], report["counts"]["points"]), (20, 2))
+            self.assertEqual(report["skips"], {"token_limit": 1, "file_unchanged": 1})
+            self.assertIn("encode", report["stages"])
+
+            with open(metrics_path, "r", encoding="utf-8") as f:
+                records = [json.loads(line) for line in f]
+            self.assertEqual([r["type"] for r in records], ["run_start", "batch", "file", "run_end"])
+            batch = records[1]
+            self.assertEqual((batch["size"], batch["embedded"], batch["tokens"]), (3, 2, 20))
+            self.assertGreater(batch["upsert_bytes"], 2 * 768 * 4)
+        print("\n[PASSED] Ingestion Run Metrics")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import sys
+import os
+import json
+import time
+import unittest
+import tempfile
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.perf.spans import SpanLog, Trace, remember_retrieval
+
+def slow_stream():
+    time.sleep(0.05)
+    yield "ఒక "
+    yield "రాజు"
+
+class TestSpans(unittest.TestCase):
+    def test_trace_records_stages_and_rotates(self):
+        """A request trace merges prefetched retrieval spans, times the stream, and lands in a rotating JSONL log."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "spans.jsonl")
+            log = SpanLog(path, max_bytes=2000, backups=2, window=50)
+            remember_retrieval("రాజు కథ", {"embed": 0.02, "search": 0.01}, {"payload_bytes": 4096})
+
+            for _ in range(10):
+                trace = Trace("story", log=log, model="local/telugu")
+                with trace.span("context"):
+                    pass
+                trace.merge_retrieval("రాజు కథ")
+                trace.set(context_tokens_est=1200)
+                self.assertEqual("".join(trace.stream(slow_stream())), "ఒక రాజు")
+
+            record = log.recent()[-1]
+            self.assertGreaterEqual(record["spans"]["ttft"], 0.05)
+            self.assertGreaterEqual(record["spans"]["total"], record["spans"]["generate"])
+            self.assertEqual((record["spans"]["embed"], record["metrics"]["payload_bytes"]), (0.02, 4096))
+
+            stages = {row["stage"]: row for row in log.summary("story")}
+            self.assertEqual(stages["ttft"]["count"], 10)
+            self.assertIn("generate", log.format_summary())
+
+            self.assertTrue(os.path.exists(path + ".1"))
+            with open(path, "r", encoding="utf-8") as f:
+                self.assertEqual(json.loads(f.readline())["name"], "story")
+        print("\n[PASSED] Request Span Timing")
+
+    def test_replayed_chapters_do_not_count_as_first_token(self):
+        """TTFT waits for the first piece the model produces, not checkpointed chapters replayed on resume."""
+        from src.story_gen import ReplayedText
+
+        def resumed_serial():
+            yield ReplayedText("అధ్యాయం 1\n\n")
+            yield from slow_stream()
+
+        log = SpanLog(None)
+        trace = Trace("serial", log=log)
+        self.assertEqual("".join(trace.stream(resumed_serial())), "అధ్యాయం 1\n\nఒక రాజు")
+        record = log.recent()[-1]
+        self.assertGreaterEqual(record["spans"]["ttft"], 0.05)
+        self.assertEqual(record["metrics"]["replayed_chars"], len("అధ్యాయం 1\n\n"))
+        print("[PASSED] TTFT Skips Replayed Chapters")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+import sys
+import os
+import unittest
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.perf.startup import BackgroundLoader
+
+class TestStartup(unittest.TestCase):
+    def test_failed_load_is_retried(self):
+        """A failed background load is reported once, then the next start() loads again."""
+        attempts = []
+        def factory():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise TimeoutError("qdrant timed out")
+            return "retriever"
+
+        loader = BackgroundLoader(factory, name="test")
+        with self.assertRaises(TimeoutError):
+            loader.get(timeout=5)
+        self.assertEqual(loader.status(), "failed")
+        self.assertIsInstance(loader.error(), TimeoutError)
+
+        self.assertEqual(loader.get(timeout=5), "retriever")
+        self.assertEqual((loader.status(), len(attempts)), ("ready", 2))
+        # A successful load is kept
+        self.assertEqual(loader.get(timeout=5), "retriever")
+        self.assertEqual(len(attempts), 2)
+        print("\n[PASSED] Background Loader Retry")
+
+if __name__ == '__main__':
+    unittest.main()
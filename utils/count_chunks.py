@@ -1,23 +1,21 @@
-
 import os
-import json
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.story_embedder.data_loader import iter_chunks, scan_chunk_files
 
 CHUNKS_DIR = os.path.join(os.getcwd(), "chunks")
 
 def count_chunks():
     total_chunks = 0
     file_count = 0
-    for root, dirs, files in os.walk(CHUNKS_DIR):
-        for file in files:
-            if file.endswith("_chunks.json"):
-                file_count += 1
-                path = os.path.join(root, file)
-                try:
-                    with open(path, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        total_chunks += len(data)
-                except Exception as e:
-                    print(f"Error reading {path}: {e}")
+    # One file per issue, even when legacy JSON and JSONL copies sit side by side
+    for path in scan_chunk_files(CHUNKS_DIR):
+        file_count += 1
+        try:
+            total_chunks += sum(1 for _ in iter_chunks(path))
+        except Exception as e:
+            print(f"Error reading {path}: {e}")
     
     print(f"Total Files Scanned: {file_count}")
     print(f"Total Chunks Found: {total_chunks}")